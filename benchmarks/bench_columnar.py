@@ -0,0 +1,144 @@
+"""
+Compara la materialización columnar (fetch_columns) con el camino actual
+fetchall() + rows_to_dict usando un cursor falso en memoria.
+
+Cada camino se ejecuta una vez de calentamiento y luego `--repeat` veces;
+se informan la mediana y el mínimo (una sola corrida es muy ruidosa: el
+primer uso importa numpy y el recolector de basura puede caer en cualquiera).
+
+Uso (desde la raíz del repo):
+    python -m benchmarks.bench_columnar --rows 500000 --repeat 7
+"""
+
+import argparse
+import datetime
+import statistics
+import time
+import tracemalloc
+
+from conn.database_connector import DatabaseConnector
+
+
+class Row:
+    """Imita pyodbc.Row: secuencia indexable que no es tuple."""
+
+    __slots__ = ("_values",)
+
+    def __init__(self, values):
+        self._values = values
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __getitem__(self, i):
+        return self._values[i]
+
+    def __len__(self):
+        return len(self._values)
+
+
+class FakeCursor:
+    def __init__(self, rows, description):
+        self.description = description
+        self._rows = rows
+        self._pos = 0
+        self.arraysize = 1
+
+    def execute(self, query, *args, **kwargs):
+        self._pos = 0
+
+    def fetchall(self):
+        rows, self._pos = self._rows[self._pos :], len(self._rows)
+        return rows
+
+    def fetchmany(self, size):
+        rows = self._rows[self._pos : self._pos + size]
+        self._pos += len(rows)
+        return rows
+
+    def close(self):
+        pass
+
+
+class FakeConnector:
+    paramstyle = "qmark"
+
+    def __init__(self, rows, description):
+        self.connection = object()
+        self._rows = rows
+        self._description = description
+
+    def connect(self):
+        pass
+
+    def get_cursor(self):
+        return FakeCursor(self._rows, self._description)
+
+    def close_connection(self):
+        pass
+
+    def conn_engine(self):
+        return None
+
+
+def _measure(fn, repeat):
+    # El tiempo se mide sin tracemalloc, que distorsiona mucho los resultados.
+    fn()  # calentamiento: imports perezosos (numpy) y cachés
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(times), min(times), peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--with-datetime",
+        action="store_true",
+        help="Agrega una columna datetime (su conversión a datetime64 es costosa).",
+    )
+    args = parser.parse_args()
+
+    description = [("id", int), ("amount", float), ("name", str)]
+    if args.with_datetime:
+        description.append(("created", datetime.datetime))
+    now = datetime.datetime(2024, 1, 1)
+    rows = [
+        Row((i, i * 1.5, f"name-{i}", now)[: len(description)])
+        for i in range(args.rows)
+    ]
+    db = DatabaseConnector(FakeConnector(rows, tuple(description)))
+
+    def rows_to_dict_path():
+        cur = db.execute("SELECT * FROM t", [])
+        db.rows_to_dict(cur, cur.fetchall())
+
+    def columnar_path():
+        db.fetch_columns("SELECT * FROM t", batch_size=args.batch_size)
+
+    results = {}
+    for name, fn in (("rows_to_dict", rows_to_dict_path), ("fetch_columns", columnar_path)):
+        median, best, peak = _measure(fn, args.repeat)
+        results[name] = (median, peak)
+        print(
+            f"{name:<14} mediana {median:8.3f}s  mín {best:8.3f}s  "
+            f"{args.rows / median:12,.0f} filas/s  pico {peak / 1e6:8.1f} MB"
+        )
+    (base, base_peak), (col, col_peak) = results["rows_to_dict"], results["fetch_columns"]
+    print(
+        f"fetch_columns: {base / col:.2f}x en tiempo (medianas), "
+        f"{base_peak / col_peak:.2f}x menos memoria pico"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Mide el tiempo de importación de los módulos de `conn` con `python -X importtime`
+y verifica que no arrastren dependencias pesadas (SQLAlchemy, drivers, numpy).
+
+Uso (desde la raíz del repo):
+    python -m benchmarks.bench_import_time --budget-ms 50
+
+Sale con código 1 si algún módulo importa una dependencia prohibida o supera
+el presupuesto de milisegundos, para usarlo como guardia de regresiones.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from typing import Dict, List
+
+MODULES = [
+    "conn.connection_protocolo",
+    "conn.database_connector",
+    "conn.mysql_connector",
+    "conn.sql_server_connector",
+    "conn.sqlite_connector",
+    "conn.connection_pool",
+]
+
+HEAVY = ("sqlalchemy", "pymysql", "pyodbc", "numpy", "pandas", "pyarrow")
+
+
+def import_profile(module: str) -> Dict[str, object]:
+    """Importa `module` en un proceso limpio y devuelve tiempo total y módulos pesados."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative_us = 0
+    heavy: List[str] = []
+    for line in proc.stderr.splitlines():
+        # Formato: "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        top = name.strip().split(".")[0]
+        if top in HEAVY and top not in heavy:
+            heavy.append(top)
+        if name.strip() == module:
+            cumulative_us = int(cumulative)
+    return {"module": module, "ms": cumulative_us / 1000.0, "heavy_imports": heavy}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--budget-ms", type=float, default=None)
+    parser.add_argument("--json", action="store_true", help="Salida en JSON.")
+    args = parser.parse_args()
+
+    results = [import_profile(module) for module in MODULES]
+    failures = 0
+    for r in results:
+        over = args.budget_ms is not None and r["ms"] > args.budget_ms
+        if r["heavy_imports"] or over:
+            failures += 1
+        if not args.json:
+            heavy = ", ".join(r["heavy_imports"]) or "-"
+            print(f"{r['module']:<28} {r['ms']:8.2f} ms  pesados: {heavy}")
+    if args.json:
+        print(json.dumps(results, indent=2))
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+"""
+Suite de benchmarks sin servidor: todo pasa por DatabaseConnector sobre un
+SQLiteConnector en memoria que simula cada paramstyle.
+
+Mide:
+- format_query: plantillas '{}' formateadas por segundo.
+- bulk_insert: filas insertadas por segundo.
+- fetch_rows_to_dict: filas leídas y convertidas a dict por segundo.
+- stream: filas leídas por segundo con stream() (memoria acotada).
+y el pico de memoria (tracemalloc) de cada caso.
+
+Uso (desde la raíz del repo):
+    python -m benchmarks.run_benchmarks --output resultados.json
+    python -m benchmarks.run_benchmarks --compare resultados.json --tolerance 0.2
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict
+
+from conn.database_connector import DatabaseConnector
+from conn.query_template import QueryTemplateCache
+from conn.sqlite_connector import SQLiteConnector
+
+PARAMSTYLES = ("qmark", "format", "named", "pyformat", "numeric")
+TEMPLATE = "SELECT * FROM ventas WHERE a = {} AND b = {} AND c = {} AND d = {}"
+
+
+def _measure(fn: Callable[[], int]) -> Dict[str, float]:
+    """Ejecuta fn (que devuelve cuántas operaciones hizo) y mide tiempo y memoria."""
+    start = time.perf_counter()
+    ops = fn()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "ops": ops,
+        "seconds": elapsed,
+        "ops_per_sec": ops / elapsed if elapsed > 0 else 0.0,
+        "peak_bytes": peak,
+    }
+
+
+def _new_db(paramstyle: str, rows: int) -> DatabaseConnector:
+    connector = SQLiteConnector(":memory:", paramstyle=paramstyle)
+    connector.connect()
+    db = DatabaseConnector(connector, template_cache=QueryTemplateCache())
+    db.execute(
+        "CREATE TABLE ventas (id INTEGER PRIMARY KEY, cliente TEXT, monto REAL, cantidad INTEGER)",
+        [],
+    )
+    if rows:
+        db.bulk_insert(
+            "ventas",
+            ["id", "cliente", "monto", "cantidad"],
+            ((i, f"cliente-{i % 100}", i * 1.25, i % 7) for i in range(rows)),
+            chunk_size=5000,
+        )
+        db.commit()
+    return db
+
+
+def bench_paramstyle(paramstyle: str, rows: int, iterations: int) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+
+    db = _new_db(paramstyle, 0)
+
+    def format_query() -> int:
+        for i in range(iterations):
+            db._format_query(TEMPLATE, [i, i, i, i])
+        return iterations
+
+    results["format_query"] = _measure(format_query)
+
+    counter = {"n": 0}
+
+    def bulk_insert() -> int:
+        # Cada corrida inserta ids nuevos para no chocar con la PK.
+        base = counter["n"]
+        counter["n"] += rows
+        db.bulk_insert(
+            "ventas",
+            ["id", "cliente", "monto", "cantidad"],
+            ((base + i, f"cliente-{i % 100}", i * 1.25, i % 7) for i in range(rows)),
+            chunk_size=5000,
+        )
+        db.commit()
+        return rows
+
+    results["bulk_insert"] = _measure(bulk_insert)
+    db.close_connection()
+
+    db = _new_db(paramstyle, rows)
+
+    def fetch_rows_to_dict() -> int:
+        cur = db.execute("SELECT * FROM ventas WHERE id >= {}", [0])
+        converted = db.rows_to_dict(cur, cur.fetchall())
+        cur.close()
+        return len(converted)
+
+    def stream() -> int:
+        return sum(1 for _ in db.stream("SELECT * FROM ventas WHERE id >= {}", [0], 5000))
+
+    results["fetch_rows_to_dict"] = _measure(fetch_rows_to_dict)
+    results["stream"] = _measure(stream)
+    db.close_connection()
+    return results
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> int:
+    """Imprime la variación de ops/s frente a una corrida previa; cuenta regresiones."""
+    regressions = 0
+    for style, cases in current["results"].items():
+        for case, metrics in cases.items():
+            old = baseline.get("results", {}).get(style, {}).get(case)
+            if not old or not old["ops_per_sec"]:
+                continue
+            ratio = metrics["ops_per_sec"] / old["ops_per_sec"]
+            flag = ""
+            if ratio < 1 - tolerance:
+                regressions += 1
+                flag = "  <-- REGRESIÓN"
+            print(f"{style:<9} {case:<20} x{ratio:5.2f}{flag}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--iterations", type=int, default=100000)
+    parser.add_argument("--paramstyle", choices=PARAMSTYLES, action="append")
+    parser.add_argument("--output", help="Archivo JSON de salida (por defecto stdout).")
+    parser.add_argument("--compare", help="JSON de una corrida previa para comparar.")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    report = {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "rows": args.rows,
+        "iterations": args.iterations,
+        "results": {
+            style: bench_paramstyle(style, args.rows, args.iterations)
+            for style in (args.paramstyle or PARAMSTYLES)
+        },
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        return 1 if compare(report, baseline, args.tolerance) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
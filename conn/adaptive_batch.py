@@ -0,0 +1,123 @@
+import re
+import threading
+from typing import Any, Dict, Optional
+
+# Errores que indican que el lote es demasiado grande para el servidor.
+# MySQL: 1153 (max_allowed_packet), 1301; SQLite: demasiadas variables;
+# SQL Server: 8003 (más de 2100 parámetros).
+_PACKET_CODES = {1153, 1301, 8003}
+_PACKET_MESSAGE = re.compile(
+    r"max_allowed_packet|packet bigger|too many (sql )?variables|"
+    r"too many parameters|2100 parameters",
+    re.IGNORECASE,
+)
+# Conflictos de bloqueo: MySQL 1213 (deadlock) y 1205 (lock wait timeout),
+# SQL Server 1205 (víctima de deadlock) / SQLSTATE 40001.
+_DEADLOCK_CODES = {1205, 1213}
+_DEADLOCK_MESSAGE = re.compile(
+    r"deadlock|lock wait timeout|\b40001\b|database is locked", re.IGNORECASE
+)
+
+
+def _error_code(error: BaseException) -> Any:
+    args = getattr(error, "args", ())
+    return args[0] if args else None
+
+
+def classify_error(error: BaseException) -> Optional[str]:
+    """'packet' si el lote no cabe, 'deadlock' si hubo conflicto de bloqueo, o None."""
+    code = _error_code(error)
+    message = str(error)
+    if code in _PACKET_CODES or _PACKET_MESSAGE.search(message):
+        return "packet"
+    if code in _DEADLOCK_CODES or _DEADLOCK_MESSAGE.search(message):
+        return "deadlock"
+    return None
+
+
+class AdaptiveBatchSizer:
+    """Tamaño de lote AIMD hacia una latencia objetivo por lote.
+
+    Como el control de congestión de TCP: empieza duplicando el tamaño
+    mientras los lotes tardan menos que `target_seconds` (arranque lento);
+    tras la primera señal de congestión crece de forma aditiva (un 10 %).
+    Un lote lento reduce el tamaño en proporción al exceso (como mucho a la
+    mitad) y un error de tamaño o de bloqueo lo reduce a la mitad.
+    """
+
+    def __init__(
+        self,
+        initial_size: int = 100,
+        min_size: int = 1,
+        max_size: int = 10_000,
+        target_seconds: float = 0.25,
+        decrease: float = 0.5,
+    ):
+        if not 1 <= min_size <= max_size:
+            raise ValueError("Se requiere 1 <= min_size <= max_size")
+        if target_seconds <= 0:
+            raise ValueError("target_seconds debe ser mayor que 0")
+        self.min_size = min_size
+        self.max_size = max_size
+        self.target_seconds = target_seconds
+        self.decrease = decrease
+        self.size = min(max(initial_size, min_size), max_size)
+        self._slow_start = True
+        self._lock = threading.Lock()
+
+        self.rows = 0
+        self.chunks = 0
+        self.seconds = 0.0
+        self.slow_chunks = 0
+        self.backoffs = 0
+
+    def configure(self, min_size: int, max_size: int, target_seconds: float) -> None:
+        """Cambia límites y objetivo conservando el tamaño aprendido."""
+        if not 1 <= min_size <= max_size:
+            raise ValueError("Se requiere 1 <= min_size <= max_size")
+        if target_seconds <= 0:
+            raise ValueError("target_seconds debe ser mayor que 0")
+        with self._lock:
+            self.min_size = min_size
+            self.max_size = max_size
+            self.target_seconds = target_seconds
+            self.size = min(max(self.size, min_size), max_size)
+
+    def record(self, rows: int, seconds: float) -> None:
+        """Registra un lote confirmado y ajusta el tamaño del siguiente."""
+        with self._lock:
+            self.rows += rows
+            self.chunks += 1
+            self.seconds += seconds
+            if seconds > self.target_seconds:
+                self.slow_chunks += 1
+                factor = max(self.decrease, self.target_seconds / seconds)
+                self._shrink(factor)
+            elif rows >= self.size:
+                # Un lote final incompleto no dice nada de un lote más grande.
+                if self._slow_start:
+                    grown = self.size * 2
+                else:
+                    grown = self.size + max(1, self.size // 10)
+                self.size = min(grown, self.max_size)
+
+    def backoff(self) -> None:
+        """Reduce el tamaño tras un error de paquete o de bloqueo."""
+        with self._lock:
+            self.backoffs += 1
+            self._shrink(self.decrease)
+
+    def _shrink(self, factor: float) -> None:
+        self._slow_start = False
+        self.size = max(self.min_size, int(self.size * factor))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "chunk_size": self.size,
+                "rows": self.rows,
+                "chunks": self.chunks,
+                "rows_per_sec": self.rows / self.seconds if self.seconds > 0 else 0.0,
+                "slow_chunks": self.slow_chunks,
+                "backoffs": self.backoffs,
+            }
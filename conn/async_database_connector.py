@@ -0,0 +1,413 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, List, Optional
+
+from conn.cancellation import QueryTimeoutError
+from conn.connection_protocolo import DBConnectionProtocol
+from conn.database_connector import DatabaseConnector
+
+
+def _safe_rollback(db: DatabaseConnector) -> None:
+    try:
+        db.rollback()
+    except Exception:
+        pass
+
+
+class _Job:
+    """Una llamada encolada en un _Lane y su plazo.
+
+    `expire()` (bucle de eventos) y `begin_commit()` (hilo del lane) se
+    excluyen: o vence el plazo y no se confirma, o el commit ya empezó y el
+    llamador espera su resultado.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.expired = False
+        self.committing = False
+
+    def expire(self) -> bool:
+        with self._lock:
+            if self.committing:
+                return False
+            self.expired = True
+            return True
+
+    def begin_commit(self) -> bool:
+        with self._lock:
+            if self.expired:
+                return False
+            self.committing = True
+            return True
+
+
+def _consume(future: "asyncio.Future") -> None:
+    # Resultado de una llamada abandonada por timeout: se recoge para que
+    # asyncio no avise de una excepción sin recuperar.
+    if not future.cancelled():
+        future.exception()
+
+
+def _commit_unless_expired(lane: "_Lane") -> None:
+    if not lane.job.begin_commit():
+        raise QueryTimeoutError("El plazo venció antes del commit; se deshace la operación.")
+    lane.db.commit()
+
+
+class _Lane:
+    """Un hilo dedicado con su propia conexión.
+
+    Todas las llamadas bloqueantes de una misma conexión se ejecutan en el
+    mismo hilo y en orden, por lo que el driver nunca se comparte entre hilos.
+    """
+
+    def __init__(self, connector_factory: Callable[[], DBConnectionProtocol], index: int):
+        self._factory = connector_factory
+        self.executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix=f"async-db-{index}"
+        )
+        self.db: Optional[DatabaseConnector] = None
+        self.cursor: Any = None
+        self.job: Optional[_Job] = None
+        self._job_lock = threading.Lock()
+
+    def invoke(self, fn: Callable[["_Lane"], Any], job: _Job) -> Any:
+        if job.expired:
+            # Venció mientras esperaba turno: no llega a ejecutarse.
+            raise QueryTimeoutError("El plazo venció antes de ejecutar la operación.")
+        with self._job_lock:
+            self.job = job
+        try:
+            if self.db is None:
+                connector = self._factory()
+                connector.connect()
+                # cancellable: un timeout o una tarea cancelada cortan la sentencia.
+                self.db = DatabaseConnector(connector, cancellable=True)
+            return fn(self)
+        finally:
+            with self._job_lock:
+                self.job = None
+
+    def interrupt(self, job: _Job) -> None:
+        """Cancela (desde otro hilo) las sentencias de `job` si sigue en curso.
+
+        El lock impide que la cancelación alcance a la llamada siguiente.
+        """
+        with self._job_lock:
+            if self.job is job and self.db is not None:
+                self.db.cancel()
+
+    def reset_cursor(self) -> None:
+        if self.cursor is not None:
+            self.cursor.close()
+            self.cursor = None
+
+    def close(self) -> None:
+        self.reset_cursor()
+        if self.db is not None:
+            self.db.close_connection()
+            self.db = None
+
+
+class AsyncSession:
+    """Sesión asíncrona fijada a una conexión (necesaria para transacciones).
+
+    Se obtiene con `AsyncDatabaseConnector.session()`. `execute` deja el
+    cursor posicionado para `fetchone`/`fetchall`, igual que DatabaseConnector.
+    """
+
+    def __init__(self, owner: "AsyncDatabaseConnector", lane: _Lane):
+        self._owner = owner
+        self._lane = lane
+
+    async def _run(self, fn: Callable[[_Lane], Any], timeout: Optional[float]) -> Any:
+        return await self._owner._run_on(self._lane, fn, timeout)
+
+    async def execute(
+        self, sql: str, params: Optional[List[Any]] = None, timeout: Optional[float] = None
+    ) -> int:
+        """Ejecuta la consulta y devuelve rowcount (si el driver lo informa)."""
+
+        def run(lane: _Lane) -> int:
+            if lane.cursor is not None:
+                lane.cursor.close()
+            lane.cursor = lane.db.execute(sql, params or [])
+            return getattr(lane.cursor._cursor, "rowcount", -1)
+
+        return await self._run(run, timeout)
+
+    async def executemany(
+        self,
+        sql: str,
+        params_list: List[List[Any]],
+        timeout: Optional[float] = None,
+    ) -> int:
+        def run(lane: _Lane) -> int:
+            cursor = lane.db.executemany(sql, params_list)
+            try:
+                return getattr(cursor._cursor, "rowcount", -1)
+            finally:
+                cursor.close()
+
+        return await self._run(run, timeout)
+
+    async def fetchone(self, timeout: Optional[float] = None) -> Any:
+        return await self._run(lambda lane: self._cursor(lane).fetchone(), timeout)
+
+    async def fetchall(self, timeout: Optional[float] = None) -> Any:
+        return await self._run(lambda lane: self._cursor(lane).fetchall(), timeout)
+
+    async def stream(
+        self,
+        sql: str,
+        params: Optional[List[Any]] = None,
+        batch_size: int = 1000,
+        as_dict: bool = False,
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[Any]:
+        """Iterador asíncrono de filas; `timeout` aplica a cada lote."""
+        batches = await self._run(
+            lambda lane: lane.db.stream_batches(sql, params, batch_size, as_dict),
+            timeout,
+        )
+        try:
+            while True:
+                rows = await self._run(lambda lane: next(batches, None), timeout)
+                if rows is None:
+                    break
+                for row in rows:
+                    yield row
+        finally:
+            await self._owner._run_on(self._lane, lambda lane: batches.close(), None)
+
+    async def commit(self) -> None:
+        await self._run(lambda lane: lane.db.commit(), None)
+
+    async def rollback(self) -> None:
+        await self._run(lambda lane: lane.db.rollback(), None)
+
+    @staticmethod
+    def _cursor(lane: _Lane) -> Any:
+        if lane.cursor is None:
+            raise RuntimeError("No hay una consulta ejecutada en esta sesión.")
+        return lane.cursor
+
+
+class AsyncDatabaseConnector:
+    """Fachada asyncio sobre DatabaseConnector.
+
+    Las llamadas bloqueantes del driver se ejecutan en un conjunto acotado de
+    `max_workers` hilos, cada uno con su propia conexión creada con
+    `connector_factory` (un conector sin conectar, como en ConnectionPool).
+
+    - `execute`/`executemany` de nivel superior son una unidad de trabajo:
+      confirman al terminar bien y hacen rollback si fallan.
+    - `fetchone`/`fetchall`/`stream` ejecutan la consulta, leen el resultado
+      y hacen rollback: cada conexión del conjunto termina su transacción de
+      lectura, así que con REPEATABLE READ (MySQL) no se queda con una
+      instantánea antigua.
+    - Para transacciones de varias sentencias use `session()`, que fija una
+      conexión y expone `commit()`/`rollback()`. La fachada no los expone:
+      cada llamada de nivel superior puede ir a una conexión distinta y ya
+      es su propia unidad de trabajo.
+
+    `timeout` (por llamada o por defecto) usa asyncio.wait_for: al vencer se
+    cancela la sentencia en curso en el servidor (DatabaseConnector.cancel)
+    y se lanza QueryTimeoutError (subclase de TimeoutError). Cancelar la
+    tarea que espera también cancela la sentencia. La conexión sigue
+    utilizable; si el conector no sabe cancelar, la sentencia termina en su
+    hilo antes de que la conexión se reutilice.
+    Una escritura de nivel superior cuyo plazo vence antes del commit se
+    deshace: nunca se confirma algo por lo que el llamador recibió un
+    timeout. Si el commit ya había empezado, se espera y se devuelve su
+    resultado.
+    """
+
+    def __init__(
+        self,
+        connector_factory: Callable[[], DBConnectionProtocol],
+        max_workers: int = 4,
+        timeout: Optional[float] = None,
+    ):
+        if max_workers < 1:
+            raise ValueError("max_workers debe ser mayor que 0")
+        self._factory = connector_factory
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._lanes: List[_Lane] = []
+        self._idle: Optional[asyncio.Queue] = None
+        self._closed = False
+
+    async def _run_on(
+        self, lane: _Lane, fn: Callable[[_Lane], Any], timeout: Optional[float]
+    ) -> Any:
+        timeout = self.timeout if timeout is None else timeout
+        loop = asyncio.get_running_loop()
+        job = _Job()
+        future = loop.run_in_executor(lane.executor, lane.invoke, fn, job)
+        try:
+            if timeout is None:
+                return await future
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            if not job.expire():
+                # El commit ya empezó: el resultado real es el del commit.
+                return await future
+            future.add_done_callback(_consume)
+            # KILL QUERY abre una conexión: no se bloquea el bucle de eventos.
+            loop.run_in_executor(None, lane.interrupt, job)
+            raise QueryTimeoutError(
+                f"La operación superó el plazo de {timeout}s y se canceló.", timeout=timeout
+            ) from None
+        except asyncio.CancelledError:
+            future.add_done_callback(_consume)
+            if job.expire():
+                loop.run_in_executor(None, lane.interrupt, job)
+            raise
+
+    async def _acquire(self) -> _Lane:
+        if self._closed:
+            raise RuntimeError("AsyncDatabaseConnector está cerrado.")
+        if self._idle is None:
+            self._idle = asyncio.Queue()
+        if self._idle.empty() and len(self._lanes) < self.max_workers:
+            lane = _Lane(self._factory, len(self._lanes))
+            self._lanes.append(lane)
+            return lane
+        return await self._idle.get()
+
+    def _release(self, lane: _Lane) -> None:
+        if self._idle is not None:
+            self._idle.put_nowait(lane)
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[AsyncSession]:
+        """Fija una conexión durante el bloque; hace rollback si el bloque falla."""
+        lane = await self._acquire()
+        session = AsyncSession(self, lane)
+        try:
+            yield session
+        except BaseException:
+            # La sentencia cancelada termina antes que este rollback (mismo hilo).
+            try:
+                await asyncio.shield(session.rollback())
+            except Exception:
+                pass
+            raise
+        finally:
+            # Se encola en el hilo de la conexión: corre antes que su próximo uso.
+            lane.executor.submit(lane.reset_cursor)
+            self._release(lane)
+
+    async def execute(
+        self, sql: str, params: Optional[List[Any]] = None, timeout: Optional[float] = None
+    ) -> int:
+        def run(lane: _Lane) -> int:
+            try:
+                cursor = lane.db.execute(sql, params or [])
+                try:
+                    rowcount = getattr(cursor._cursor, "rowcount", -1)
+                finally:
+                    cursor.close()
+                _commit_unless_expired(lane)
+                return rowcount
+            except BaseException:
+                _safe_rollback(lane.db)
+                raise
+
+        lane = await self._acquire()
+        try:
+            return await self._run_on(lane, run, timeout)
+        finally:
+            self._release(lane)
+
+    async def executemany(
+        self,
+        sql: str,
+        params_list: List[List[Any]],
+        timeout: Optional[float] = None,
+    ) -> int:
+        def run(lane: _Lane) -> int:
+            try:
+                cursor = lane.db.executemany(sql, params_list)
+                try:
+                    rowcount = getattr(cursor._cursor, "rowcount", -1)
+                finally:
+                    cursor.close()
+                _commit_unless_expired(lane)
+                return rowcount
+            except BaseException:
+                _safe_rollback(lane.db)
+                raise
+
+        lane = await self._acquire()
+        try:
+            return await self._run_on(lane, run, timeout)
+        finally:
+            self._release(lane)
+
+    async def fetchone(
+        self, sql: str, params: Optional[List[Any]] = None, timeout: Optional[float] = None
+    ) -> Any:
+        def run(lane: _Lane) -> Any:
+            try:
+                with lane.db.execute(sql, params or []) as cursor:
+                    return cursor.fetchone()
+            finally:
+                _safe_rollback(lane.db)  # cierra la instantánea de lectura
+
+        lane = await self._acquire()
+        try:
+            return await self._run_on(lane, run, timeout)
+        finally:
+            self._release(lane)
+
+    async def fetchall(
+        self, sql: str, params: Optional[List[Any]] = None, timeout: Optional[float] = None
+    ) -> Any:
+        def run(lane: _Lane) -> Any:
+            try:
+                with lane.db.execute(sql, params or []) as cursor:
+                    return cursor.fetchall()
+            finally:
+                _safe_rollback(lane.db)  # cierra la instantánea de lectura
+
+        lane = await self._acquire()
+        try:
+            return await self._run_on(lane, run, timeout)
+        finally:
+            self._release(lane)
+
+    async def stream(
+        self,
+        sql: str,
+        params: Optional[List[Any]] = None,
+        batch_size: int = 1000,
+        as_dict: bool = False,
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[Any]:
+        """Iterador asíncrono de filas leídas en lotes con fetchmany."""
+        async with self.session() as session:
+            async for row in session.stream(sql, params, batch_size, as_dict, timeout):
+                yield row
+            await session.rollback()
+
+    async def close(self) -> None:
+        """Cierra las conexiones y detiene los hilos."""
+        self._closed = True
+        loop = asyncio.get_running_loop()
+        for lane in self._lanes:
+            try:
+                await loop.run_in_executor(lane.executor, lane.close)
+            finally:
+                lane.executor.shutdown(wait=False)
+        self._lanes = []
+
+    async def __aenter__(self) -> "AsyncDatabaseConnector":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
@@ -0,0 +1,174 @@
+import heapq
+import itertools
+import threading
+import time
+from typing import Any, Callable, List, Optional, Set, Tuple
+
+
+class QueryCancelledError(RuntimeError):
+    """La sentencia en curso se canceló (DatabaseConnector.cancel o tarea asyncio)."""
+
+    def __init__(self, message: str, sql: Optional[str] = None):
+        super().__init__(message)
+        self.sql = sql
+
+
+class QueryTimeoutError(QueryCancelledError, TimeoutError):
+    """La sentencia superó su plazo y se canceló; la conexión sigue utilizable."""
+
+    def __init__(self, message: str, sql: Optional[str] = None, timeout: Optional[float] = None):
+        super().__init__(message, sql)
+        self.timeout = timeout
+
+
+def cancel_function(connector: Any, raw_cursor: Any) -> Optional[Callable[[], None]]:
+    """
+    Cómo cancelar lo que ejecuta `raw_cursor` desde otro hilo: el gancho
+    `cancel_query(cursor)` del conector si existe (KILL QUERY en MySQL,
+    cursor.cancel() en SQL Server, interrupt() en SQLite) o, si no,
+    `cursor.cancel()` del driver. None si no hay forma de cancelar.
+    """
+    hook = _probe(connector, "cancel_query")
+    if callable(hook):
+        return lambda: hook(raw_cursor)
+    cancel = _probe(raw_cursor, "cancel")
+    if callable(cancel):
+        return cancel
+    return None
+
+
+def _probe(obj: Any, name: str) -> Any:
+    # Algunos envoltorios delegan con __getattr__ y pueden lanzar algo
+    # distinto de AttributeError: se trata como "no disponible".
+    try:
+        return getattr(obj, name, None)
+    except Exception:
+        return None
+
+
+class Statement:
+    """Sentencia en curso que puede cancelarse desde otro hilo.
+
+    El lock garantiza que la cancelación sólo se envía mientras la sentencia
+    sigue activa: con KILL QUERY, una cancelación tardía podría matar la
+    siguiente sentencia de la misma conexión.
+    """
+
+    def __init__(self, sql: str, cancel: Callable[[], None]):
+        self.sql = sql
+        self._cancel = cancel
+        self._lock = threading.Lock()
+        self.active = True
+        self.reason: Optional[str] = None
+
+    def cancel(self, reason: str = "cancel") -> bool:
+        with self._lock:
+            if not self.active or self.reason is not None:
+                return False
+            self.reason = reason
+            try:
+                self._cancel()
+            except Exception:
+                pass
+            return True
+
+    def finish(self) -> None:
+        with self._lock:
+            self.active = False
+
+
+class _Watchdog:
+    """Un único hilo que vigila los plazos de todas las sentencias.
+
+    Los plazos se guardan en un heap; las sentencias terminadas se descartan
+    al llegar a la cima (o al compactar si se acumulan). Al vencer un plazo,
+    la cancelación se lanza en un hilo aparte porque puede bloquear (KILL
+    QUERY abre una conexión) y retrasaría los demás plazos.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._heap: List[Tuple[float, int, Statement]] = []
+        self._seq = itertools.count()
+        self._pending = 0
+        self._thread: Optional[threading.Thread] = None
+
+    def schedule(self, statement: Statement, timeout: float) -> None:
+        entry = (time.monotonic() + timeout, next(self._seq), statement)
+        with self._cond:
+            heapq.heappush(self._heap, entry)
+            self._pending += 1
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._loop, name="query-watchdog", daemon=True
+                )
+                self._thread.start()
+            elif self._heap[0] is entry:
+                self._cond.notify()
+
+    def done(self) -> None:
+        with self._cond:
+            self._pending -= 1
+            if len(self._heap) > 1024 and len(self._heap) > 4 * self._pending:
+                self._heap = [entry for entry in self._heap if entry[2].active]
+                heapq.heapify(self._heap)
+
+    def _loop(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    while self._heap and not self._heap[0][2].active:
+                        heapq.heappop(self._heap)
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    remaining = self._heap[0][0] - time.monotonic()
+                    if remaining <= 0:
+                        statement = heapq.heappop(self._heap)[2]
+                        break
+                    self._cond.wait(remaining)
+            threading.Thread(
+                target=statement.cancel, args=("timeout",), name="query-cancel", daemon=True
+            ).start()
+
+
+_watchdog = _Watchdog()
+
+
+def run_cancellable(
+    sql: str,
+    cancel: Callable[[], None],
+    fn: Callable[[], Any],
+    timeout: Optional[float],
+    registry: Set[Statement],
+    registry_lock: Any,
+) -> Any:
+    """
+    Ejecuta `fn` (la llamada bloqueante al driver) registrada como sentencia
+    cancelable y, con `timeout`, vigilada por el watchdog que la cancela al
+    vencer. Los errores provocados por la cancelación se traducen a
+    QueryTimeoutError / QueryCancelledError.
+    """
+    statement = Statement(sql, cancel)
+    with registry_lock:
+        registry.add(statement)
+    if timeout is not None:
+        _watchdog.schedule(statement, timeout)
+    try:
+        try:
+            return fn()
+        except BaseException as e:
+            statement.finish()
+            if statement.reason == "timeout":
+                raise QueryTimeoutError(
+                    f"La consulta superó el plazo de {timeout}s y se canceló.", sql, timeout
+                ) from e
+            if statement.reason is not None:
+                raise QueryCancelledError("La consulta fue cancelada.", sql) from e
+            raise
+    finally:
+        statement.finish()
+        if timeout is not None:
+            _watchdog.done()
+        with registry_lock:
+            registry.discard(statement)
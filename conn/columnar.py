@@ -0,0 +1,164 @@
+import datetime
+import decimal
+from typing import Any, Dict, List, Optional, Sequence
+
+# Códigos FIELD_TYPE de MySQL (pymysql.constants.FIELD_TYPE) -> tipo lógico.
+_MYSQL_FIELD_KINDS = {
+    0: "decimal",  # DECIMAL
+    1: "int",  # TINY
+    2: "int",  # SHORT
+    3: "int",  # LONG
+    4: "float",  # FLOAT
+    5: "float",  # DOUBLE
+    7: "datetime",  # TIMESTAMP
+    8: "int",  # LONGLONG
+    9: "int",  # INT24
+    10: "date",  # DATE
+    12: "datetime",  # DATETIME
+    13: "int",  # YEAR
+    14: "date",  # NEWDATE
+    15: "str",  # VARCHAR
+    245: "str",  # JSON
+    246: "decimal",  # NEWDECIMAL
+    247: "str",  # ENUM
+    248: "str",  # SET
+    253: "str",  # VAR_STRING
+    254: "str",  # STRING
+}
+
+# Tipo lógico -> dtype NumPy. Los no listados se guardan como object.
+_NUMPY_DTYPES = {
+    "int": "int64",
+    "float": "float64",
+    "bool": "bool",
+    "datetime": "datetime64[us]",
+    "date": "datetime64[D]",
+}
+
+
+def column_kind(desc: Sequence[Any]) -> str:
+    """
+    Tipo lógico de una columna a partir de su entrada en cursor.description.
+    pyodbc informa el tipo Python (int, str, datetime...) y pymysql el código
+    FIELD_TYPE de MySQL (entero).
+    """
+    type_code = desc[1] if len(desc) > 1 else None
+    if isinstance(type_code, type):
+        # El orden importa: bool es subclase de int y datetime de date.
+        if issubclass(type_code, bool):
+            return "bool"
+        if issubclass(type_code, int):
+            return "int"
+        if issubclass(type_code, float):
+            return "float"
+        if issubclass(type_code, decimal.Decimal):
+            return "decimal"
+        if issubclass(type_code, datetime.datetime):
+            return "datetime"
+        if issubclass(type_code, datetime.date):
+            return "date"
+        if issubclass(type_code, str):
+            return "str"
+        if issubclass(type_code, (bytes, bytearray)):
+            return "bytes"
+        return "object"
+    if isinstance(type_code, int):
+        return _MYSQL_FIELD_KINDS.get(type_code, "object")
+    return "object"
+
+
+def _require_numpy():
+    try:
+        import numpy
+    except ImportError as e:  # pragma: no cover - depende del entorno
+        raise ImportError(
+            "fetch_columns requiere numpy (pip install numpy)."
+        ) from e
+    return numpy
+
+
+class _ColumnBuffer:
+    """Array NumPy que crece geométricamente y se promociona de tipo si hace falta."""
+
+    def __init__(self, np: Any, kind: str, capacity: int):
+        self._np = np
+        self.kind = kind
+        self.array = np.empty(capacity, dtype=_NUMPY_DTYPES.get(kind, object))
+        self.size = 0
+
+    def _promote(self, dtype: Any) -> None:
+        self.array = self.array.astype(dtype)
+
+    def extend(self, values: Sequence[Any]) -> None:
+        n = len(values)
+        end = self.size + n
+        if end > len(self.array):
+            capacity = max(end, len(self.array) * 2)
+            grown = self._np.empty(capacity, dtype=self.array.dtype)
+            grown[: self.size] = self.array[: self.size]
+            self.array = grown
+
+        # bool no falla con None (lo convierte en False): hay que detectarlo antes.
+        if self.array.dtype == bool and None in values:
+            self._promote(object)
+
+        try:
+            self.array[self.size : end] = values
+        except (TypeError, ValueError, OverflowError):
+            # Enteros con NULL -> float64 (NaN); cualquier otro caso -> object.
+            if self.array.dtype.kind == "i" and None in values:
+                self._promote("float64")
+                try:
+                    self.array[self.size : end] = values
+                except (TypeError, ValueError, OverflowError):
+                    self._promote(object)
+                    self.array[self.size : end] = values
+            else:
+                self._promote(object)
+                self.array[self.size : end] = values
+        self.size = end
+
+    def finish(self) -> Any:
+        return self.array[: self.size]
+
+
+def fetch_columns(cursor: Any, batch_size: int = 10000) -> Dict[str, Any]:
+    """
+    Lee un cursor ya ejecutado con fetchmany(batch_size) y devuelve un dict
+    {columna: numpy.ndarray}. Acepta filas tipo tupla (pyodbc) o dict
+    (DictCursor de pymysql). Cada lote se copia directamente en arrays
+    tipados, sin construir un dict por fila; numpy se importa sólo aquí.
+    """
+    np = _require_numpy()
+    description = cursor.description
+    if not description:
+        return {}
+    names: List[str] = [desc[0] for desc in description]
+    buffers = [_ColumnBuffer(np, column_kind(desc), batch_size) for desc in description]
+
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        if hasattr(rows[0], "keys"):
+            columns: Sequence[Sequence[Any]] = [
+                [row[name] for row in rows] for name in names
+            ]
+        else:
+            columns = list(zip(*rows))
+        for buffer, values in zip(buffers, columns):
+            buffer.extend(values)
+
+    return {name: buffer.finish() for name, buffer in zip(names, buffers)}
+
+
+def to_dataframe(columns: Dict[str, Any], index: Optional[str] = None) -> Any:
+    """Construye un pandas.DataFrame a partir de la salida de `fetch_columns`."""
+    try:
+        import pandas
+    except ImportError as e:  # pragma: no cover - depende del entorno
+        raise ImportError("fetch_dataframe requiere pandas (pip install pandas).") from e
+    df = pandas.DataFrame(columns, copy=False)
+    if index is not None:
+        df = df.set_index(index)
+    return df
@@ -0,0 +1,339 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Set, Tuple
+
+from conn.connection_protocolo import DBConnectionProtocol
+from conn.database_connector import DatabaseConnector
+from conn.liveness import check_alive
+
+
+class PoolTimeoutError(TimeoutError):
+    """No se pudo obtener una conexión del pool dentro del tiempo indicado."""
+
+
+class ConnectionPool:
+    """Pool de conexiones seguro entre hilos que implementa DBConnectionProtocol.
+
+    `connector_factory` debe devolver un conector nuevo SIN conectar (por
+    ejemplo `lambda: MySQLConnector(host, database, user, password)`); el pool
+    se encarga de llamar a `connect()` y `close_connection()`.
+
+    Uso típico:
+
+        pool = ConnectionPool(factory, min_size=2, max_size=8)
+        pool.connect()
+        with pool.checkout() as db:
+            db.execute("SELECT 1", [])
+
+    Nota: el gestor de contexto se llama `checkout()` y no `connection()`
+    porque `connection` es el atributo que exige DBConnectionProtocol. Dentro
+    de un `checkout()`, `pool.connection` y `pool.get_cursor()` apuntan a la
+    conexión prestada al hilo actual.
+    """
+
+    def __init__(
+        self,
+        connector_factory: Callable[[], DBConnectionProtocol],
+        min_size: int = 1,
+        max_size: int = 10,
+        timeout: float = 30.0,
+        max_idle: Optional[float] = 300.0,
+        health_check_interval: Optional[float] = 30.0,
+    ):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Se requiere 0 <= min_size <= max_size y max_size >= 1")
+        self._factory = connector_factory
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.health_check_interval = health_check_interval
+
+        # Conector plantilla: nunca se conecta, sólo se usa para paramstyle/engine.
+        self._template = connector_factory()
+
+        self._cond = threading.Condition()
+        self._idle: Deque[Tuple[DBConnectionProtocol, float]] = deque()
+        self._total = 0
+        self._in_use = 0
+        self._leased: Set[DBConnectionProtocol] = set()
+        self._closed = False
+        self._local = threading.local()
+
+        self._created = 0
+        self._destroyed = 0
+        self._recycled = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._timeouts = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+
+    # --- DBConnectionProtocol ---
+
+    @property
+    def connection(self) -> Optional[Any]:
+        """Conexión cruda prestada al hilo actual (None fuera de `checkout()`)."""
+        connector = self._current()
+        return connector.connection if connector is not None else None
+
+    @property
+    def paramstyle(self) -> Optional[str]:
+        return getattr(self._template, "paramstyle", None)
+
+    @property
+    def dialect(self) -> Optional[str]:
+        return getattr(self._template, "dialect", None)
+
+    def connect(self) -> None:
+        """Abre las conexiones mínimas del pool."""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("El pool está cerrado.")
+            missing = max(self.min_size - self._total, 0)
+            self._total += missing
+
+        opened: List[DBConnectionProtocol] = []
+        try:
+            for _ in range(missing):
+                opened.append(self._open())
+        finally:
+            now = time.monotonic()
+            with self._cond:
+                self._total -= missing - len(opened)
+                self._idle.extend((connector, now) for connector in opened)
+                self._cond.notify_all()
+
+    def get_cursor(self) -> Any:
+        connector = self._current()
+        if connector is None:
+            raise Exception("No hay conexión activa.")
+        return connector.get_cursor()
+
+    def close_connection(self) -> None:
+        """Cierra las conexiones libres; las prestadas se cierran al devolverse."""
+        with self._cond:
+            self._closed = True
+            idle = [connector for connector, _ in self._idle]
+            self._idle.clear()
+            self._total -= len(idle)
+            self._cond.notify_all()
+        for connector in idle:
+            self._destroy(connector)
+        # Libera también los Engines que el conector plantilla haya registrado.
+        try:
+            self._template.close_connection()
+        except Exception:
+            pass
+
+    def conn_engine(self, **engine_options: Any):
+        return self._template.conn_engine(**engine_options)
+
+    def cancel_query(self, cursor: Any) -> None:
+        """
+        Cancela la sentencia de `cursor` (llamado desde otro hilo, así que no
+        sirve la conexión prestada al hilo actual): se busca entre las
+        conexiones prestadas la dueña del cursor (`cursor.connection`) y se
+        usa su cancel_query; si no lo tiene, cursor.cancel().
+        """
+        owner = getattr(cursor, "connection", None)
+        with self._cond:
+            leased = list(self._leased)
+        for connector in leased:
+            if owner is not None and connector.connection is owner:
+                hook = getattr(connector, "cancel_query", None)
+                if callable(hook):
+                    hook(cursor)
+                    return
+                break
+        cancel = getattr(cursor, "cancel", None)
+        if callable(cancel):
+            cancel()
+
+    # --- Préstamo de conexiones ---
+
+    def acquire(self, timeout: Optional[float] = None) -> DBConnectionProtocol:
+        """Toma una conexión del pool, bloqueando hasta `timeout` segundos."""
+        timeout = self.timeout if timeout is None else timeout
+        start = time.monotonic()
+        deadline = start + timeout
+        must_create = False
+        waited = False
+        connector: Optional[DBConnectionProtocol] = None
+        returned_at = 0.0
+
+        # Sin tráfico release() no corre: las ociosas vencidas se retiran
+        # también aquí para no entregar una que superó max_idle.
+        with self._cond:
+            reaped = self._reap_idle(start)
+        for c in reaped:
+            self._destroy(c)
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("El pool está cerrado.")
+                if self._idle:
+                    connector, returned_at = self._idle.pop()
+                    break
+                if self._total < self.max_size:
+                    self._total += 1
+                    must_create = True
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeoutError(
+                        f"No hay conexiones disponibles tras {timeout:.3f}s "
+                        f"(max_size={self.max_size})."
+                    )
+                if not waited:
+                    waited = True
+                    self._waits += 1
+                self._cond.wait(remaining)
+
+            self._in_use += 1
+            self._checkouts += 1
+            wait_time = time.monotonic() - start
+            self._wait_time_total += wait_time
+            if wait_time > self._wait_time_max:
+                self._wait_time_max = wait_time
+
+        try:
+            if must_create:
+                connector = self._open()
+            else:
+                assert connector is not None
+                if not self._check_health(connector, returned_at):
+                    self._destroy(connector)
+                    with self._cond:
+                        self._recycled += 1
+                    connector = self._open()
+            with self._cond:
+                self._leased.add(connector)
+            return connector
+        except BaseException:
+            with self._cond:
+                self._total -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
+    def release(self, connector: DBConnectionProtocol, discard: bool = False) -> None:
+        """Devuelve una conexión al pool (o la descarta si `discard`)."""
+        now = time.monotonic()
+        to_close: List[DBConnectionProtocol] = []
+        with self._cond:
+            self._in_use -= 1
+            self._leased.discard(connector)
+            if discard or self._closed:
+                self._total -= 1
+                to_close.append(connector)
+            else:
+                self._idle.append((connector, now))
+                to_close.extend(self._reap_idle(now))
+            self._cond.notify()
+        for c in to_close:
+            self._destroy(c)
+
+    @contextmanager
+    def checkout(self, timeout: Optional[float] = None) -> Iterator[DatabaseConnector]:
+        """Presta una conexión envuelta en un DatabaseConnector durante el bloque.
+
+        Si el bloque lanza una excepción se intenta un rollback antes de
+        devolver la conexión; si el rollback falla, la conexión se descarta.
+        """
+        connector = self.acquire(timeout)
+        stack = self._lease_stack()
+        stack.append(connector)
+        discard = False
+        try:
+            yield DatabaseConnector(connector)
+        except BaseException:
+            try:
+                if connector.connection is not None:
+                    connector.connection.rollback()
+            except Exception:
+                discard = True
+            raise
+        finally:
+            stack.pop()
+            self.release(connector, discard=discard)
+
+    def stats(self) -> Dict[str, Any]:
+        """Instantánea de uso del pool."""
+        with self._cond:
+            return {
+                "size": self._total,
+                "idle": len(self._idle),
+                "in_use": self._in_use,
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "created": self._created,
+                "destroyed": self._destroyed,
+                "recycled": self._recycled,
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+                "timeouts": self._timeouts,
+                "wait_time_total": self._wait_time_total,
+                "wait_time_max": self._wait_time_max,
+            }
+
+    # --- Internos ---
+
+    def _lease_stack(self) -> List[DBConnectionProtocol]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _current(self) -> Optional[DBConnectionProtocol]:
+        stack = getattr(self._local, "stack", None)
+        return stack[-1] if stack else None
+
+    def _open(self) -> DBConnectionProtocol:
+        connector = self._factory()
+        connector.connect()
+        with self._cond:
+            self._created += 1
+        return connector
+
+    def _destroy(self, connector: DBConnectionProtocol) -> None:
+        try:
+            connector.close_connection()
+        except Exception:
+            pass
+        with self._cond:
+            self._destroyed += 1
+
+    def _reap_idle(self, now: float) -> List[DBConnectionProtocol]:
+        """Retira (bajo el lock) las conexiones ociosas más allá de `max_idle`."""
+        reaped: List[DBConnectionProtocol] = []
+        if self.max_idle is None:
+            return reaped
+        # Las más antiguas están a la izquierda: se entrega siempre la más reciente.
+        while (
+            self._idle
+            and self._total > self.min_size
+            and now - self._idle[0][1] > self.max_idle
+        ):
+            connector, _ = self._idle.popleft()
+            self._total -= 1
+            reaped.append(connector)
+        return reaped
+
+    def _check_health(self, connector: DBConnectionProtocol, returned_at: float) -> bool:
+        """Chequeo barato: sólo hace round-trip si la conexión lleva tiempo ociosa."""
+        conn = connector.connection
+        if conn is None or getattr(conn, "closed", False):
+            return False
+        if getattr(conn, "open", True) is False:  # pymysql
+            return False
+        if (
+            self.health_check_interval is None
+            or time.monotonic() - returned_at < self.health_check_interval
+        ):
+            return True
+        return check_alive(connector)
@@ -1,5 +1,8 @@
-from typing import Protocol, runtime_checkable, Any, Optional, List
-from sqlalchemy.engine import Engine
+from typing import TYPE_CHECKING, Protocol, runtime_checkable, Any, Optional, List
+
+if TYPE_CHECKING:
+    # Sólo para anotaciones: evita importar SQLAlchemy al cargar el protocolo.
+    from sqlalchemy.engine import Engine
 
 
 class CursorProtocol(Protocol):
@@ -49,4 +52,4 @@ class DBConnectionProtocol(Protocol):
 
     def close_connection(self) -> None: ...
 
-    def conn_engine(self) -> Engine: ...
+    def conn_engine(self, **engine_options: Any) -> "Engine": ...
@@ -0,0 +1,262 @@
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Union
+
+from conn.database_connector import DatabaseConnector
+
+# DatabaseConnector ya conectado, o fábrica que devuelve uno (uno por escritor).
+TargetSpec = Union[DatabaseConnector, Callable[[], DatabaseConnector]]
+ProgressCallback = Callable[[Dict[str, Any]], None]
+
+
+class CopyError(RuntimeError):
+    """Falló la copia.
+
+    `next_batch` es el primer lote sin confirmar y `skip_batches` los lotes
+    posteriores que sí se confirmaron (con varios escritores terminan
+    desordenados). Se reanuda con start_batch=next_batch y
+    skip_batches=skip_batches.
+    """
+
+    def __init__(
+        self,
+        message: str,
+        next_batch: int,
+        stats: Dict[str, Any],
+        skip_batches: Optional[Set[int]] = None,
+    ):
+        super().__init__(message)
+        self.next_batch = next_batch
+        self.stats = stats
+        self.skip_batches: Set[int] = set(skip_batches or ())
+
+
+class _CopyState:
+    """Contadores compartidos entre el lector y los escritores."""
+
+    def __init__(
+        self, start_batch: int, skip_batches: Set[int], progress: Optional[ProgressCallback]
+    ):
+        self.lock = threading.Lock()
+        self.stop = threading.Event()
+        self.start = time.perf_counter()
+        self.progress = progress
+        self.errors: List[BaseException] = []
+        # Lotes confirmados más allá del prefijo contiguo (incluye los que se
+        # saltan al reanudar).
+        self.committed: Set[int] = {i for i in skip_batches if i >= start_batch}
+        self.next_batch = start_batch
+        self._advance()
+        self.rows = 0
+        self.batches = 0
+        self.read_wait = 0.0
+        self.write_wait = 0.0
+
+    def fail(self, error: BaseException) -> None:
+        with self.lock:
+            self.errors.append(error)
+        self.stop.set()
+
+    def committed_batch(self, index: int, rows: int) -> None:
+        with self.lock:
+            self.committed.add(index)
+            self._advance()
+            self.rows += rows
+            self.batches += 1
+            snapshot = self.snapshot()
+        if self.progress is not None:
+            self.progress(snapshot)
+
+    def _advance(self) -> None:
+        # Con varios escritores los lotes terminan desordenados: next_batch
+        # avanza sobre el prefijo contiguo ya confirmado.
+        while self.next_batch in self.committed:
+            self.committed.discard(self.next_batch)
+            self.next_batch += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        elapsed = time.perf_counter() - self.start
+        return {
+            "rows": self.rows,
+            "batches": self.batches,
+            "next_batch": self.next_batch,
+            "seconds": elapsed,
+            "rows_per_sec": self.rows / elapsed if elapsed > 0 else 0.0,
+            # Tiempo del lector bloqueado con la cola llena (cuello: escritura)
+            # y de los escritores esperando datos (cuello: lectura).
+            "read_wait": self.read_wait,
+            "write_wait": self.write_wait,
+        }
+
+
+def _read(
+    source_db: DatabaseConnector,
+    query: str,
+    params: Optional[Sequence[Any]],
+    batch_size: int,
+    start_batch: int,
+    skip_batches: Set[int],
+    columns_out: List[str],
+    columns_ready: threading.Event,
+    batches: "queue.Queue[Any]",
+    n_writers: int,
+    state: _CopyState,
+) -> None:
+    cursor = None
+    try:
+        cursor = source_db._open_stream_cursor(query, list(params or []), batch_size, as_dict=False)
+        names = [desc[0] for desc in cursor.description]
+        if not columns_out:
+            columns_out.extend(names)
+        columns_ready.set()
+        index = 0
+        while not state.stop.is_set():
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            if index >= start_batch and index not in skip_batches:
+                if hasattr(rows[0], "keys"):  # DictCursor de pymysql
+                    rows = [tuple(row[name] for name in names) for row in rows]
+                waited = time.perf_counter()
+                batches.put((index, rows))
+                with state.lock:
+                    state.read_wait += time.perf_counter() - waited
+            index += 1
+    except BaseException as e:
+        state.fail(e)
+    finally:
+        columns_ready.set()
+        if cursor is not None:
+            cursor.close()
+        for _ in range(n_writers):
+            batches.put(None)
+
+
+def _write(
+    target: TargetSpec,
+    target_table: str,
+    columns: List[str],
+    batches: "queue.Queue[Any]",
+    state: _CopyState,
+) -> None:
+    db: Optional[DatabaseConnector] = None
+    owned = not isinstance(target, DatabaseConnector)
+    try:
+        db = target() if owned else target
+    except BaseException as e:
+        state.fail(e)
+    while True:
+        waited = time.perf_counter()
+        item = batches.get()
+        with state.lock:
+            state.write_wait += time.perf_counter() - waited
+        if item is None:
+            break
+        if state.stop.is_set() or db is None:
+            continue  # Se sigue vaciando la cola para no bloquear al lector.
+        index, rows = item
+        try:
+            db.bulk_insert(target_table, columns, rows, chunk_size=len(rows))
+            db.commit()
+        except BaseException as e:
+            try:
+                db.rollback()
+            except Exception:
+                pass
+            state.fail(e)
+            continue
+        state.committed_batch(index, len(rows))
+    if owned and db is not None:
+        db.close_connection()
+
+
+def copy_table(
+    source_db: DatabaseConnector,
+    target_db: TargetSpec,
+    query: str,
+    target_table: str,
+    params: Optional[Sequence[Any]] = None,
+    columns: Optional[Sequence[str]] = None,
+    batch_size: int = 5000,
+    writers: int = 1,
+    queue_size: int = 4,
+    start_batch: int = 0,
+    skip_batches: Optional[Iterable[int]] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> Dict[str, Any]:
+    """
+    Copia el resultado de `query` (en `source_db`) a `target_table` con un
+    hilo lector y `writers` hilos escritores solapando lectura y escritura.
+
+    - El lector lee con el cursor de streaming en lotes de `batch_size` y los
+      deja en una cola de `queue_size` lotes: si los escritores no dan abasto,
+      el lector se bloquea (la memoria queda acotada).
+    - Cada escritor inserta un lote con `bulk_insert` (camino rápido del
+      conector destino) y lo confirma con su propio commit.
+    - `columns` son las columnas destino (por defecto, las de la consulta).
+    - Con writers > 1, `target_db` debe ser una fábrica que devuelva un
+      DatabaseConnector conectado: cada escritor usa su propia conexión.
+    - Si algo falla se lanza CopyError con `next_batch` (todos los lotes
+      anteriores están confirmados) y `skip_batches` (lotes posteriores ya
+      confirmados por otros escritores). La copia se reanuda pasando
+      `start_batch=e.next_batch, skip_batches=e.skip_batches`; reanudar sólo
+      con start_batch duplicaría esos lotes si writers > 1. La consulta debe
+      tener ORDER BY estable; los lotes ya copiados se leen y se descartan.
+    - `progress(stats)` se llama tras cada lote confirmado.
+
+    Devuelve {"rows", "batches", "next_batch", "seconds", "rows_per_sec",
+    "read_wait", "write_wait"}.
+    """
+    if batch_size <= 0:
+        raise ValueError("batch_size debe ser mayor que 0")
+    if writers < 1 or queue_size < 1:
+        raise ValueError("writers y queue_size deben ser mayores que 0")
+    if writers > 1 and isinstance(target_db, DatabaseConnector):
+        raise ValueError(
+            "Con writers > 1, target_db debe ser una fábrica de DatabaseConnector."
+        )
+
+    skip = set(skip_batches or ())
+    state = _CopyState(start_batch, skip, progress)
+    batches: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+    target_columns: List[str] = list(columns or [])
+    columns_ready = threading.Event()
+
+    reader = threading.Thread(
+        target=_read,
+        args=(
+            source_db, query, params, batch_size, start_batch, skip,
+            target_columns, columns_ready, batches, writers, state,
+        ),
+        name="copy-table-reader",
+        daemon=True,
+    )
+    reader.start()
+    # Los escritores necesitan los nombres de columna (description del cursor).
+    columns_ready.wait()
+
+    writer_threads = [
+        threading.Thread(
+            target=_write,
+            args=(target_db, target_table, target_columns, batches, state),
+            name=f"copy-table-writer-{i}",
+            daemon=True,
+        )
+        for i in range(writers)
+    ]
+    for thread in writer_threads:
+        thread.start()
+    reader.join()
+    for thread in writer_threads:
+        thread.join()
+
+    stats = state.snapshot()
+    if state.errors:
+        raise CopyError(
+            f"Copia a {target_table} interrumpida: {state.errors[0]}",
+            stats["next_batch"],
+            stats,
+            state.committed,
+        ) from state.errors[0]
+    return stats
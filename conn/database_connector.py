@@ -1,6 +1,33 @@
-from typing import Any, List, Tuple, Dict, Union
-
+import logging
+import threading
+import time
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+from conn.adaptive_batch import AdaptiveBatchSizer, classify_error
+from conn.cancellation import QueryCancelledError, cancel_function, run_cancellable
 from conn.connection_protocolo import DBConnectionProtocol, CursorProtocol
+from conn.query_template import (
+    CompiledQuery,
+    QueryTemplateCache,
+    default_template_cache,
+)
+from conn.single_flight import MaterializedResult, ResultCursor, SingleFlight, flight_key
+from conn.sql_inspect import is_read_query
+
+logger = logging.getLogger(__name__)
 
 
 class DBCursor(CursorProtocol):
@@ -10,6 +37,9 @@ class DBCursor(CursorProtocol):
         if raw_cursor is None:
             raise RuntimeError("Cursor subyacente no puede ser None")
         self._cursor = raw_cursor
+        # Un cursor "fijado" lo reutiliza DatabaseConnector entre sentencias:
+        # close() no lo cierra; se libera en close_connection().
+        self._pinned = False
 
     # --- Nuevo: Atributo 'description' del cursor
     @property
@@ -29,10 +59,20 @@ class DBCursor(CursorProtocol):
     def fetchall(self) -> Any:
         return self._cursor.fetchall()
 
+    def fetchmany(self, size: Optional[int] = None) -> Any:
+        if size is None:
+            return self._cursor.fetchmany()
+        return self._cursor.fetchmany(size)
+
     def lastrowid(self) -> Any:
         return self._cursor.lastrowid
 
     def close(self) -> None:
+        if self._pinned:
+            return
+        self._release()
+
+    def _release(self) -> None:
         try:
             self._cursor.close()
         except Exception:
@@ -45,13 +85,80 @@ class DBCursor(CursorProtocol):
         self.close()
 
 
+class PreparedStatement:
+    """Sentencia ligada a un cursor propio creada con `DatabaseConnector.prepare()`.
+
+    El SQL se formatea una sola vez y se ejecuta siempre con el mismo objeto
+    de texto sobre el mismo cursor, de modo que pyodbc reutiliza el handle
+    preparado (SQLPrepare) en lugar de volver a prepararlo en cada ejecución.
+    """
+
+    def __init__(self, db: "DatabaseConnector", compiled: CompiledQuery, cursor: DBCursor):
+        self._db = db
+        self._compiled = compiled
+        self.cursor = cursor
+        self.sql = compiled.sql
+        self.closed = False
+
+    def execute(
+        self, params: Optional[Sequence[Any]] = None, timeout: Optional[float] = None
+    ) -> DBCursor:
+        """Como DatabaseConnector.execute: plazo, cancel() e invalidaciones incluidos."""
+        if self.closed:
+            raise RuntimeError("La sentencia preparada está cerrada.")
+        params_final = self._compiled.bind(params or [])
+        return self._call(lambda: self._db._execute_on(self.cursor, self.sql, params_final, timeout))
+
+    def executemany(
+        self, params_list: Sequence[Sequence[Any]], timeout: Optional[float] = None
+    ) -> DBCursor:
+        if self.closed:
+            raise RuntimeError("La sentencia preparada está cerrada.")
+        if not params_list:
+            raise ValueError("params_list no puede estar vacío para executemany.")
+        bind = self._compiled.bind
+        final_params_list = [bind(params) for params in params_list]
+        return self._call(
+            lambda: self._db._executemany_on(self.cursor, self.sql, final_params_list, timeout)
+        )
+
+    def _call(self, run: Callable[[], DBCursor]) -> DBCursor:
+        try:
+            return run()
+        except QueryCancelledError:
+            # Una cancelación descarta el cursor: se abre otro para seguir.
+            self.cursor = self._db.get_cursor()
+            raise
+
+    def close(self) -> None:
+        if not self.closed:
+            self.closed = True
+            self.cursor._release()
+            self._db._forget(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
 class DatabaseConnector:
     """
     Clase fachada que utiliza cualquier conector que implemente DBConnectionProtocol.
     Ahora incluye la detección y exposición del paramstyle del driver.
     """
 
-    def __init__(self, connector: DBConnectionProtocol):
+    def __init__(
+        self,
+        connector: DBConnectionProtocol,
+        template_cache: Optional[QueryTemplateCache] = None,
+        instrumentation: Optional[Any] = None,
+        reuse_cursor: bool = False,
+        query_timeout: Optional[float] = None,
+        cancellable: bool = False,
+        single_flight: Optional[SingleFlight] = None,
+    ):
         if not isinstance(connector, DBConnectionProtocol):
             raise TypeError("El conector debe implementar DBConnectionProtocol.")
         self._connector = connector
@@ -70,6 +177,49 @@ class DatabaseConnector:
         if self._paramstyle is None:
             self._paramstyle = "format"
 
+        # Caché de plantillas '{}' compiladas; por defecto compartida entre instancias.
+        self._template_cache = (
+            template_cache if template_cache is not None else default_template_cache
+        )
+
+        # Instrumentación opcional (conn.instrumentation.Instrumentation). Si es
+        # None se usa DBCursor tal cual, sin ningún coste adicional.
+        self._instrumentation = instrumentation
+
+        # Con reuse_cursor=True, execute/executemany reutilizan un cursor por
+        # hilo en vez de pedir uno nuevo al driver en cada sentencia. Los
+        # cursores de hilos terminados se liberan al crear uno nuevo.
+        self._reuse_cursor = reuse_cursor
+        self._thread_cursors: Dict[threading.Thread, DBCursor] = {}
+        self._resources: Set[Any] = set()
+        self._resources_lock = threading.Lock()
+
+        # Plazo por defecto (segundos) de execute/executemany. Con un plazo o
+        # con cancellable=True las sentencias se registran para poder
+        # cancelarlas con cancel(); sin ninguno no hay coste adicional.
+        self._query_timeout = query_timeout
+        self._cancellable = cancellable
+        self._statements: Set[Any] = set()
+        self._warned_uncancellable = False
+        self._statements_lock = threading.Lock()
+
+        # Con un SingleFlight (compartido entre conectores de la misma base),
+        # las lecturas idénticas concurrentes de execute() se ejecutan una
+        # sola vez. Las lecturas dentro de una transacción con escrituras
+        # pendientes no se agrupan: _in_transaction se activa al escribir y
+        # se limpia con commit/rollback.
+        self._single_flight = single_flight
+        self._in_transaction = False
+        self._autocommit = False
+
+        # Tamaño de lote aprendido por executemany_adaptive, uno por plantilla.
+        self._sizers: Dict[str, AdaptiveBatchSizer] = {}
+        self._sizers_lock = threading.Lock()
+
+    def _compile(self, sql_template: str) -> CompiledQuery:
+        """Obtiene la plantilla compilada (cacheada) para el paramstyle actual."""
+        return self._template_cache.get(sql_template, self.paramstyle)
+
     def _format_query(
         self, sql_template: str, params: List[Any]
     ) -> Tuple[str, Union[Tuple[Any, ...], Dict[str, Any]]]:
@@ -78,57 +228,141 @@ class DatabaseConnector:
         Devuelve (sql_final, params_final) donde params_final es tuple o dict
         según el paramstyle detectado.
         """
-        if params is None:
-            params = []
-
-        paramstyle = self.paramstyle  # garantizado como str
-        parts = sql_template.split("{}")
-        if len(parts) - 1 != len(params):
-            raise ValueError(
-                "Número de placeholders '{}' no coincide con la cantidad de params"
-            )
-
-        placeholders: List[str] = []
-        named_params: Dict[str, Any] = {}
-        for i, val in enumerate(params, start=1):
-            if paramstyle == "qmark":
-                ph = "?"
-                placeholders.append(ph)
-            elif paramstyle == "format":
-                ph = "%s"
-                placeholders.append(ph)
-            elif paramstyle == "numeric":
-                ph = f":{i}"
-                placeholders.append(ph)
-            elif paramstyle == "named":
-                name = f"p{i}"
-                ph = f":{name}"
-                placeholders.append(ph)
-                named_params[name] = val
-            elif paramstyle == "pyformat":
-                name = f"p{i}"
-                ph = f"%({name})s"
-                placeholders.append(ph)
-                named_params[name] = val
-            else:
-                ph = "%s"
-                placeholders.append(ph)
-
-        sql_final = "".join(p + ph for p, ph in zip(parts, placeholders + [""]))
+        compiled = self._compile(sql_template)
+        return compiled.sql, compiled.bind(params)
 
-        if paramstyle in ("named", "pyformat"):
-            return sql_final, named_params
-        else:
-            return sql_final, tuple(params)
+    def template_cache_info(self) -> Dict[str, int]:
+        """Contadores de la caché de plantillas compiladas (hits, misses, size)."""
+        return self._template_cache.cache_info()
 
-    def execute(self, sql: str, params: List[Any]):
+    def execute(self, sql: str, params: List[Any], timeout: Optional[float] = None):
         """
         Ejecuta la consulta formateando placeholders '{}' según el paramstyle detectado.
         Devuelve el DBCursor ya posicionado (no lo cierra).
+        `timeout` (segundos) reemplaza al query_timeout del conector; al vencer
+        se cancela la sentencia y se lanza QueryTimeoutError. Si el conector no
+        sabe cancelar (ni cancel_query ni cursor.cancel()), no se aplica y se
+        registra un aviso en el logger "conn.database_connector" (una vez).
         """
-        cursor = self.get_cursor()
         sql_final, params_final = self._format_query(sql, params or [])
+        if (
+            self._single_flight is not None
+            and not self._in_transaction
+            and is_read_query(sql_final)
+        ):
+            return self._coalesced(sql_final, params_final, timeout)
+        return self._execute_on(self._statement_cursor(), sql_final, params_final, timeout)
+
+    def _execute_on(
+        self,
+        cursor: DBCursor,
+        sql_final: str,
+        params_final: Union[Tuple[Any, ...], Dict[str, Any]],
+        timeout: Optional[float],
+    ) -> DBCursor:
+        """Camino común de execute y PreparedStatement.execute (SQL ya formateado)."""
+        if self._single_flight is not None and not is_read_query(sql_final):
+            self._mark_write()
+        self._guarded(
+            cursor, sql_final, lambda: self._run(cursor, sql_final, params_final), timeout
+        )
+        return cursor
 
+    def _coalesced(
+        self,
+        sql_final: str,
+        params_final: Union[Tuple[Any, ...], Dict[str, Any]],
+        timeout: Optional[float],
+    ) -> DBCursor:
+        """
+        Lectura agrupada: el primer hilo la ejecuta y materializa (fetchall);
+        los que piden la misma lectura mientras tanto reciben las mismas filas.
+        Devuelve un DBCursor sobre el resultado materializado.
+        """
+
+        def load() -> MaterializedResult:
+            cursor = self._statement_cursor()
+            try:
+                self._guarded(
+                    cursor, sql_final, lambda: self._run(cursor, sql_final, params_final), timeout
+                )
+                rows = list(cursor.fetchall())
+                return MaterializedResult(
+                    cursor.description, rows, getattr(cursor._cursor, "rowcount", -1)
+                )
+            finally:
+                cursor.close()
+
+        try:
+            key = flight_key(sql_final, params_final, self.paramstyle)
+        except TypeError:  # parámetros no hashables: sin agrupar
+            return DBCursor(ResultCursor(load()))
+        wait = self._query_timeout if timeout is None else timeout
+        result, _ = self._single_flight.do(key, load, wait)
+        return DBCursor(ResultCursor(result))
+
+    def _mark_write(self) -> None:
+        if self._single_flight is not None and not self._autocommit:
+            self._in_transaction = True
+
+    def single_flight_stats(self) -> Optional[Dict[str, Any]]:
+        """Métricas del SingleFlight (ejecuciones, lecturas ahorradas...) o None."""
+        if self._single_flight is None:
+            return None
+        return self._single_flight.stats()
+
+    def _guarded(self, cursor: DBCursor, sql_final: str, call: Any, timeout: Optional[float]) -> Any:
+        """Ejecuta `call` con plazo y registrada para cancel() si corresponde."""
+        if timeout is None:
+            timeout = self._query_timeout
+        if timeout is None and not self._cancellable:
+            return call()
+        cancel = cancel_function(self._connector, cursor._cursor)
+        if cancel is None:
+            # Sin cancel_query ni cursor.cancel() no hay forma de cortar la
+            # sentencia: se ejecuta sin plazo (queda el timeout del driver,
+            # p. ej. read_timeout en MySQL o query_timeout en SQL Server).
+            if timeout is not None and not self._warned_uncancellable:
+                self._warned_uncancellable = True
+                logger.warning(
+                    "%s no permite cancelar sentencias: se ignora el plazo de %ss "
+                    "(configure el timeout del driver).",
+                    type(self._connector).__name__,
+                    timeout,
+                )
+            return call()
+        try:
+            return run_cancellable(
+                sql_final, cancel, call, timeout, self._statements, self._statements_lock
+            )
+        except QueryCancelledError:
+            # El cursor pudo quedar a medias: se descarta, la conexión sigue viva.
+            if cursor._pinned:
+                with self._resources_lock:
+                    if self._thread_cursors.get(threading.current_thread()) is cursor:
+                        del self._thread_cursors[threading.current_thread()]
+                self._forget(cursor)
+            cursor._release()
+            raise
+
+    def cancel(self) -> int:
+        """
+        Cancela las sentencias en curso de este conector (desde otro hilo o
+        tarea). Cada una termina con QueryCancelledError y la conexión queda
+        utilizable. Sólo ve sentencias ejecutadas con plazo o con
+        cancellable=True. Devuelve cuántas se cancelaron.
+        """
+        with self._statements_lock:
+            statements = list(self._statements)
+        return sum(1 for statement in statements if statement.cancel())
+
+    def _run(
+        self,
+        cursor: Any,
+        sql_final: str,
+        params_final: Union[Tuple[Any, ...], Dict[str, Any]],
+    ) -> None:
+        """Ejecuta SQL ya formateado adaptándose a la firma del driver."""
         # Algunos drivers aceptan execute(sql) cuando no hay params, otros requieren tuple/dict.
         try:
             if isinstance(params_final, dict):
@@ -145,66 +379,482 @@ class DatabaseConnector:
                 cursor.execute(sql_final, *params_final)
             else:
                 cursor.execute(sql_final, params_final)
+
+    def _open_stream_cursor(
+        self,
+        sql: str,
+        params: Optional[List[Any]],
+        batch_size: int,
+        as_dict: bool,
+    ) -> DBCursor:
+        """
+        Abre y ejecuta un cursor apto para lectura incremental.
+        Si el conector expone `get_stream_cursor(batch_size, as_dict)` (cursor
+        del lado del servidor, arraysize ajustado...) se usa; si no, se toma un
+        cursor normal y se ajusta su `arraysize` cuando el driver lo permite.
+        """
+        stream_cursor = getattr(self._connector, "get_stream_cursor", None)
+        if callable(stream_cursor):
+            raw = stream_cursor(batch_size, as_dict)
+        else:
+            raw = self._connector.get_cursor()
+            try:
+                raw.arraysize = batch_size
+            except Exception:
+                pass
+        cursor = self._wrap_cursor(raw)
+        try:
+            sql_final, params_final = self._format_query(sql, params or [])
+            self._run(cursor, sql_final, params_final)
+        except BaseException:
+            cursor.close()
+            raise
         return cursor
 
-    def executemany(self, sql: str, params_list: List[List[Any]]):
+    def stream_batches(
+        self,
+        sql: str,
+        params: Optional[List[Any]] = None,
+        batch_size: int = 1000,
+        as_dict: bool = False,
+    ) -> Iterator[List[Any]]:
+        """
+        Generador de lotes (listas de filas) leídos con fetchmany(batch_size).
+        Con as_dict=True las filas tipo tupla se convierten a dict usando los
+        nombres de columna tomados una sola vez de cursor.description.
+        El cursor se cierra al agotar el generador o al cerrarlo.
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size debe ser mayor que 0")
+        cursor = self._open_stream_cursor(sql, params, batch_size, as_dict)
+        try:
+            cols: Optional[List[str]] = None
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                if as_dict and not hasattr(rows[0], "keys"):
+                    if cols is None:
+                        cols = [desc[0] for desc in cursor.description]
+                    rows = [dict(zip(cols, row)) for row in rows]
+                yield rows
+        finally:
+            cursor.close()
+
+    def stream(
+        self,
+        sql: str,
+        params: Optional[List[Any]] = None,
+        batch_size: int = 1000,
+        as_dict: bool = False,
+    ) -> Iterator[Any]:
+        """
+        Generador fila a fila sobre `stream_batches`: la memoria se mantiene
+        acotada a un lote de `batch_size` filas sin importar el total.
+        """
+        for rows in self.stream_batches(sql, params, batch_size, as_dict):
+            yield from rows
+
+    def executemany(
+        self, sql: str, params_list: List[List[Any]], timeout: Optional[float] = None
+    ):
         """
         Ejecuta una consulta con múltiples conjuntos de parámetros.
         args:
             sql: consulta con '{}' como placeholders.
             params_list: lista de listas de parámetros.
+            timeout: plazo en segundos (por defecto query_timeout del conector).
         devuelve: DBCursor posicionado (no cerrado).
         """
-        cursor = self.get_cursor()
         if not params_list:
             raise ValueError("params_list no puede estar vacío para executemany.")
+        # La plantilla se compila una sola vez; cada fila sólo se enlaza.
+        compiled = self._compile(sql)
+        bind = compiled.bind
+        final_params_list: List[Union[Tuple[Any, ...], Dict[str, Any]]] = [
+            bind(params) for params in params_list
+        ]
+        return self._executemany_on(
+            self._statement_cursor(), compiled.sql, final_params_list, timeout
+        )
+
+    def _executemany_on(
+        self,
+        cursor: DBCursor,
+        sql_final: str,
+        final_params_list: List[Union[Tuple[Any, ...], Dict[str, Any]]],
+        timeout: Optional[float],
+    ) -> DBCursor:
+        """Camino común de executemany y PreparedStatement.executemany."""
+        self._mark_write()
+
+        def call() -> None:
+            try:
+                cursor.executemany(sql_final, final_params_list)
+            except TypeError:
+                # fallback: pasar parámetros como *args si el driver los espera así
+                for params in final_params_list:
+                    if isinstance(params, tuple):
+                        cursor.execute(sql_final, *params)
+                    else:
+                        cursor.execute(sql_final, params)
+
+        self._guarded(cursor, sql_final, call, timeout)
+        return cursor
 
-        # Formateamos la consulta usando el primer conjunto de parámetros
-        sql_final, _ = self._format_query(sql, params_list[0])
-
-        # Preparamos los parámetros según el paramstyle
-        paramstyle = self.paramstyle
-        final_params_list: List[Union[Tuple[Any, ...], Dict[str, Any]]] = []
+    def executemany_adaptive(
+        self,
+        sql: str,
+        rows: Iterable[Sequence[Any]],
+        target_seconds: float = 0.25,
+        initial_size: int = 100,
+        min_size: int = 1,
+        max_size: int = 10_000,
+        commit: bool = False,
+        max_retries: int = 5,
+    ) -> Dict[str, Any]:
+        """
+        executemany por bloques de tamaño adaptativo sobre cualquier iterable
+        (no se materializa completo). El tamaño se ajusta en cada bloque hacia
+        `target_seconds` por bloque (AIMD, ver AdaptiveBatchSizer) y se
+        recuerda por plantilla entre llamadas.
+
+        Ante un error de paquete (max_allowed_packet, demasiados parámetros)
+        o un deadlock el tamaño se reduce a la mitad. Sólo con commit=True se
+        hace rollback y se reintenta el mismo bloque: cada bloque se confirma
+        por separado, así que el rollback sólo deshace el bloque fallido. Sin
+        commit, un reintento podría duplicar filas de un bloque a medio
+        aplicar (o la transacción ya se perdió), así que el error se propaga.
+
+        Devuelve {"rows", "chunks", "seconds", "rows_per_sec", "chunk_size",
+        "retries"}.
+        """
+        sizer = self._sizer(sql, target_seconds, initial_size, min_size, max_size)
+        iterator = iter(rows)
+        pending: List[Sequence[Any]] = []
+        total = 0
+        chunks = 0
+        retries = 0
+        attempts = 0
+        start = time.perf_counter()
+        while True:
+            size = sizer.size
+            if len(pending) < size:
+                pending.extend(islice(iterator, size - len(pending)))
+            if not pending:
+                break
+            chunk = pending[:size]
+            chunk_start = time.perf_counter()
+            try:
+                self.executemany(sql, chunk).close()
+                if commit:
+                    self.commit()
+            except Exception as e:
+                kind = classify_error(e)
+                if kind is not None:
+                    sizer.backoff()
+                if kind is None or not commit or attempts >= max_retries:
+                    raise
+                try:
+                    self.rollback()
+                except Exception:
+                    pass
+                attempts += 1
+                retries += 1
+                continue
+            sizer.record(len(chunk), time.perf_counter() - chunk_start)
+            del pending[: len(chunk)]
+            attempts = 0
+            total += len(chunk)
+            chunks += 1
+
+        elapsed = time.perf_counter() - start
+        return {
+            "rows": total,
+            "chunks": chunks,
+            "seconds": elapsed,
+            "rows_per_sec": total / elapsed if elapsed > 0 else 0.0,
+            "chunk_size": sizer.size,
+            "retries": retries,
+        }
+
+    def _sizer(
+        self,
+        sql: str,
+        target_seconds: float,
+        initial_size: int,
+        min_size: int,
+        max_size: int,
+    ) -> AdaptiveBatchSizer:
+        with self._sizers_lock:
+            sizer = self._sizers.get(sql)
+            if sizer is None:
+                sizer = AdaptiveBatchSizer(initial_size, min_size, max_size, target_seconds)
+                self._sizers[sql] = sizer
+            else:
+                sizer.configure(min_size, max_size, target_seconds)
+            return sizer
+
+    def adaptive_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Tamaño de lote elegido y filas/s de executemany_adaptive, por plantilla."""
+        with self._sizers_lock:
+            sizers = dict(self._sizers)
+        return {sql: sizer.stats() for sql, sizer in sizers.items()}
+
+    def execute_batch(
+        self,
+        statements: Sequence[Union[str, Tuple[str, Sequence[Any]]]],
+    ) -> List[Any]:
+        """
+        Ejecuta varias sentencias ('{}' como placeholders) en un solo viaje de
+        red cuando el driver lo permite. `statements` es una lista de SQL o de
+        tuplas (sql, params).
+        Devuelve, por sentencia, la lista de filas si produjo un resultado o
+        su rowcount si no.
+        Si el conector expone `execute_batch(cursor, statements)` y el
+        paramstyle es posicional se usa ese camino (MySQL con
+        multi_statements=True, lote T-SQL en SQL Server); si el conector
+        devuelve None o no lo expone, se ejecutan una a una con el mismo cursor.
+        """
+        formatted: List[Tuple[str, Union[Tuple[Any, ...], Dict[str, Any]]]] = []
+        for statement in statements:
+            if isinstance(statement, str):
+                sql, params = statement, []
+            else:
+                sql, params = statement
+            formatted.append(self._format_query(sql, list(params or [])))
+        if not formatted:
+            return []
+        if self._single_flight is not None and not all(
+            is_read_query(sql_final) for sql_final, _ in formatted
+        ):
+            self._mark_write()
+
+        batch = getattr(self._connector, "execute_batch", None)
+        cursor = self.get_cursor()
+        try:
+            if callable(batch) and all(isinstance(p, tuple) for _, p in formatted):
+                results = batch(cursor._cursor, formatted)
+                if results is not None:
+                    return results
+            results = []
+            for sql_final, params_final in formatted:
+                self._run(cursor, sql_final, params_final)
+                if cursor.description is not None:
+                    results.append(list(cursor.fetchall()))
+                else:
+                    results.append(cursor._cursor.rowcount)
+            return results
+        finally:
+            cursor.close()
+
+    def bulk_insert(
+        self,
+        table: str,
+        columns: Sequence[str],
+        rows: Iterable[Sequence[Any]],
+        chunk_size: int = 1000,
+        commit: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Inserta filas en `table` por bloques de `chunk_size`. `rows` puede ser
+        cualquier iterable (incluido un generador); nunca se materializa completo.
+        Si el conector expone `bulk_insert_chunk` se usa su camino rápido
+        (fast_executemany en SQL Server, INSERT multi-fila en MySQL); si no, se
+        usa executemany. `table` y `columns` se interpolan tal cual en el SQL.
+        Con commit=True se confirma cada bloque.
+        Devuelve {"rows", "chunks", "seconds", "rows_per_sec"}.
+        """
+        if not columns:
+            raise ValueError("columns no puede estar vacío para bulk_insert.")
+        if chunk_size <= 0:
+            raise ValueError("chunk_size debe ser mayor que 0")
+
+        template = "INSERT INTO {} ({}) VALUES ({})".format(
+            table, ", ".join(columns), ", ".join(["{}"] * len(columns))
+        )
+        compiled = self._compile(template)
+        insert_chunk = getattr(self._connector, "bulk_insert_chunk", None)
+        self._mark_write()
+
+        total = 0
+        chunks = 0
+        start = time.perf_counter()
+        cursor = self.get_cursor()
+        try:
+            iterator = iter(rows)
+            while True:
+                chunk = list(islice(iterator, chunk_size))
+                if not chunk:
+                    break
+                if callable(insert_chunk):
+                    insert_chunk(cursor._cursor, table, columns, compiled.sql, chunk)
+                else:
+                    cursor.executemany(
+                        compiled.sql, [compiled.bind(row) for row in chunk]
+                    )
+                total += len(chunk)
+                chunks += 1
+                if commit:
+                    self.commit()
+        finally:
+            cursor.close()
+
+        elapsed = time.perf_counter() - start
+        return {
+            "rows": total,
+            "chunks": chunks,
+            "seconds": elapsed,
+            "rows_per_sec": total / elapsed if elapsed > 0 else 0.0,
+        }
+
+    def fetch_columns(
+        self,
+        sql: str,
+        params: Optional[List[Any]] = None,
+        batch_size: int = 10000,
+    ) -> Dict[str, Any]:
+        """
+        Ejecuta la consulta y devuelve {columna: numpy.ndarray} leyendo en lotes,
+        sin pasar por un dict por fila. Los dtypes se infieren de cursor.description.
+        """
+        from conn.columnar import fetch_columns
 
-        for params in params_list:
-            _, params_final = self._format_query(sql, params)
-            final_params_list.append(params_final)
+        cursor = self._open_stream_cursor(sql, params, batch_size, as_dict=False)
+        try:
+            return fetch_columns(cursor, batch_size)
+        finally:
+            cursor.close()
+
+    def fetch_dataframe(
+        self,
+        sql: str,
+        params: Optional[List[Any]] = None,
+        batch_size: int = 10000,
+        index: Optional[str] = None,
+    ):
+        """Como fetch_columns, pero devuelve un pandas.DataFrame."""
+        from conn.columnar import to_dataframe
+
+        return to_dataframe(self.fetch_columns(sql, params, batch_size), index=index)
+
+    def export(
+        self,
+        sql: str,
+        params: Optional[List[Any]],
+        path: str,
+        format: str = "csv",
+        batch_size: int = 10000,
+        compression: Optional[str] = None,
+        delimiter: str = ",",
+    ) -> Dict[str, Any]:
+        """
+        Ejecuta la consulta y escribe el resultado en `path` (csv, parquet o
+        arrow) por lotes, sin fetchall ni DataFrame intermedio. Los tipos
+        salen de cursor.description. Devuelve filas, bytes y rendimiento;
+        ver conn.export.export_cursor.
+        """
+        from conn.export import export_cursor
 
+        cursor = self._open_stream_cursor(sql, params, batch_size, as_dict=False)
         try:
-            if paramstyle in ("named", "pyformat"):
-                cursor.executemany(sql_final, final_params_list)
-            else:
-                cursor.executemany(sql_final, final_params_list)
-        except TypeError:
-            # fallback: pasar parámetros como *args si el driver los espera así
-            for params in final_params_list:
-                if isinstance(params, tuple):
-                    cursor.execute(sql_final, *params)
-                else:
-                    cursor.execute(sql_final, params)
-        return cursor
+            return export_cursor(cursor, path, format, batch_size, compression, delimiter)
+        finally:
+            cursor.close()
+
+    def paginate(
+        self,
+        sql_template: str,
+        key_columns: Sequence[str],
+        page_size: int,
+        params: Optional[List[Any]] = None,
+        cursor: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Página de `sql_template` por keyset (sin OFFSET) ordenada por
+        `key_columns`. Devuelve {"rows", "next", "prev"} con tokens opacos
+        para pedir la página siguiente/anterior; ver conn.pagination.paginate.
+        """
+        from conn.pagination import paginate
+
+        return paginate(self, sql_template, params, key_columns, page_size, cursor)
 
     def get_cursor(self) -> CursorProtocol:
         raw = self._connector.get_cursor()
-        return DBCursor(raw)
+        return self._wrap_cursor(raw)
+
+    def _wrap_cursor(self, raw: Any) -> DBCursor:
+        if self._instrumentation is None:
+            return DBCursor(raw)
+        return self._instrumentation.wrap_cursor(raw)
+
+    def _statement_cursor(self) -> DBCursor:
+        """Cursor para execute/executemany: nuevo, o el reutilizable del hilo."""
+        if not self._reuse_cursor:
+            return self.get_cursor()
+        thread = threading.current_thread()
+        with self._resources_lock:
+            cursor = self._thread_cursors.get(thread)
+        if cursor is not None:
+            return cursor
+        cursor = self.get_cursor()
+        cursor._pinned = True
+        with self._resources_lock:
+            dead = [t for t in self._thread_cursors if not t.is_alive()]
+            orphans = [self._thread_cursors.pop(t) for t in dead]
+            self._resources.difference_update(orphans)
+            self._thread_cursors[thread] = cursor
+            self._resources.add(cursor)
+        for orphan in orphans:
+            orphan._release()
+        return cursor
+
+    def prepare(self, sql_template: str) -> PreparedStatement:
+        """
+        Devuelve una sentencia preparada ligada a un cursor dedicado.
+        Re-ejecutarla evita reformatear el SQL y, en pyodbc, volver a prepararlo.
+        Se cierra con close() o automáticamente en close_connection().
+        """
+        statement = PreparedStatement(self, self._compile(sql_template), self.get_cursor())
+        with self._resources_lock:
+            self._resources.add(statement)
+        return statement
+
+    def _forget(self, resource: Any) -> None:
+        with self._resources_lock:
+            self._resources.discard(resource)
+
+    def _close_resources(self) -> None:
+        with self._resources_lock:
+            resources = list(self._resources)
+            self._resources.clear()
+            self._thread_cursors.clear()
+        for resource in resources:
+            if isinstance(resource, PreparedStatement):
+                resource.close()
+            else:
+                resource._release()
 
     def get_paramstyle(self):
         return self._paramstyle
 
     def close_connection(self):
+        self._close_resources()
         self._connector.close_connection()
 
-    def conn_engine(self):
-        return self._connector.conn_engine()
+    def conn_engine(self, **engine_options: Any):
+        return self._connector.conn_engine(**engine_options)
 
     def commit(self):
         if self._connector.connection is None:
             raise RuntimeError("No active connection to commit.")
+        self._in_transaction = False
         return self._connector.connection.commit()
 
     def rollback(self):
         if self._connector.connection is None:
             raise RuntimeError("No active connection to rollback.")
+        self._in_transaction = False
         return self._connector.connection.rollback()
 
     def autocommit(self, value: bool):
@@ -221,6 +871,9 @@ class DatabaseConnector:
                 setattr(conn, "autocommit", value)
             except Exception:
                 raise RuntimeError("El objeto de conexión no soporta autocommit")
+        self._autocommit = value
+        if value:
+            self._in_transaction = False
 
     def rows_to_dict(self, cur, row):
         """
@@ -228,6 +881,20 @@ class DatabaseConnector:
         Maneja objetos tipo mapping, tuplas/listas y construye nombres de columnas
         a partir de cursor.description cuando sea necesario.
         """
+        if self._instrumentation is None:
+            return self._rows_to_dict(cur, row)
+        start = time.perf_counter()
+        result = self._rows_to_dict(cur, row)
+        rows = len(result) if isinstance(result, list) else int(result is not None)
+        self._instrumentation.record(
+            getattr(cur, "_template", None),
+            "convert",
+            time.perf_counter() - start,
+            rows=rows,
+        )
+        return result
+
+    def _rows_to_dict(self, cur, row):
         if row is None:
             return None
 
@@ -238,14 +905,10 @@ class DatabaseConnector:
             except Exception:
                 pass
 
-        # si es una lista o tupla
-        if isinstance(row, (list, tuple)):
-            if isinstance(row, list):
-                # lista de filas
-                return [self.rows_to_dict(cur, r) for r in row]
-            else:
-                # tupla única
-                return self.rows_to_dict(cur, row)
+        # una lista es una lista de filas; una tupla es una fila única y se
+        # convierte abajo con los nombres de columna (antes recursaba sin fin).
+        if isinstance(row, list):
+            return [self._rows_to_dict(cur, r) for r in row]
 
         cols = [desc[0] for desc in cur._cursor.description]
 
@@ -264,3 +927,8 @@ class DatabaseConnector:
     def paramstyle(self):
         """Retorna el estilo de parámetros esperado por el driver de la BD subyacente."""
         return self._paramstyle
+
+    @property
+    def dialect(self) -> Optional[str]:
+        """Dialecto SQL del conector ('mysql', 'mssql', 'sqlite') o None si no lo expone."""
+        return getattr(self._connector, "dialect", None)
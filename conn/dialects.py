@@ -0,0 +1,104 @@
+import re
+from typing import Any, List, Optional, Sequence, Tuple
+
+# Generadores de SQL que cambian según el motor. Todo se devuelve como
+# plantilla con '{}' para que DatabaseConnector la adapte al paramstyle.
+# Tablas y columnas se interpolan tal cual (igual que en bulk_insert).
+
+DIALECTS = ("mysql", "mssql", "sqlite")
+
+_SELECT_HEAD = re.compile(r"^\s*SELECT\s+(DISTINCT\s+)?", re.IGNORECASE)
+
+
+def dialect_of(db: Any) -> str:
+    """Dialecto de un DatabaseConnector o conector; ValueError si no se conoce."""
+    dialect: Optional[str] = getattr(db, "dialect", None)
+    if dialect not in DIALECTS:
+        raise ValueError(
+            f"Dialecto SQL no soportado: {dialect!r} (use {', '.join(DIALECTS)})"
+        )
+    return dialect
+
+
+def limit_query(dialect: str, sql: str, n: int) -> str:
+    """Limita un SELECT a `n` filas: TOP (n) en SQL Server, LIMIT n en el resto."""
+    n = int(n)
+    if dialect == "mssql":
+        if not _SELECT_HEAD.match(sql):
+            raise ValueError("limit_query requiere una sentencia SELECT.")
+        return _SELECT_HEAD.sub(lambda m: f"SELECT {m.group(1) or ''}TOP ({n}) ", sql, count=1)
+    return f"{sql} LIMIT {n}"
+
+
+def keyset_predicate(
+    columns: Sequence[str],
+    values: Sequence[Any],
+    op: str = ">",
+) -> Tuple[str, List[Any]]:
+    """
+    Predicado de búsqueda por clave compuesta (a, b) `op` (va, vb), expandido
+    a (a > va) OR (a = va AND b > vb) porque SQL Server no admite comparar
+    tuplas de filas. Devuelve (sql con '{}', params).
+    """
+    if op not in (">", "<"):
+        raise ValueError("op debe ser '>' o '<'")
+    if len(columns) != len(values) or not columns:
+        raise ValueError("keyset_predicate requiere tantos valores como columnas.")
+    terms = []
+    params: List[Any] = []
+    for i, column in enumerate(columns):
+        parts = [f"{prev} = {{}}" for prev in columns[:i]]
+        parts.append(f"{column} {op} {{}}")
+        params.extend(values[: i + 1])
+        terms.append("(" + " AND ".join(parts) + ")")
+    return "(" + " OR ".join(terms) + ")", params
+
+
+def upsert_sql(
+    dialect: str,
+    table: str,
+    columns: Sequence[str],
+    key_columns: Sequence[str],
+) -> str:
+    """
+    INSERT que actualiza la fila si la clave ya existe (idempotente):
+    ON DUPLICATE KEY UPDATE en MySQL, MERGE en SQL Server y
+    ON CONFLICT ... DO UPDATE en SQLite. Un '{}' por columna, en orden.
+    """
+    missing = [k for k in key_columns if k not in columns]
+    if not key_columns or missing:
+        raise ValueError(f"Las columnas clave deben estar entre las columnas: {missing}")
+    cols = ", ".join(columns)
+    placeholders = ", ".join(["{}"] * len(columns))
+    updates = [c for c in columns if c not in key_columns]
+
+    if dialect == "mysql":
+        if not updates:
+            return f"INSERT IGNORE INTO {table} ({cols}) VALUES ({placeholders})"
+        assignments = ", ".join(f"{c} = VALUES({c})" for c in updates)
+        return (
+            f"INSERT INTO {table} ({cols}) VALUES ({placeholders}) "
+            f"ON DUPLICATE KEY UPDATE {assignments}"
+        )
+    if dialect == "mssql":
+        on = " AND ".join(f"tgt.{k} = src.{k}" for k in key_columns)
+        sql = (
+            f"MERGE INTO {table} WITH (HOLDLOCK) AS tgt "
+            f"USING (VALUES ({placeholders})) AS src ({cols}) ON {on} "
+        )
+        if updates:
+            assignments = ", ".join(f"tgt.{c} = src.{c}" for c in updates)
+            sql += f"WHEN MATCHED THEN UPDATE SET {assignments} "
+        values = ", ".join(f"src.{c}" for c in columns)
+        return sql + f"WHEN NOT MATCHED THEN INSERT ({cols}) VALUES ({values});"
+    if dialect == "sqlite":
+        keys = ", ".join(key_columns)
+        if not updates:
+            action = "DO NOTHING"
+        else:
+            action = "DO UPDATE SET " + ", ".join(f"{c} = excluded.{c}" for c in updates)
+        return (
+            f"INSERT INTO {table} ({cols}) VALUES ({placeholders}) "
+            f"ON CONFLICT ({keys}) {action}"
+        )
+    raise ValueError(f"Dialecto SQL no soportado: {dialect!r}")
@@ -0,0 +1,59 @@
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Dict, Tuple, Union
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import URL, Engine
+
+
+class EngineRegistry:
+    """Registro de Engines de SQLAlchemy indexado por URL y opciones.
+
+    `create_engine` crea un pool nuevo en cada llamada; este registro devuelve
+    siempre el mismo Engine para la misma combinación (url, opciones), de modo
+    que las conexiones del pool se reutilizan entre llamadas a `conn_engine()`.
+    """
+
+    def __init__(self):
+        self._engines: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], "Engine"] = {}
+        self._lock = Lock()
+
+    @staticmethod
+    def _key(url: Union[str, "URL"], options: Dict[str, Any]):
+        if hasattr(url, "render_as_string"):
+            url_key = url.render_as_string(hide_password=False)
+        else:
+            url_key = str(url)
+        return url_key, tuple(sorted((k, repr(v)) for k, v in options.items()))
+
+    def get(self, url: Union[str, "URL"], **options: Any) -> "Engine":
+        """
+        Devuelve el Engine para `url`, creándolo la primera vez.
+        Las opciones con valor None se ignoran (se usa el valor por defecto
+        de SQLAlchemy), p. ej. pool_size, max_overflow, pool_pre_ping, pool_recycle.
+        """
+        options = {k: v for k, v in options.items() if v is not None}
+        key = self._key(url, options)
+        with self._lock:
+            engine = self._engines.get(key)
+            if engine is None:
+                # SQLAlchemy se importa recién al crear el primer Engine.
+                from sqlalchemy import create_engine
+
+                engine = create_engine(url, **options)
+                self._engines[key] = engine
+            return engine
+
+    def dispose_all(self) -> None:
+        """Cierra los pools de todos los Engines registrados y vacía el registro."""
+        with self._lock:
+            engines = list(self._engines.values())
+            self._engines.clear()
+        for engine in engines:
+            try:
+                engine.dispose()
+            except Exception:
+                pass
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._engines)
@@ -0,0 +1,225 @@
+import bz2
+import csv
+import datetime
+import gzip
+import lzma
+import os
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from conn.columnar import column_kind
+
+FORMATS = ("csv", "parquet", "arrow")
+
+# Compresión de CSV: se aplica al flujo de texto completo.
+_CSV_OPENERS: Dict[str, Callable[..., Any]] = {
+    "gzip": gzip.open,
+    "bz2": bz2.open,
+    "xz": lzma.open,
+}
+
+
+def _batches(cursor: Any, batch_size: int) -> Iterator[Sequence[Any]]:
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            return
+        yield rows
+
+
+def _as_tuples(rows: Sequence[Any], names: List[str]) -> Sequence[Any]:
+    # DictCursor de pymysql -> tuplas en el orden de description.
+    if rows and hasattr(rows[0], "keys"):
+        return [tuple(row[name] for name in names) for row in rows]
+    return rows
+
+
+def _resolve_kinds(description: Sequence[Any], first_rows: Sequence[Any]) -> List[str]:
+    """
+    Tipo lógico por columna según description; si el driver no informa el
+    tipo (sqlite3, códigos desconocidos) se deduce del primer valor no nulo
+    del primer lote.
+    """
+    kinds = []
+    for i, desc in enumerate(description):
+        kind = column_kind(desc)
+        if kind == "object":
+            sample = next((row[i] for row in first_rows if row[i] is not None), None)
+            if sample is not None:
+                kind = column_kind((desc[0], type(sample)))
+        kinds.append(kind)
+    return kinds
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (bytes, bytearray)):
+        return value.hex()
+    return value
+
+
+def _write_csv(
+    cursor: Any,
+    path: str,
+    names: List[str],
+    batch_size: int,
+    compression: Optional[str],
+    delimiter: str,
+) -> Dict[str, int]:
+    if compression is None:
+        handle = open(path, "w", newline="", encoding="utf-8")
+    elif compression in _CSV_OPENERS:
+        handle = _CSV_OPENERS[compression](path, "wt", newline="", encoding="utf-8")
+    else:
+        raise ValueError(
+            f"Compresión no soportada para CSV: {compression} "
+            f"(use {', '.join(_CSV_OPENERS)})"
+        )
+    rows_written = 0
+    batches = 0
+    with handle:
+        writer = csv.writer(handle, delimiter=delimiter)
+        writer.writerow(names)
+        for rows in _batches(cursor, batch_size):
+            rows = _as_tuples(rows, names)
+            writer.writerows([_csv_value(v) for v in row] for row in rows)
+            rows_written += len(rows)
+            batches += 1
+    return {"rows": rows_written, "batches": batches}
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+    except ImportError as e:  # pragma: no cover - depende del entorno
+        raise ImportError(
+            "export a parquet/arrow requiere pyarrow (pip install pyarrow)."
+        ) from e
+    return pyarrow
+
+
+def _arrow_type(pa: Any, kind: str, desc: Sequence[Any]) -> Any:
+    if kind == "int":
+        return pa.int64()
+    if kind == "float":
+        return pa.float64()
+    if kind == "bool":
+        return pa.bool_()
+    if kind == "datetime":
+        return pa.timestamp("us")
+    if kind == "date":
+        return pa.date32()
+    if kind == "bytes":
+        return pa.binary()
+    if kind == "decimal":
+        precision = desc[4] if len(desc) > 4 else None
+        scale = desc[5] if len(desc) > 5 else None
+        if isinstance(precision, int) and isinstance(scale, int) and 0 < precision <= 38:
+            return pa.decimal128(precision, scale)
+    # str, object y decimales sin precisión conocida: texto (sin pérdida).
+    return pa.string()
+
+
+def _arrow_column(pa: Any, values: Sequence[Any], arrow_type: Any) -> Any:
+    if pa.types.is_string(arrow_type):
+        values = [None if v is None else (v if isinstance(v, str) else str(v)) for v in values]
+    elif pa.types.is_floating(arrow_type):
+        # Los DECIMAL/enteros que lleguen a una columna float se convierten aquí.
+        values = [None if v is None else float(v) for v in values]
+    return pa.array(values, type=arrow_type)
+
+
+def _write_arrow(
+    cursor: Any,
+    path: str,
+    names: List[str],
+    description: Sequence[Any],
+    batch_size: int,
+    format: str,
+    compression: Optional[str],
+) -> Dict[str, int]:
+    pa = _require_pyarrow()
+    batches_iter = _batches(cursor, batch_size)
+    first = next(batches_iter, None)
+    first = _as_tuples(first, names) if first else []
+    kinds = _resolve_kinds(description, first)
+    schema = pa.schema(
+        [pa.field(name, _arrow_type(pa, kind, desc)) for name, kind, desc in zip(names, kinds, description)]
+    )
+
+    if format == "parquet":
+        import pyarrow.parquet as pq
+
+        options = {} if compression is None else {"compression": compression}
+        writer = pq.ParquetWriter(path, schema, **options)
+    else:
+        ipc_options = pa.ipc.IpcWriteOptions(compression=compression)
+        writer = pa.ipc.new_file(path, schema, options=ipc_options)
+
+    rows_written = 0
+    batches = 0
+    try:
+        rows: Sequence[Any] = first
+        while rows:
+            columns = list(zip(*rows))
+            batch = pa.record_batch(
+                [_arrow_column(pa, col, field.type) for col, field in zip(columns, schema)],
+                schema=schema,
+            )
+            writer.write_batch(batch)
+            rows_written += len(rows)
+            batches += 1
+            nxt = next(batches_iter, None)
+            rows = _as_tuples(nxt, names) if nxt else []
+    finally:
+        writer.close()
+    return {"rows": rows_written, "batches": batches}
+
+
+def export_cursor(
+    cursor: Any,
+    path: str,
+    format: str = "csv",
+    batch_size: int = 10000,
+    compression: Optional[str] = None,
+    delimiter: str = ",",
+) -> Dict[str, Any]:
+    """
+    Escribe el resultado de un cursor ya ejecutado en `path`, lote a lote
+    (fetchmany(batch_size)), sin materializarlo: la memoria queda acotada a
+    un lote. Acepta filas tipo tupla (pyodbc) o dict (DictCursor de pymysql).
+
+    - csv: cabecera con los nombres de columna; compresión gzip, bz2 o xz.
+    - parquet / arrow (Arrow IPC, formato archivo): requieren pyarrow; el
+      esquema sale de cursor.description (ver `column_kind`) y la compresión
+      se pasa tal cual a pyarrow (snappy, zstd, lz4, gzip...).
+
+    Devuelve {"rows", "batches", "bytes", "seconds", "rows_per_sec", "bytes_per_sec"}.
+    """
+    if format not in FORMATS:
+        raise ValueError(f"Formato no soportado: {format} (use {', '.join(FORMATS)})")
+    if batch_size <= 0:
+        raise ValueError("batch_size debe ser mayor que 0")
+    description = cursor.description
+    if not description:
+        raise ValueError("La consulta no devolvió columnas para exportar.")
+    names = [desc[0] for desc in description]
+
+    start = time.perf_counter()
+    if format == "csv":
+        stats = _write_csv(cursor, path, names, batch_size, compression, delimiter)
+    else:
+        stats = _write_arrow(cursor, path, names, description, batch_size, format, compression)
+    elapsed = time.perf_counter() - start
+
+    size = os.path.getsize(path)
+    stats.update(
+        bytes=size,
+        seconds=elapsed,
+        rows_per_sec=stats["rows"] / elapsed if elapsed > 0 else 0.0,
+        bytes_per_sec=size / elapsed if elapsed > 0 else 0.0,
+    )
+    return stats
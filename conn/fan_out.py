@@ -0,0 +1,121 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from conn.database_connector import DatabaseConnector
+
+# (DatabaseConnector o fábrica que lo crea, sql con '{}', params)
+FanOutTarget = Tuple[
+    Union[DatabaseConnector, Callable[[], DatabaseConnector]],
+    str,
+    Optional[Sequence[Any]],
+]
+
+
+def _run_target(
+    name: Hashable,
+    target: FanOutTarget,
+    locks: Dict[int, threading.Lock],
+) -> Dict[str, Any]:
+    db_or_factory, sql, params = target
+    start = time.perf_counter()
+    result: Dict[str, Any] = {"target": name, "rows": None, "error": None}
+    try:
+        if isinstance(db_or_factory, DatabaseConnector):
+            db = db_or_factory
+            # Dos destinos sobre el mismo conector comparten conexión: se serializan.
+            with locks[id(db)]:
+                result["rows"] = _fetchall(db, sql, params)
+        else:
+            db = db_or_factory()
+            try:
+                result["rows"] = _fetchall(db, sql, params)
+            finally:
+                db.close_connection()
+    except Exception as e:
+        result["error"] = e
+    result["elapsed"] = time.perf_counter() - start
+    return result
+
+
+def _fetchall(db: DatabaseConnector, sql: str, params: Optional[Sequence[Any]]) -> Any:
+    with db.execute(sql, list(params or [])) as cursor:
+        return cursor.fetchall()
+
+
+def fan_out(
+    queries_by_connector: Mapping[Hashable, FanOutTarget],
+    max_workers: Optional[int] = None,
+    as_completed: bool = False,
+    timeout: Optional[float] = None,
+) -> Union[List[Dict[str, Any]], Iterator[Dict[str, Any]]]:
+    """
+    Ejecuta en paralelo una consulta por destino y devuelve sus resultados.
+
+    queries_by_connector: {nombre: (db, sql, params)} donde `db` es un
+        DatabaseConnector ya conectado o una fábrica sin argumentos que crea
+        uno (se cierra al terminar). Cada destino usa su propia conexión; si
+        dos destinos comparten DatabaseConnector, se ejecutan uno tras otro.
+    max_workers: hilos del pool (por defecto, uno por destino).
+    as_completed: False -> lista en el orden de entrada; True -> iterador
+        que entrega cada resultado en cuanto termina.
+    timeout: segundos totales; los destinos pendientes se reportan con
+        TimeoutError (su hilo termina en segundo plano).
+
+    Cada resultado es {"target", "rows", "error", "elapsed"}: los errores se
+    capturan por destino en lugar de abortar el resto.
+    """
+    items = list(queries_by_connector.items())
+    locks: Dict[int, threading.Lock] = {
+        id(target[0]): threading.Lock()
+        for _, target in items
+        if isinstance(target[0], DatabaseConnector)
+    }
+    executor = ThreadPoolExecutor(max_workers=max_workers or max(len(items), 1))
+    futures: Dict[Future, Hashable] = {
+        executor.submit(_run_target, name, target, locks): name for name, target in items
+    }
+    deadline = None if timeout is None else time.monotonic() + timeout
+
+    def _timed_out(name: Hashable) -> Dict[str, Any]:
+        return {
+            "target": name,
+            "rows": None,
+            "error": TimeoutError(f"El destino {name!r} superó {timeout}s"),
+            "elapsed": timeout,
+        }
+
+    def _iter_completed() -> Iterator[Dict[str, Any]]:
+        pending = set(futures)
+        try:
+            while pending:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+            for future in pending:
+                future.cancel()
+                yield _timed_out(futures[future])
+        finally:
+            executor.shutdown(wait=False)
+
+    if as_completed:
+        return _iter_completed()
+
+    by_name = {result["target"]: result for result in _iter_completed()}
+    return [by_name[name] for name, _ in items]
@@ -0,0 +1,169 @@
+import datetime
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from conn import value_codec
+from conn.database_connector import DatabaseConnector
+from conn.dialects import dialect_of, keyset_predicate, limit_query, upsert_sql
+
+Watermark = Tuple[Any, ...]
+
+
+class WatermarkStore:
+    """Marcas de agua por nombre de sincronización en un archivo SQLite local."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS watermarks ("
+                "name TEXT PRIMARY KEY, value TEXT NOT NULL, updated_at TEXT NOT NULL)"
+            )
+
+    def get(self, name: str) -> Optional[Watermark]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM watermarks WHERE name = ?", (name,)
+            ).fetchone()
+        if row is None:
+            return None
+        return value_codec.loads(row[0])
+
+    def set(self, name: str, watermark: Sequence[Any]) -> None:
+        value = value_codec.dumps(watermark)
+        now = datetime.datetime.now().isoformat()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO watermarks (name, value, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (name) DO UPDATE SET value = excluded.value, "
+                "updated_at = excluded.updated_at",
+                (name, value, now),
+            )
+
+    def delete(self, name: str) -> None:
+        """Olvida la marca: la próxima sincronización vuelve a copiar todo."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM watermarks WHERE name = ?", (name,))
+
+    def all(self) -> Dict[str, Watermark]:
+        with self._lock:
+            names = [r[0] for r in self._conn.execute("SELECT name FROM watermarks")]
+        return {name: self.get(name) for name in names}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def sync_table(
+    source_db: DatabaseConnector,
+    target_db: DatabaseConnector,
+    source_table: str,
+    target_table: str,
+    columns: Sequence[str],
+    key_columns: Sequence[str],
+    mark_columns: Sequence[str],
+    store: WatermarkStore,
+    name: Optional[str] = None,
+    batch_size: int = 5000,
+    where: Optional[str] = None,
+    progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Copia a `target_table` sólo las filas de `source_table` posteriores a la
+    marca de agua guardada en `store` bajo `name` (por defecto
+    "source_table->target_table").
+
+    - `mark_columns` define el orden y la marca, p. ej. ["updated_at", "id"]
+      (fecha de modificación + clave única para desempatar) o ["id"] para
+      claves crecientes. La última columna debe ser única y ninguna puede
+      ser NULL: el predicado `col > marca` nunca selecciona una marca NULL,
+      así que esas filas se perderían en silencio. Si un lote trae una marca
+      NULL se lanza ValueError (filtre con `where` o use COALESCE en una vista).
+    - Cada lote se lee con un predicado keyset (sin OFFSET) y LIMIT/TOP según
+      el dialecto de origen, y se escribe con un upsert por `key_columns`
+      según el dialecto de destino (ON DUPLICATE KEY UPDATE, MERGE u
+      ON CONFLICT).
+    - La marca avanza justo después del commit de cada lote. Si el proceso
+      cae entre ambos, el lote se reaplica en la siguiente corrida: el upsert
+      es idempotente, así que no hay duplicados ni pérdidas.
+    - `where` (SQL sin parámetros) filtra además las filas de origen.
+    - Tras cada lectura se hace rollback en `source_db` para cerrar la
+      transacción de lectura: con REPEATABLE READ (MySQL) un conector de
+      larga vida seguiría viendo la instantánea de la primera corrida. No
+      comparta `source_db` con escrituras pendientes de confirmar.
+
+    Devuelve {"rows", "batches", "watermark", "seconds", "rows_per_sec"}.
+    """
+    if batch_size <= 0:
+        raise ValueError("batch_size debe ser mayor que 0")
+    columns = list(columns)
+    missing = [c for c in list(mark_columns) + list(key_columns) if c not in columns]
+    if not mark_columns or missing:
+        raise ValueError(f"Columnas de marca/clave ausentes de columns: {missing}")
+    name = name or f"{source_table}->{target_table}"
+    source_dialect = dialect_of(source_db)
+    upsert = upsert_sql(dialect_of(target_db), target_table, columns, key_columns)
+    mark_index = [columns.index(c) for c in mark_columns]
+    order_by = ", ".join(mark_columns)
+    select = f"SELECT {', '.join(columns)} FROM {source_table}"
+
+    watermark = store.get(name)
+    rows_total = 0
+    batches = 0
+    start = time.perf_counter()
+    while True:
+        conditions = [f"({where})"] if where else []
+        params: List[Any] = []
+        if watermark is not None:
+            predicate, params = keyset_predicate(mark_columns, watermark)
+            conditions.append(predicate)
+        sql = select
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql = limit_query(source_dialect, f"{sql} ORDER BY {order_by}", batch_size)
+
+        try:
+            with source_db.execute(sql, params) as cursor:
+                rows = cursor.fetchall()
+        finally:
+            source_db.rollback()  # cierra la instantánea de lectura
+        if not rows:
+            break
+        if hasattr(rows[0], "keys"):  # DictCursor de pymysql
+            rows = [tuple(row[c] for c in columns) for row in rows]
+        if any(row[i] is None for row in rows for i in mark_index):
+            raise ValueError(
+                f"Las columnas de marca {list(mark_columns)} de {source_table} "
+                "contienen NULL: esas filas no pueden seguirse por marca de agua."
+            )
+
+        try:
+            target_db.executemany(upsert, [list(row) for row in rows]).close()
+            target_db.commit()
+        except BaseException:
+            target_db.rollback()
+            raise
+        last = rows[-1]
+        watermark = tuple(last[i] for i in mark_index)
+        store.set(name, watermark)
+
+        rows_total += len(rows)
+        batches += 1
+        if progress is not None:
+            progress({"rows": rows_total, "batches": batches, "watermark": watermark})
+        if len(rows) < batch_size:
+            break
+
+    elapsed = time.perf_counter() - start
+    return {
+        "rows": rows_total,
+        "batches": batches,
+        "watermark": watermark,
+        "seconds": elapsed,
+        "rows_per_sec": rows_total / elapsed if elapsed > 0 else 0.0,
+    }
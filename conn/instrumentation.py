@@ -0,0 +1,248 @@
+import logging
+import math
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from conn.database_connector import DBCursor
+
+slow_query_logger = logging.getLogger("conn.slow_query")
+
+PHASES = ("execute", "fetch", "convert")
+
+BeforeHook = Callable[[str, Any], None]
+AfterHook = Callable[[Dict[str, Any]], None]
+
+
+def _percentile(sorted_samples: List[float], p: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    index = max(math.ceil(p * len(sorted_samples)) - 1, 0)
+    return sorted_samples[index]
+
+
+class _TemplateStats:
+    __slots__ = ("count", "errors", "rows", "bytes", "totals", "phase_rows", "samples")
+
+    def __init__(self, sample_size: int):
+        self.count = 0
+        self.errors = 0
+        self.rows = 0
+        self.bytes = 0
+        self.totals = dict.fromkeys(PHASES, 0.0)
+        self.phase_rows = dict.fromkeys(PHASES, 0)
+        self.samples: Dict[str, Deque[float]] = {
+            phase: deque(maxlen=sample_size) for phase in PHASES
+        }
+
+
+class Instrumentation:
+    """Métricas por plantilla SQL, hooks pre/post ejecución y log de consultas lentas.
+
+    Se activa pasando una instancia a `DatabaseConnector(..., instrumentation=...)`.
+    Sin ella, DatabaseConnector devuelve el DBCursor normal y no se paga nada.
+
+    - Tiempos separados en fases: execute, fetch y convert (rows_to_dict).
+    - Histogramas de latencia por plantilla (últimas `sample_size` muestras)
+      con p50/p95/p99 en `snapshot()`.
+    - Consultas cuyo tiempo acumulado (execute + fetch) supera
+      `slow_query_threshold` segundos se registran en el logger
+      'conn.slow_query' y en `slow_queries`.
+    - Con `measure_bytes=True` se estima el tamaño de las filas leídas.
+    - `rows` cuenta las filas escritas (executemany) y leídas (fetch) una
+      sola vez; las convertidas por rows_to_dict, que son las mismas filas
+      leídas, sólo suman en las filas de su fase.
+    """
+
+    def __init__(
+        self,
+        slow_query_threshold: Optional[float] = None,
+        sample_size: int = 1024,
+        measure_bytes: bool = False,
+        max_slow_queries: int = 100,
+    ):
+        self.slow_query_threshold = slow_query_threshold
+        self.sample_size = sample_size
+        self.measure_bytes = measure_bytes
+        self.before_execute: List[BeforeHook] = []
+        self.after_execute: List[AfterHook] = []
+        self.slow_queries: Deque[Dict[str, Any]] = deque(maxlen=max_slow_queries)
+        self._templates: Dict[str, _TemplateStats] = {}
+        self._lock = threading.Lock()
+
+    def add_hook(
+        self,
+        before: Optional[BeforeHook] = None,
+        after: Optional[AfterHook] = None,
+    ) -> None:
+        """`before(sql, params)` antes de ejecutar; `after(evento)` al terminar."""
+        if before is not None:
+            self.before_execute.append(before)
+        if after is not None:
+            self.after_execute.append(after)
+
+    def record(
+        self,
+        template: Optional[str],
+        phase: str,
+        seconds: float,
+        rows: int = 0,
+        nbytes: int = 0,
+        error: bool = False,
+    ) -> None:
+        key = template or "<desconocida>"
+        with self._lock:
+            stats = self._templates.get(key)
+            if stats is None:
+                stats = self._templates[key] = _TemplateStats(self.sample_size)
+            if phase == "execute":
+                stats.count += 1
+                if error:
+                    stats.errors += 1
+            if phase != "convert":
+                stats.rows += rows
+            stats.phase_rows[phase] += rows
+            stats.bytes += nbytes
+            stats.totals[phase] += seconds
+            stats.samples[phase].append(seconds)
+
+    def report_slow(self, template: str, seconds: float, params: Any) -> None:
+        event = {"sql": template, "seconds": seconds, "params": params, "at": time.time()}
+        with self._lock:
+            self.slow_queries.append(event)
+        slow_query_logger.warning("Consulta lenta (%.3fs): %s", seconds, template)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Copia serializable de las métricas para exportarlas."""
+        with self._lock:
+            templates = {}
+            for sql, stats in self._templates.items():
+                entry: Dict[str, Any] = {
+                    "count": stats.count,
+                    "errors": stats.errors,
+                    "rows": stats.rows,
+                    "bytes": stats.bytes,
+                }
+                for phase in PHASES:
+                    samples = sorted(stats.samples[phase])
+                    entry[phase] = {
+                        "total": stats.totals[phase],
+                        "rows": stats.phase_rows[phase],
+                        "p50": _percentile(samples, 0.50),
+                        "p95": _percentile(samples, 0.95),
+                        "p99": _percentile(samples, 0.99),
+                    }
+                templates[sql] = entry
+            return {
+                "templates": templates,
+                "slow_queries": list(self.slow_queries),
+            }
+
+    def wrap_cursor(self, raw_cursor: Any) -> "InstrumentedDBCursor":
+        return InstrumentedDBCursor(raw_cursor, self)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._templates.clear()
+            self.slow_queries.clear()
+
+
+def _rows_size(rows: Any) -> int:
+    if rows is None:
+        return 0
+    if isinstance(rows, list):
+        return sum(_rows_size(row) for row in rows)
+    values = rows.values() if hasattr(rows, "values") else rows
+    try:
+        return sum(sys.getsizeof(v) for v in values)
+    except TypeError:
+        return sys.getsizeof(rows)
+
+
+class InstrumentedDBCursor(DBCursor):
+    """DBCursor que mide cada execute/fetch y los reporta a `Instrumentation`."""
+
+    def __init__(self, raw_cursor: Any, instrumentation: Instrumentation):
+        super().__init__(raw_cursor)
+        self._instr = instrumentation
+        self._template: Optional[str] = None
+        self._params: Any = None
+        self._elapsed = 0.0
+        self._slow_reported = False
+
+    def _run(self, query: str, params: Any, call: Callable[[], Any], rows: int = 0) -> Any:
+        instr = self._instr
+        for hook in instr.before_execute:
+            hook(query, params)
+        self._template = query
+        self._params = params
+        self._elapsed = 0.0
+        self._slow_reported = False
+        start = time.perf_counter()
+        error: Optional[BaseException] = None
+        try:
+            return call()
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            instr.record(query, "execute", seconds, rows=rows, error=error is not None)
+            self._add_elapsed(seconds)
+            if instr.after_execute:
+                event = {
+                    "sql": query,
+                    "params": params,
+                    "seconds": seconds,
+                    "rowcount": getattr(self._cursor, "rowcount", None),
+                    "error": error,
+                }
+                for hook in instr.after_execute:
+                    hook(event)
+
+    def _add_elapsed(self, seconds: float) -> None:
+        self._elapsed += seconds
+        threshold = self._instr.slow_query_threshold
+        if (
+            threshold is not None
+            and not self._slow_reported
+            and self._elapsed >= threshold
+        ):
+            self._slow_reported = True
+            self._instr.report_slow(self._template or "", self._elapsed, self._params)
+
+    def _fetch(self, call: Callable[[], Any], many: bool) -> Any:
+        start = time.perf_counter()
+        result = call()
+        seconds = time.perf_counter() - start
+        if many:
+            rows = len(result) if result is not None else 0
+        else:
+            rows = 0 if result is None else 1
+        nbytes = _rows_size(result) if self._instr.measure_bytes else 0
+        self._instr.record(self._template, "fetch", seconds, rows=rows, nbytes=nbytes)
+        self._add_elapsed(seconds)
+        return result
+
+    def execute(self, query: str, *args: Any, **kwargs: Any) -> Any:
+        params = args[0] if len(args) == 1 else (args or kwargs or None)
+        return self._run(query, params, lambda: self._cursor.execute(query, *args, **kwargs))
+
+    def executemany(self, query: str, param_list: List[Any]) -> Any:
+        return self._run(
+            query,
+            param_list,
+            lambda: self._cursor.executemany(query, param_list),
+            rows=len(param_list),
+        )
+
+    def fetchone(self) -> Any:
+        return self._fetch(self._cursor.fetchone, many=False)
+
+    def fetchall(self) -> Any:
+        return self._fetch(self._cursor.fetchall, many=True)
+
+    def fetchmany(self, size: Optional[int] = None) -> Any:
+        return self._fetch(lambda: DBCursor.fetchmany(self, size), many=True)
@@ -0,0 +1,54 @@
+import re
+from typing import Any
+
+from conn.connection_protocolo import DBConnectionProtocol
+
+
+def check_alive(connector: DBConnectionProtocol) -> bool:
+    """
+    Comprueba si la conexión de `connector` sigue viva con la operación más
+    barata disponible: ping() sin reconectar en pymysql o un SELECT 1 en el
+    resto (pyodbc, sqlite3). Antes mira los indicadores locales (closed,
+    open) que no requieren ir al servidor.
+    """
+    conn: Any = connector.connection
+    if conn is None or getattr(conn, "closed", False):
+        return False
+    if getattr(conn, "open", True) is False:  # pymysql
+        return False
+    try:
+        ping = getattr(conn, "ping", None)
+        if callable(ping):
+            ping(reconnect=False)
+        else:
+            cursor = connector.get_cursor()
+            try:
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
+            finally:
+                cursor.close()
+        return True
+    except Exception:
+        return False
+
+
+# Errores que significan "la conexión se perdió": MySQL 2006 (server has
+# gone away), 2013 (lost connection), 2055; pymysql InterfaceError(0, '')
+# al usar una conexión cerrada; SQLSTATE 08xxx en ODBC.
+_DISCONNECT_CODES = {0, 2006, 2013, 2055}
+_DISCONNECT_MESSAGE = re.compile(
+    r"gone away|lost connection|connection (was )?(reset|closed|refused|failure)|"
+    r"closed (database|connection)|communication link failure|broken pipe",
+    re.IGNORECASE,
+)
+
+
+def is_disconnect(error: BaseException) -> bool:
+    """True si el error indica que la conexión se cortó (no un error de SQL)."""
+    args = getattr(error, "args", ())
+    code = args[0] if args else None
+    if isinstance(code, int) and code in _DISCONNECT_CODES:
+        return True
+    if isinstance(code, str) and code.startswith("08"):
+        return True
+    return bool(_DISCONNECT_MESSAGE.search(str(error)))
@@ -1,17 +1,43 @@
-import pymysql
-from sqlalchemy import create_engine
-from sqlalchemy.engine import Engine
+from typing import TYPE_CHECKING, Any, List, Optional
+
+from conn.engine_registry import EngineRegistry
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
+
+# pymysql se importa dentro de cada método (sólo al conectar/usar la conexión)
+# para que importar este módulo no cargue el driver.
 
 
 class MySQLConnector:
-    def __init__(self, host, database, user, password):
+    def __init__(
+        self, host, database, user, password, multi_statements=False, read_timeout=None
+    ):
         self.host = host
         self.database = database
         self.user = user
         self.password = password
+        # Opt-in: con CLIENT.MULTI_STATEMENTS una sola llamada puede ejecutar
+        # varias sentencias separadas por ';' (lo usa execute_batch).
+        self.multi_statements = multi_statements
+        # Límite duro (segundos) de espera de una respuesta en el socket. Si
+        # vence, pymysql cierra la conexión: es el último recurso; el plazo
+        # normal lo aplica DatabaseConnector con cancel_query (KILL QUERY).
+        self.read_timeout = read_timeout
         self.connection = None
+        self._engines = EngineRegistry()
+        self._max_allowed_packet = None
 
     def connect(self) -> None:
+        import pymysql
+
+        options = {}
+        if self.multi_statements:
+            from pymysql.constants import CLIENT
+
+            options["client_flag"] = CLIENT.MULTI_STATEMENTS
+        if self.read_timeout is not None:
+            options["read_timeout"] = self.read_timeout
         try:
             self.connection = pymysql.connect(
                 host=self.host,
@@ -19,7 +45,9 @@ class MySQLConnector:
                 user=self.user,
                 password=self.password,
                 cursorclass=pymysql.cursors.DictCursor,  # <-- Esta línea cambia el tipo de cursor
+                **options,
             )
+            self._max_allowed_packet = None
             print("Conectado a MySQL")
         except pymysql.MySQLError as e:
             print(f"Error de conexión a MySQL: {e}")
@@ -31,6 +59,8 @@ class MySQLConnector:
             raise
 
     def get_cursor(self):
+        import pymysql
+
         if self.connection is None:
             raise Exception("No hay conexión activa.")
         try:
@@ -42,7 +72,113 @@ class MySQLConnector:
             print(f"Error inesperado al obtener el cursor: {e}")
             raise
 
+    def get_stream_cursor(self, batch_size: int, as_dict: bool):
+        """
+        Cursor sin buffer (del lado del servidor): las filas se leen del socket
+        a medida que se piden con fetchmany en lugar de cargarse todas.
+        """
+        import pymysql.cursors
+
+        if self.connection is None:
+            raise Exception("No hay conexión activa.")
+        cursorclass = (
+            pymysql.cursors.SSDictCursor if as_dict else pymysql.cursors.SSCursor
+        )
+        return self.connection.cursor(cursorclass)
+
+    def cancel_query(self, cursor) -> None:
+        """
+        Cancela la sentencia en curso con KILL QUERY desde una conexión
+        auxiliar (la propia está bloqueada esperando el resultado). La
+        conexión original recibe el error 1317 y sigue siendo utilizable.
+        """
+        import pymysql
+
+        connection = self.connection
+        if connection is None:
+            return
+        thread_id = connection.thread_id()
+        side = pymysql.connect(
+            host=self.host,
+            database=self.database,
+            user=self.user,
+            password=self.password,
+            connect_timeout=5,
+        )
+        try:
+            with side.cursor() as side_cursor:
+                side_cursor.execute("KILL QUERY %s", (thread_id,))
+        finally:
+            side.close()
+
+    def max_allowed_packet(self) -> int:
+        """Valor de max_allowed_packet del servidor (consultado una vez por conexión)."""
+        if self._max_allowed_packet is None:
+            cursor = self.get_cursor()
+            try:
+                cursor.execute("SELECT @@max_allowed_packet")
+                row = cursor.fetchone()
+            finally:
+                cursor.close()
+            value = list(row.values())[0] if isinstance(row, dict) else row[0]
+            self._max_allowed_packet = int(value)
+        return self._max_allowed_packet
+
+    def bulk_insert_chunk(self, cursor, table, columns, sql, rows) -> None:
+        """
+        Inserta `rows` con sentencias INSERT ... VALUES (...),(...) de varias
+        filas, partidas para no superar max_allowed_packet del servidor.
+        """
+        prefix = "INSERT INTO {} ({}) VALUES ".format(table, ", ".join(columns))
+        row_template = "(" + ", ".join(["%s"] * len(columns)) + ")"
+        # Margen para cabeceras del protocolo.
+        limit = self.max_allowed_packet() - 1024
+        prefix_size = len(prefix.encode("utf8"))
+
+        values: List[str] = []
+        size = prefix_size
+        for row in rows:
+            literal = cursor.mogrify(row_template, tuple(row))
+            literal_size = len(literal.encode("utf8")) + 1  # + separador ','
+            if values and size + literal_size > limit:
+                cursor.execute(prefix + ",".join(values))
+                values = []
+                size = prefix_size
+            values.append(literal)
+            size += literal_size
+        if values:
+            cursor.execute(prefix + ",".join(values))
+
+    def execute_batch(self, cursor, statements) -> Optional[List[Any]]:
+        """
+        Con multi_statements=True une las sentencias (interpoladas con mogrify,
+        igual que hace pymysql en execute) en un solo envío separado por ';' y
+        recorre los resultados con nextset(). Los envíos se parten para no
+        superar max_allowed_packet. Sin multi_statements devuelve None y
+        DatabaseConnector las ejecuta una a una.
+        """
+        if not self.multi_statements:
+            return None
+        limit = self.max_allowed_packet() - 1024
+        results: List[Any] = []
+        pending: List[str] = []
+        size = 0
+        for sql, params in statements:
+            literal = cursor.mogrify(sql, params if params else None)
+            literal_size = len(literal.encode("utf8")) + 2  # + separador ';\n'
+            if pending and size + literal_size > limit:
+                results.extend(_run_multi(cursor, pending))
+                pending = []
+                size = 0
+            pending.append(literal)
+            size += literal_size
+        results.extend(_run_multi(cursor, pending))
+        return results
+
     def close_connection(self) -> None:
+        import pymysql
+
+        self._engines.dispose_all()
         if self.connection:
             try:
                 self.connection.close()
@@ -52,12 +188,17 @@ class MySQLConnector:
             except Exception as e:
                 print(f"Error inesperado al cerrar la conexión: {e}")
 
-    def conn_engine(self) -> Engine:
+    def conn_engine(self, **engine_options: Any) -> "Engine":
+        """
+        Devuelve un Engine de SQLAlchemy reutilizable (uno por URL y opciones).
+        Acepta opciones de pool como pool_size, max_overflow, pool_pre_ping y
+        pool_recycle; los Engines se liberan en close_connection().
+        """
         connection_url = (
             f"mysql+mysqlconnector://{self.user}:{self.password}@{self.host}/"
             f"{self.database}?auth_plugin=mysql_native_password"
         )
-        return create_engine(connection_url)
+        return self._engines.get(connection_url, **engine_options)
 
     @property
     def paramstyle(self) -> str:
@@ -67,6 +208,23 @@ class MySQLConnector:
         # pymysql usa 'format' (%s)
         return "format"
 
+    @property
+    def dialect(self) -> str:
+        """Dialecto SQL (ver conn.dialects)."""
+        return "mysql"
+
+
+def _run_multi(cursor, sqls: List[str]) -> List[Any]:
+    cursor.execute(";\n".join(sql.rstrip().rstrip(";") for sql in sqls))
+    results: List[Any] = []
+    while True:
+        if cursor.description is not None:
+            results.append(list(cursor.fetchall()))
+        else:
+            results.append(cursor.rowcount)
+        if not cursor.nextset():
+            return results
+
 
 # Ejemplo de uso
 if __name__ == "__main__":
@@ -0,0 +1,99 @@
+import base64
+import binascii
+import hashlib
+import json
+from typing import Any, Dict, List, Optional, Sequence
+
+from conn import value_codec
+from conn.dialects import dialect_of, keyset_predicate, limit_query
+
+
+def _fingerprint(sql_template: str, key_columns: Sequence[str]) -> str:
+    text = sql_template + "\0" + ",".join(key_columns)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:12]
+
+
+def _make_token(direction: str, keys: Sequence[Any], fingerprint: str) -> str:
+    payload = {"d": direction, "k": value_codec.encode_values(keys), "q": fingerprint}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _read_token(token: str, fingerprint: str, n_keys: int):
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw)
+        direction, keys = payload["d"], value_codec.decode_values(payload["k"])
+        valid = payload.get("q") == fingerprint and direction in ("next", "prev")
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        valid = False
+    if not valid or len(keys) != n_keys:
+        raise ValueError("Cursor de paginación inválido o de otra consulta.")
+    return direction, keys
+
+
+def paginate(
+    db: Any,
+    sql_template: str,
+    params: Optional[Sequence[Any]],
+    key_columns: Sequence[str],
+    page_size: int,
+    cursor: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Paginación keyset (seek): en vez de OFFSET, cada página filtra por la
+    clave de la última fila vista, así la página N cuesta lo mismo que la 1.
+
+    `sql_template` es un SELECT con '{}' y sin ORDER BY ni LIMIT: se envuelve
+    en una tabla derivada, se filtra con (k1, k2...) > / < (valores) y se
+    ordena por `key_columns` (ascendente), que deben ser columnas de la
+    salida y juntas únicas. LIMIT o TOP según el dialecto del conector.
+
+    `cursor` es el token opaco devuelto en "next"/"prev" de la página
+    anterior (None para la primera). Devuelve {"rows", "next", "prev"}; los
+    tokens son None cuando no hay más páginas en esa dirección.
+    """
+    if page_size <= 0:
+        raise ValueError("page_size debe ser mayor que 0")
+    if not key_columns:
+        raise ValueError("key_columns no puede estar vacío")
+    key_columns = list(key_columns)
+    fingerprint = _fingerprint(sql_template, key_columns)
+    direction, keys = "next", None
+    if cursor is not None:
+        direction, keys = _read_token(cursor, fingerprint, len(key_columns))
+
+    backwards = direction == "prev"
+    sql = f"SELECT * FROM ({sql_template}) AS _page"
+    all_params: List[Any] = list(params or [])
+    if keys is not None:
+        predicate, key_params = keyset_predicate(key_columns, keys, "<" if backwards else ">")
+        sql += f" WHERE {predicate}"
+        all_params += key_params
+    order = " DESC" if backwards else ""
+    sql += " ORDER BY " + ", ".join(f"{c}{order}" for c in key_columns)
+    # Una fila de más indica si hay otra página en esa dirección.
+    sql = limit_query(dialect_of(db), sql, page_size + 1)
+
+    with db.execute(sql, all_params) as cur:
+        rows = list(cur.fetchall())
+        names = [desc[0] for desc in cur.description or ()]
+    more = len(rows) > page_size
+    rows = rows[:page_size]
+    if backwards:
+        rows.reverse()
+
+    def key_of(row: Any) -> List[Any]:
+        if hasattr(row, "keys"):  # DictCursor de pymysql
+            return [row[c] for c in key_columns]
+        return [row[names.index(c)] for c in key_columns]
+
+    next_token = prev_token = None
+    if rows:
+        has_next = (more and not backwards) or backwards
+        has_prev = (more and backwards) or (keys is not None and not backwards)
+        if has_next:
+            next_token = _make_token("next", key_of(rows[-1]), fingerprint)
+        if has_prev:
+            prev_token = _make_token("prev", key_of(rows[0]), fingerprint)
+    return {"rows": rows, "next": next_token, "prev": prev_token}
@@ -0,0 +1,258 @@
+import multiprocessing
+import os
+import queue
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from conn.connection_protocolo import DBConnectionProtocol
+from conn.database_connector import DatabaseConnector
+
+# La fábrica viaja a los procesos hijos: debe ser picklable (una función de
+# módulo o functools.partial(SQLServerConnector, host, db, user, pwd)) y
+# devolver un conector SIN conectar, como en ConnectionPool.
+ConnectorFactory = Callable[[], DBConnectionProtocol]
+
+STRATEGIES = ("modulo", "range")
+_EXTENSIONS = {"csv": "csv", "parquet": "parquet", "arrow": "arrow"}
+
+
+def _partition_predicates(
+    strategy: str,
+    key: str,
+    n_partitions: int,
+    bounds: Optional[Tuple[Any, Any]],
+    mod_operator: str,
+) -> List[Tuple[str, List[Any]]]:
+    """(predicado con '{}', params) por partición. Los NULL van a la partición 0."""
+    predicates: List[Tuple[str, List[Any]]] = []
+    if strategy == "modulo":
+        for i in range(n_partitions):
+            predicates.append((f"ABS({key}) {mod_operator} {{}} = {{}}", [n_partitions, i]))
+    else:
+        lo, hi = bounds  # type: ignore[misc]
+        if isinstance(lo, int) and isinstance(hi, int):
+            cuts = [lo + (hi - lo) * i // n_partitions for i in range(1, n_partitions)]
+        else:
+            cuts = [lo + (hi - lo) * i / n_partitions for i in range(1, n_partitions)]
+        # Los extremos quedan abiertos para no perder filas fuera de [lo, hi].
+        edges: List[Optional[Any]] = [None] + cuts + [None]
+        for i in range(n_partitions):
+            parts, params = [], []
+            if edges[i] is not None:
+                parts.append(f"{key} >= {{}}")
+                params.append(edges[i])
+            if edges[i + 1] is not None:
+                parts.append(f"{key} < {{}}")
+                params.append(edges[i + 1])
+            predicates.append((" AND ".join(parts) or f"{key} IS NOT NULL", params))
+    sql, params = predicates[0]
+    predicates[0] = (f"(({sql}) OR {key} IS NULL)", params)
+    return predicates
+
+
+def _key_bounds(
+    db: DatabaseConnector, sql_template: str, params: Sequence[Any], key: str
+) -> Tuple[Any, Any]:
+    sql = f"SELECT MIN({key}), MAX({key}) FROM ({sql_template}) AS _src"
+    with db.execute(sql, list(params)) as cursor:
+        row = cursor.fetchone()
+    if hasattr(row, "values"):  # DictCursor de pymysql
+        row = list(row.values())
+    return row[0], row[1]
+
+
+def _extract_partition(
+    factory: ConnectorFactory,
+    index: int,
+    sql: str,
+    params: List[Any],
+    batch_size: int,
+    as_dict: bool,
+    out_queue: Any,
+    stop: Any,
+    export: Optional[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Trabajo de un proceso hijo: una conexión propia y una partición."""
+    start = time.perf_counter()
+    connector = factory()
+    connector.connect()
+    db = DatabaseConnector(connector)
+    try:
+        if export is not None:
+            stats = db.export(sql, params, **export)
+            stats["partition"] = index
+            stats["path"] = export["path"]
+            return stats
+
+        rows_sent = 0
+        try:
+            names: Optional[List[str]] = None
+            for rows in db.stream_batches(sql, params, batch_size, as_dict):
+                if stop.is_set():
+                    break
+                # pyodbc.Row no es picklable: se envían tuplas o dicts.
+                if as_dict:
+                    rows = [dict(row) for row in rows]
+                else:
+                    if rows and hasattr(rows[0], "keys"):
+                        if names is None:
+                            names = list(rows[0].keys())
+                        rows = [tuple(row[n] for n in names) for row in rows]
+                    else:
+                        rows = [tuple(row) for row in rows]
+                out_queue.put((index, rows))
+                rows_sent += len(rows)
+        finally:
+            out_queue.put((index, None))
+        elapsed = time.perf_counter() - start
+        return {"partition": index, "rows": rows_sent, "seconds": elapsed}
+    finally:
+        db.close_connection()
+
+
+def _stream(
+    executor: ProcessPoolExecutor,
+    manager: Any,
+    out_queue: Any,
+    stop: Any,
+    futures: Dict[int, "Future[Dict[str, Any]]"],
+) -> Iterator[Any]:
+    pending = set(futures)
+    try:
+        while pending:
+            try:
+                index, rows = out_queue.get(timeout=0.1)
+            except queue.Empty:
+                for i in list(pending):
+                    future = futures[i]
+                    # Un hijo que murió antes de enviar el fin de partición.
+                    if future.done() and future.exception() is not None:
+                        raise future.exception()  # type: ignore[misc]
+                continue
+            if rows is None:
+                pending.discard(index)
+                error = futures[index].exception()
+                if error is not None:
+                    raise error
+                continue
+            yield from rows
+    finally:
+        stop.set()
+        # Vaciar la cola desbloquea a los hijos que esperan espacio en ella.
+        while not all(f.done() for f in futures.values()):
+            try:
+                out_queue.get(timeout=0.05)
+            except queue.Empty:
+                pass
+        executor.shutdown(wait=True)
+        manager.shutdown()
+
+
+def parallel_extract(
+    connector_factory: ConnectorFactory,
+    sql_template: str,
+    partition_key: str,
+    n_partitions: int,
+    params: Optional[Sequence[Any]] = None,
+    strategy: str = "modulo",
+    key_range: Optional[Tuple[Any, Any]] = None,
+    output_dir: Optional[str] = None,
+    format: str = "csv",
+    compression: Optional[str] = None,
+    batch_size: int = 10000,
+    as_dict: bool = False,
+    max_workers: Optional[int] = None,
+    queue_size: Optional[int] = None,
+) -> Any:
+    """
+    Parte `sql_template` (SELECT con '{}', sin ORDER BY) en `n_partitions`
+    por `partition_key` y extrae cada partición en un proceso con su propia
+    conexión, para que decodificar y convertir filas escale con los núcleos.
+
+    - strategy="modulo": ABS(clave) % n = i (claves enteras, reparto uniforme).
+    - strategy="range": rangos contiguos entre `key_range` (o MIN/MAX de la
+      consulta, calculados antes con una conexión del proceso padre); mejor
+      cuando la clave está indexada, porque cada partición es un rango.
+      Las filas con la clave NULL van a la partición 0.
+
+    Sin `output_dir` devuelve un iterador de filas (tuplas, o dicts con
+    as_dict=True) intercaladas entre particiones a medida que llegan, a
+    través de una cola acotada a `queue_size` lotes. Si se deja de consumir
+    antes de tiempo, los procesos se detienen al cerrar el iterador.
+
+    Con `output_dir` cada partición se escribe con DatabaseConnector.export
+    en `part-00000.<format>`, ... y se devuelve
+    {"partitions": [stats por partición], "rows", "seconds", "rows_per_sec"}.
+
+    `connector_factory` debe ser picklable y devolver un conector sin conectar.
+    """
+    if n_partitions < 1:
+        raise ValueError("n_partitions debe ser mayor que 0")
+    if strategy not in STRATEGIES:
+        raise ValueError(f"strategy no soportada: {strategy} (use {', '.join(STRATEGIES)})")
+    if output_dir is not None and format not in _EXTENSIONS:
+        raise ValueError(f"Formato no soportado: {format}")
+    params = list(params or [])
+
+    # Conector del padre: paramstyle (para escapar '%') y, si hace falta, MIN/MAX.
+    template = connector_factory()
+    paramstyle = getattr(template, "paramstyle", None)
+    mod_operator = "%%" if paramstyle in ("format", "pyformat") else "%"
+    bounds = key_range
+    if strategy == "range" and bounds is None:
+        template.connect()
+        db = DatabaseConnector(template)
+        try:
+            bounds = _key_bounds(db, sql_template, params, partition_key)
+        finally:
+            db.close_connection()
+        if bounds[0] is None:
+            n_partitions, strategy = 1, "modulo"  # consulta vacía
+
+    predicates = _partition_predicates(strategy, partition_key, n_partitions, bounds, mod_operator)
+    jobs = [
+        (f"SELECT * FROM ({sql_template}) AS _part WHERE {predicate}", params + extra)
+        for predicate, extra in predicates
+    ]
+    workers = max_workers or n_partitions
+
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    _extract_partition, connector_factory, i, sql, job_params,
+                    batch_size, as_dict, None, None,
+                    {
+                        "path": os.path.join(output_dir, f"part-{i:05d}.{_EXTENSIONS[format]}"),
+                        "format": format,
+                        "batch_size": batch_size,
+                        "compression": compression,
+                    },
+                )
+                for i, (sql, job_params) in enumerate(jobs)
+            ]
+            partitions = [f.result() for f in futures]
+        elapsed = time.perf_counter() - start
+        rows = sum(p["rows"] for p in partitions)
+        return {
+            "partitions": partitions,
+            "rows": rows,
+            "seconds": elapsed,
+            "rows_per_sec": rows / elapsed if elapsed > 0 else 0.0,
+        }
+
+    manager = multiprocessing.Manager()
+    out_queue = manager.Queue(maxsize=queue_size or 2 * workers)
+    stop = manager.Event()
+    executor = ProcessPoolExecutor(max_workers=workers)
+    futures = {
+        i: executor.submit(
+            _extract_partition, connector_factory, i, sql, job_params,
+            batch_size, as_dict, out_queue, stop, None,
+        )
+        for i, (sql, job_params) in enumerate(jobs)
+    }
+    return _stream(executor, manager, out_queue, stop, futures)
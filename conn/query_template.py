@@ -0,0 +1,115 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, List, Sequence, Tuple, Union
+
+
+BoundParams = Union[Tuple[Any, ...], Dict[str, Any]]
+
+
+class CompiledQuery:
+    """Plantilla SQL con marcadores '{}' ya traducida a un paramstyle concreto.
+
+    El SQL final se construye una sola vez; `bind()` sólo adapta los
+    parámetros (tuple o dict) sin volver a tocar el texto de la consulta.
+    """
+
+    __slots__ = ("template", "paramstyle", "sql", "param_count", "_names")
+
+    def __init__(self, template: str, paramstyle: str):
+        self.template = template
+        self.paramstyle = paramstyle
+
+        parts = template.split("{}")
+        self.param_count = len(parts) - 1
+
+        placeholders: List[str] = []
+        names: List[str] = []
+        for i in range(1, self.param_count + 1):
+            if paramstyle == "qmark":
+                placeholders.append("?")
+            elif paramstyle == "format":
+                placeholders.append("%s")
+            elif paramstyle == "numeric":
+                placeholders.append(f":{i}")
+            elif paramstyle == "named":
+                name = f"p{i}"
+                names.append(name)
+                placeholders.append(f":{name}")
+            elif paramstyle == "pyformat":
+                name = f"p{i}"
+                names.append(name)
+                placeholders.append(f"%({name})s")
+            else:
+                placeholders.append("%s")
+
+        self.sql = "".join(p + ph for p, ph in zip(parts, placeholders + [""]))
+        # Sólo los estilos con nombre necesitan construir un dict al enlazar.
+        self._names = tuple(names) if paramstyle in ("named", "pyformat") else None
+
+    def bind(self, params: Sequence[Any]) -> BoundParams:
+        """Adapta una secuencia de parámetros al formato esperado por el driver."""
+        if params is None:
+            params = ()
+        if len(params) != self.param_count:
+            raise ValueError(
+                "Número de placeholders '{}' no coincide con la cantidad de params"
+            )
+        if self._names is not None:
+            return dict(zip(self._names, params))
+        return tuple(params)
+
+
+class QueryTemplateCache:
+    """Caché LRU acotada de `CompiledQuery` indexada por (plantilla, paramstyle).
+
+    Es segura entre hilos y expone contadores de aciertos/fallos.
+    """
+
+    def __init__(self, maxsize: int = 512):
+        if maxsize <= 0:
+            raise ValueError("maxsize debe ser mayor que 0")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, str], CompiledQuery]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, template: str, paramstyle: str) -> CompiledQuery:
+        key = (template, paramstyle)
+        with self._lock:
+            compiled = self._entries.get(key)
+            if compiled is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return compiled
+            self.misses += 1
+
+        # Compilamos fuera del lock; si otro hilo se adelantó, gana el primero.
+        compiled = CompiledQuery(template, paramstyle)
+        with self._lock:
+            existing = self._entries.get(key)
+            if existing is not None:
+                return existing
+            self._entries[key] = compiled
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return compiled
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def cache_info(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+
+# Caché compartida por defecto entre todas las instancias de DatabaseConnector.
+default_template_cache = QueryTemplateCache()
@@ -0,0 +1,435 @@
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from conn.connection_protocolo import DBConnectionProtocol
+from conn.liveness import check_alive, is_disconnect
+from conn.sql_inspect import is_read_query
+
+# Ganchos opcionales del conector envuelto que se exponen tal cual.
+_HOOKS = ("bulk_insert_chunk", "execute_batch", "cancel_query", "max_allowed_packet")
+
+
+class TransactionLostError(ConnectionError):
+    """La conexión se perdió con una transacción abierta: sus cambios no se confirmaron."""
+
+
+def _set_autocommit(conn: Any, value: bool) -> None:
+    # Igual que DatabaseConnector.autocommit: método (pymysql) o atributo (pyodbc).
+    if hasattr(conn, "autocommit") and callable(getattr(conn, "autocommit")):
+        conn.autocommit(value)
+    else:
+        setattr(conn, "autocommit", value)
+
+
+class ResilientConnector:
+    """Conector con conexión perezosa, precalentamiento y reconexión en segundo plano.
+
+    Implementa DBConnectionProtocol envolviendo un conector (sin conectar):
+
+        connector = ResilientConnector(SQLServerConnector(...), prewarm=True)
+        connector.connect()          # vuelve enseguida; conecta en otro hilo
+        db = DatabaseConnector(connector)
+
+    - Con `lazy=True` (por defecto) `connect()` no abre nada: la conexión se
+      abre en el primer `get_cursor()`. Con `prewarm=True`, `connect()`
+      lanza la conexión en un hilo y el primer `get_cursor()` sólo espera lo
+      que falte del handshake.
+    - Antes de entregar un cursor se comprueba que la conexión siga viva
+      (`liveness.check_alive`: ping() en pymysql, SELECT 1 en el resto),
+      pero sólo si lleva `check_interval` segundos sin usarse y sin
+      comprobarse; una conexión usada hace poco no paga ningún round-trip.
+    - Si la comprobación falla, o una sentencia falla y la conexión ya no
+      responde, la conexión se marca caída y un único hilo en segundo plano
+      reconecta con backoff exponencial y jitter completo (de `backoff` a
+      `max_backoff` segundos). Mientras tanto `get_cursor()` espera hasta
+      `wait_timeout` segundos y lanza ConnectionError si no lo consigue, en
+      lugar de que cada hilo intente su propio handshake. Sólo los errores
+      de desconexión (`liveness.is_disconnect`) disparan la reconexión; un
+      error de SQL no cuesta ningún round-trip extra.
+    - Si la conexión se pierde con una transacción abierta (una escritura
+      sin commit), la reconexión no la oculta: la sentencia, el commit y
+      cualquier uso posterior lanzan TransactionLostError hasta que se
+      llame a rollback().
+    - Cada cursor recuerda la generación de la conexión en que se creó; un
+      cursor reutilizado (reuse_cursor=True) se reemplaza al reconectar.
+    """
+
+    def __init__(
+        self,
+        connector: DBConnectionProtocol,
+        lazy: bool = True,
+        prewarm: bool = False,
+        check_interval: Optional[float] = 30.0,
+        wait_timeout: float = 30.0,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+    ):
+        self._connector = connector
+        self.lazy = lazy
+        self.prewarm = prewarm
+        self.check_interval = check_interval
+        self.wait_timeout = wait_timeout
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._state = "new"  # new | connecting | up | closed
+        self._thread: Optional[threading.Thread] = None
+        self._last_used = 0.0
+        self._last_check = 0.0
+        self._random = random.Random()
+        self._generation = 0
+        self._autocommit: Optional[bool] = None  # None: el del driver
+        self._in_transaction = False
+        self._transaction_lost = False
+        self._proxy = _ResilientConnection(self)
+
+        self.connects = 0
+        self.reconnects = 0
+        self.connect_failures = 0
+        self.checks = 0
+        self.failed_checks = 0
+        self.last_error: Optional[BaseException] = None
+
+    # --- DBConnectionProtocol ---
+
+    @property
+    def connection(self) -> Optional[Any]:
+        """Proxy de la conexión (None si no está conectada).
+
+        commit/rollback pasan por aquí para saber cuándo hay una transacción abierta.
+        """
+        return self._proxy if self._connector.connection is not None else None
+
+    @property
+    def paramstyle(self) -> Optional[str]:
+        return getattr(self._connector, "paramstyle", None)
+
+    @property
+    def dialect(self) -> Optional[str]:
+        return getattr(self._connector, "dialect", None)
+
+    def connect(self) -> None:
+        """Conecta ya (lazy=False), en segundo plano (prewarm) o en el primer uso."""
+        with self._lock:
+            self._stop.clear()
+            if self._state == "closed":
+                self._state = "new"
+            if self._state != "new":
+                return
+            if self.prewarm:
+                self._start_connecting()
+                return
+        if not self.lazy:
+            self._ensure_connected()
+
+    def get_cursor(self) -> Any:
+        self._before_use()
+        return _TrackedCursor(self._connector.get_cursor, self)
+
+    def get_stream_cursor(self, batch_size: int, as_dict: bool) -> Any:
+        stream_cursor = getattr(self._connector, "get_stream_cursor", None)
+
+        def open_cursor() -> Any:
+            if callable(stream_cursor):
+                return stream_cursor(batch_size, as_dict)
+            raw = self._connector.get_cursor()
+            try:
+                raw.arraysize = batch_size
+            except Exception:
+                pass
+            return raw
+
+        self._before_use()
+        return _TrackedCursor(open_cursor, self)
+
+    def close_connection(self) -> None:
+        with self._lock:
+            self._state = "closed"
+            self._ready.clear()
+            self._stop.set()
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(self.max_backoff)
+        self._connector.close_connection()
+
+    def conn_engine(self, **engine_options: Any):
+        return self._connector.conn_engine(**engine_options)
+
+    def __getattr__(self, name: str) -> Any:
+        if name in _HOOKS:
+            return getattr(self._connector, name)
+        raise AttributeError(name)
+
+    # --- Estado ---
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Espera a que termine el precalentamiento o la reconexión en curso."""
+        return self._ready.wait(self.wait_timeout if timeout is None else timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self._state,
+                "connects": self.connects,
+                "reconnects": self.reconnects,
+                "connect_failures": self.connect_failures,
+                "checks": self.checks,
+                "failed_checks": self.failed_checks,
+                "last_error": repr(self.last_error) if self.last_error else None,
+            }
+
+    # --- Internos ---
+
+    def _before_use(self) -> None:
+        self._check_transaction()
+        self._ensure_connected()
+        self._maybe_check()
+
+    def _check_transaction(self) -> None:
+        if self._transaction_lost:
+            raise TransactionLostError(
+                "Se perdió la conexión en mitad de una transacción: los cambios "
+                "no confirmados se perdieron. Llame a rollback() antes de continuar."
+            )
+
+    def _connection_lost(self) -> bool:
+        """Marca la conexión caída; True si había una transacción abierta."""
+        with self._lock:
+            lost = self._in_transaction
+            if lost:
+                self._transaction_lost = True
+                self._in_transaction = False
+        self.mark_down()
+        return lost
+
+    def _after_statement(self, query: Optional[str]) -> None:
+        self._last_used = time.monotonic()
+        if not self._autocommit and (query is None or not is_read_query(query)):
+            self._in_transaction = True
+
+    def _ensure_connected(self) -> None:
+        if self._state == "up":
+            return
+        with self._lock:
+            if self._state == "closed":
+                raise RuntimeError("El conector está cerrado.")
+            if self._state == "new":
+                # Conexión perezosa: el primer uso paga el handshake una vez.
+                self._state = "connecting"
+                connect_here = True
+            else:
+                connect_here = False
+        if connect_here:
+            try:
+                self._connect_session()
+            except BaseException as e:
+                with self._lock:
+                    self.connect_failures += 1
+                    self.last_error = e
+                    if self._state == "connecting":
+                        self._state = "new"
+                raise
+            self._mark_up(reconnect=False)
+            return
+        if not self._ready.wait(self.wait_timeout):
+            raise ConnectionError(
+                f"La conexión no está disponible tras {self.wait_timeout}s "
+                f"(último error: {self.last_error!r})."
+            )
+
+    def _maybe_check(self) -> None:
+        if self.check_interval is None:
+            return
+        now = time.monotonic()
+        if (
+            now - self._last_used < self.check_interval
+            or now - self._last_check < self.check_interval
+        ):
+            return
+        self._last_check = now
+        self.checks += 1
+        if check_alive(self._connector):
+            return
+        self.failed_checks += 1
+        self._connection_lost()
+        self._check_transaction()
+        self._ensure_connected()
+
+    def _on_error(self, error: BaseException) -> bool:
+        """Tras un error de sentencia: True si cortó una transacción abierta."""
+        if not is_disconnect(error):
+            return False
+        return self._connection_lost()
+
+    def mark_down(self) -> None:
+        """Marca la conexión como caída y lanza la reconexión en segundo plano."""
+        with self._lock:
+            if self._state != "up":
+                return
+            self._start_connecting()
+
+    def _start_connecting(self) -> None:
+        # Llamar con self._lock tomado.
+        self._state = "connecting"
+        self._ready.clear()
+        self._thread = threading.Thread(
+            target=self._connect_loop, name="db-reconnect", daemon=True
+        )
+        self._thread.start()
+
+    def _connect_loop(self) -> None:
+        reconnect = self.connects > 0
+        attempt = 0
+        while not self._stop.is_set():
+            if reconnect:
+                try:
+                    self._connector.close_connection()
+                except Exception:
+                    pass
+            try:
+                self._connect_session()
+            except Exception as e:
+                with self._lock:
+                    self.connect_failures += 1
+                    self.last_error = e
+                # Jitter completo: evita que muchos clientes reintenten a la vez.
+                delay = min(self.max_backoff, self.backoff * 2 ** attempt)
+                attempt += 1
+                if self._stop.wait(self._random.uniform(0, delay)):
+                    return
+                continue
+            if self._stop.is_set():
+                return
+            self._mark_up(reconnect)
+            return
+
+    def _connect_session(self) -> None:
+        """Abre la conexión y restaura el estado de sesión elegido (autocommit)."""
+        self._connector.connect()
+        if self._autocommit is not None:
+            # Una conexión nueva arranca con el autocommit por defecto del driver.
+            _set_autocommit(self._connector.connection, self._autocommit)
+
+    def _mark_up(self, reconnect: bool) -> None:
+        with self._lock:
+            if self._state == "closed":
+                return
+            self._state = "up"
+            self._generation += 1
+            self._in_transaction = False
+            self.connects += 1
+            if reconnect:
+                self.reconnects += 1
+            now = time.monotonic()
+            self._last_used = self._last_check = now
+            self._ready.set()
+
+
+class _ResilientConnection:
+    """Proxy de la conexión que sigue el estado de la transacción."""
+
+    def __init__(self, owner: ResilientConnector):
+        self._owner = owner
+
+    def commit(self) -> None:
+        owner = self._owner
+        owner._check_transaction()
+        owner._connector.connection.commit()
+        owner._in_transaction = False
+
+    def rollback(self) -> None:
+        owner = self._owner
+        lost, owner._transaction_lost = owner._transaction_lost, False
+        owner._in_transaction = False
+        conn = owner._connector.connection
+        if conn is None:
+            return
+        try:
+            conn.rollback()
+        except Exception:
+            if not lost:  # tras una pérdida no queda nada que deshacer
+                raise
+
+    def autocommit(self, value: bool) -> None:
+        owner = self._owner
+        _set_autocommit(owner._connector.connection, value)
+        owner._autocommit = value
+        if value:
+            owner._in_transaction = False
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._owner._connector.connection, name)
+
+
+class _TrackedCursor:
+    """Cursor que registra el uso de la conexión y detecta caídas.
+
+    Si la conexión se reconectó desde que se abrió, el cursor crudo se
+    reemplaza por uno nuevo antes de ejecutar.
+    """
+
+    def __init__(self, open_cursor: Callable[[], Any], owner: ResilientConnector):
+        self._open = open_cursor
+        self._owner = owner
+        self._generation = owner._generation
+        self._raw = self._opened()
+
+    def _opened(self) -> Any:
+        try:
+            return self._open()
+        except Exception as e:
+            self._failed(e)
+            raise
+
+    def _fresh(self) -> Any:
+        owner = self._owner
+        owner._before_use()
+        if self._generation != owner._generation:
+            try:
+                self._raw.close()
+            except Exception:
+                pass
+            self._raw = self._opened()
+            self._generation = owner._generation
+        return self._raw
+
+    def _failed(self, error: BaseException) -> None:
+        if self._owner._on_error(error):
+            raise TransactionLostError(
+                "Se perdió la conexión en mitad de una transacción: los cambios "
+                "no confirmados se perdieron."
+            ) from error
+
+    def execute(self, query: str, *args: Any, **kwargs: Any) -> Any:
+        raw = self._fresh()
+        try:
+            result = raw.execute(query, *args, **kwargs)
+        except Exception as e:
+            self._failed(e)
+            raise
+        self._owner._after_statement(query)
+        return result
+
+    def executemany(self, query: str, param_list: List[Any]) -> Any:
+        raw = self._fresh()
+        try:
+            result = raw.executemany(query, param_list)
+        except Exception as e:
+            self._failed(e)
+            raise
+        self._owner._after_statement(None)
+        return result
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._raw, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in ("_open", "_owner", "_generation", "_raw"):
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._raw, name, value)
@@ -0,0 +1,271 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from conn.connection_protocolo import DBConnectionProtocol
+from conn.database_connector import DatabaseConnector
+from conn.query_template import QueryTemplateCache
+from conn.single_flight import SingleFlight
+from conn.sql_inspect import is_read_query, normalize_sql, read_tables, written_tables
+
+
+def estimate_size(value: Any) -> int:
+    """Estimación barata (en bytes) del tamaño de un resultado: filas y valores."""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        for k, v in value.items():
+            size += sys.getsizeof(k) + sys.getsizeof(v)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            if isinstance(item, (list, tuple, dict)):
+                size += estimate_size(item)
+            else:
+                size += sys.getsizeof(item)
+    return size
+
+
+class _Entry:
+    __slots__ = ("value", "expires_at", "size", "tags")
+
+    def __init__(self, value: Any, expires_at: float, size: int, tags: Set[str]):
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+        self.tags = tags
+
+
+class ResultCache:
+    """Caché de resultados con TTL, límite LRU (entradas/bytes) y etiquetas.
+
+    Las etiquetas suelen ser nombres de tabla normalizados; `invalidate()`
+    expulsa todas las entradas asociadas a cualquiera de las etiquetas.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 60.0,
+        max_entries: int = 1024,
+        max_bytes: Optional[int] = None,
+    ):
+        if max_entries <= 0:
+            raise ValueError("max_entries debe ser mayor que 0")
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._by_tag: Dict[str, Set[Hashable]] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Devuelve (encontrado, valor)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            if entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry.value
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        tags: Iterable[str] = (),
+        ttl: Optional[float] = None,
+    ) -> None:
+        size = estimate_size(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return  # Nunca cabría: no desplazamos todo el resto por ella.
+        ttl = self.ttl if ttl is None else ttl
+        entry = _Entry(value, time.monotonic() + ttl, size, set(tags))
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._bytes += size
+            for tag in entry.tags:
+                self._by_tag.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None and self._bytes > self.max_bytes
+            ):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, *tags: str) -> int:
+        """Expulsa las entradas con cualquiera de las etiquetas. Devuelve cuántas."""
+        removed = 0
+        with self._lock:
+            for tag in tags:
+                for key in list(self._by_tag.get(tag, ())):
+                    self._remove(key)
+                    removed += 1
+            self.invalidations += removed
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_tag.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+        for tag in entry.tags:
+            keys = self._by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_tag[tag]
+
+
+def _freeze(params: Any) -> Any:
+    if isinstance(params, dict):
+        return tuple(sorted(params.items()))
+    return params
+
+
+class CachedDatabaseConnector(DatabaseConnector):
+    """DatabaseConnector con caché de resultados opcional para lecturas.
+
+    `query()` devuelve las filas materializadas (fetchall) y las cachea por
+    (SQL normalizado, params, paramstyle). Las entradas se etiquetan con las
+    tablas de sus cláusulas FROM/JOIN (o con `tags` explícitos), y toda
+    escritura hecha con `execute`/`executemany` sobre esas tablas las expulsa
+    (de nuevo al hacer commit, por si otra lectura las recacheó antes).
+
+    Con `single_flight`, los fallos de caché simultáneos de la misma lectura
+    (p. ej. al expirar una entrada) se resuelven con una sola ejecución.
+
+    Las filas devueltas se comparten con la caché: no deben modificarse.
+    """
+
+    def __init__(
+        self,
+        connector: DBConnectionProtocol,
+        cache: Optional[ResultCache] = None,
+        template_cache: Optional[QueryTemplateCache] = None,
+        single_flight: Optional[SingleFlight] = None,
+    ):
+        super().__init__(
+            connector, template_cache=template_cache, single_flight=single_flight
+        )
+        self.cache = cache if cache is not None else ResultCache()
+        self._pending_tables: Set[str] = set()
+
+    def query(
+        self,
+        sql: str,
+        params: Optional[List[Any]] = None,
+        tags: Optional[Iterable[str]] = None,
+        ttl: Optional[float] = None,
+    ) -> List[Any]:
+        """Ejecuta una lectura y devuelve sus filas, usando la caché si es posible."""
+        compiled = self._compile(sql)
+        params_final = compiled.bind(params or [])
+        if not is_read_query(compiled.sql):
+            with self.execute(sql, params or []) as cursor:
+                return list(cursor.fetchall())
+
+        key = (normalize_sql(compiled.sql), _freeze(params_final), self.paramstyle)
+        try:
+            found, rows = self.cache.get(key)
+        except TypeError:  # parámetros no hashables: sin caché
+            with self.execute(sql, params or []) as cursor:
+                return list(cursor.fetchall())
+        if found:
+            return rows
+
+        with self.execute(sql, params or []) as cursor:
+            rows = list(cursor.fetchall())
+        if tags is None:
+            tags = read_tables(compiled.sql)
+        self.cache.set(key, rows, tags=[t.lower() for t in tags], ttl=ttl)
+        return rows
+
+    def invalidate(self, *tags: str) -> int:
+        return self.cache.invalidate(*(t.lower() for t in tags))
+
+    def cache_stats(self) -> Dict[str, Any]:
+        return self.cache.stats()
+
+    # execute/executemany y las sentencias preparadas pasan por aquí.
+    def _execute_on(self, cursor, sql_final, params_final, timeout):
+        cursor = super()._execute_on(cursor, sql_final, params_final, timeout)
+        self._after_write(sql_final)
+        return cursor
+
+    def _executemany_on(self, cursor, sql_final, final_params_list, timeout):
+        cursor = super()._executemany_on(cursor, sql_final, final_params_list, timeout)
+        self._after_write(sql_final)
+        return cursor
+
+    def execute_batch(self, statements):
+        results = super().execute_batch(statements)
+        for statement in statements:
+            self._after_write(statement if isinstance(statement, str) else statement[0])
+        return results
+
+    def bulk_insert(self, table: str, columns, rows, chunk_size: int = 1000, commit: bool = False):
+        stats = super().bulk_insert(table, columns, rows, chunk_size, commit)
+        self._after_write(f"INSERT INTO {table}")
+        return stats
+
+    def commit(self):
+        result = super().commit()
+        self._invalidate_pending()
+        return result
+
+    def rollback(self):
+        # Las lecturas hechas dentro de la transacción pudieron cachear
+        # filas sin confirmar que el rollback acaba de deshacer.
+        result = super().rollback()
+        self._invalidate_pending()
+        return result
+
+    def _invalidate_pending(self) -> None:
+        # _pending_tables se protege con el lock de la caché; invalidate()
+        # lo vuelve a tomar, así que se llama fuera.
+        with self.cache._lock:
+            tables, self._pending_tables = self._pending_tables, set()
+        if tables:
+            self.cache.invalidate(*tables)
+
+    def _after_write(self, sql: str) -> None:
+        if is_read_query(sql):
+            return
+        tables = written_tables(sql)
+        if tables:
+            self.cache.invalidate(*tables)
+            with self.cache._lock:
+                self._pending_tables |= tables
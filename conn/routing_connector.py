@@ -0,0 +1,455 @@
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from conn.connection_protocolo import DBConnectionProtocol
+from conn.sql_inspect import is_read_query
+
+
+def _set_autocommit(conn: Any, value: bool) -> None:
+    # Igual que DatabaseConnector.autocommit: método (pymysql) o atributo (pyodbc).
+    if hasattr(conn, "autocommit") and callable(getattr(conn, "autocommit")):
+        conn.autocommit(value)
+    else:
+        setattr(conn, "autocommit", value)
+
+
+class _Replica:
+    __slots__ = ("name", "connector", "ewma", "failures", "ejected_until", "reads", "errors")
+
+    def __init__(self, name: str, connector: DBConnectionProtocol):
+        self.name = name
+        self.connector = connector
+        self.ewma: Optional[float] = None
+        self.failures = 0
+        self.ejected_until: Optional[float] = None
+        self.reads = 0
+        self.errors = 0
+
+
+class RoutingConnector:
+    """Conector que separa lecturas y escrituras entre un primario y N réplicas.
+
+    Implementa DBConnectionProtocol, así que se usa como cualquier conector:
+
+        router = RoutingConnector(MySQLConnector(...), [MySQLConnector(...), ...])
+        router.connect()
+        db = DatabaseConnector(router)
+
+    - Las sentencias que no son de sólo lectura (según `sql_inspect.is_read_query`)
+      y todo executemany van al primario.
+    - Tras una escritura sin autocommit, todas las lecturas van al primario
+      hasta `commit()`/`rollback()` (la transacción sigue abierta allí); con
+      `sticky_seconds` se siguen leyendo del primario un tiempo tras el commit,
+      para cubrir el retraso de replicación.
+    - El resto de lecturas se reparten entre réplicas eligiendo, de dos al
+      azar, la de menor latencia reciente (EWMA del tiempo de execute).
+    - Si una réplica falla y además no responde a `probe_sql`, se expulsa
+      durante `eject_seconds` (duplicando hasta `max_eject_seconds` si vuelve
+      a fallar), la lectura se reintenta en otra réplica o en el primario, y
+      al vencer el plazo se reconecta y se vuelve a probar.
+    - `with router.use_primary():` fuerza el primario (read-your-writes).
+
+    Las réplicas se ponen en autocommit para no retener instantáneas viejas.
+    """
+
+    def __init__(
+        self,
+        primary: DBConnectionProtocol,
+        replicas: Sequence[DBConnectionProtocol] = (),
+        ewma_alpha: float = 0.3,
+        eject_seconds: float = 5.0,
+        max_eject_seconds: float = 60.0,
+        probe_sql: str = "SELECT 1",
+        sticky_seconds: float = 0.0,
+    ):
+        if not 0 < ewma_alpha <= 1:
+            raise ValueError("ewma_alpha debe estar en (0, 1]")
+        self.primary = primary
+        self._replicas = [_Replica(f"replica-{i}", c) for i, c in enumerate(replicas)]
+        self.ewma_alpha = ewma_alpha
+        self.eject_seconds = eject_seconds
+        self.max_eject_seconds = max_eject_seconds
+        self.probe_sql = probe_sql
+        self.sticky_seconds = sticky_seconds
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._random = random.Random()
+        self._autocommit = False
+        self._in_transaction = False
+        self._sticky_until = 0.0
+        self._primary_reads = 0
+        self._primary_writes = 0
+        self._proxy = _RoutingConnection(self)
+
+    # --- DBConnectionProtocol ---
+
+    @property
+    def connection(self) -> Optional[Any]:
+        """Proxy de la conexión del primario (None si no está conectado).
+
+        commit/rollback pasan por aquí para saber cuándo termina la transacción.
+        """
+        return self._proxy if self.primary.connection is not None else None
+
+    @property
+    def paramstyle(self) -> Optional[str]:
+        return getattr(self.primary, "paramstyle", None)
+
+    @property
+    def dialect(self) -> Optional[str]:
+        return getattr(self.primary, "dialect", None)
+
+    def connect(self) -> None:
+        """Conecta el primario (los errores se propagan) y las réplicas (se expulsan)."""
+        self.primary.connect()
+        for replica in self._replicas:
+            try:
+                self._open_replica(replica)
+            except Exception:
+                self._eject(replica)
+
+    def get_cursor(self) -> "_RoutingCursor":
+        if self.primary.connection is None:
+            raise Exception("No hay conexión activa.")
+        return _RoutingCursor(self)
+
+    def close_connection(self) -> None:
+        for replica in self._replicas:
+            try:
+                replica.connector.close_connection()
+            except Exception:
+                pass
+        self.primary.close_connection()
+
+    def conn_engine(self, **engine_options: Any):
+        return self.primary.conn_engine(**engine_options)
+
+    def cancel_query(self, cursor: "_RoutingCursor") -> None:
+        """Cancela la sentencia en curso del cursor en el servidor que la ejecuta."""
+        cursor.cancel()
+
+    # --- Enrutamiento ---
+
+    @contextmanager
+    def use_primary(self) -> Iterator["RoutingConnector"]:
+        """Dentro del bloque, todas las lecturas del hilo actual van al primario."""
+        self._local.force_primary = getattr(self._local, "force_primary", 0) + 1
+        try:
+            yield self
+        finally:
+            self._local.force_primary -= 1
+
+    def replica_engine(self, **engine_options: Any):
+        """Engine de la réplica que se elegiría ahora (o del primario si no hay)."""
+        replica = self._choose_replica()
+        target = replica.connector if replica is not None else self.primary
+        return target.conn_engine(**engine_options)
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "primary": {
+                    "reads": self._primary_reads,
+                    "writes": self._primary_writes,
+                    "in_transaction": self._in_transaction,
+                },
+                "replicas": [
+                    {
+                        "name": r.name,
+                        "reads": r.reads,
+                        "errors": r.errors,
+                        "ewma": r.ewma,
+                        "ejected": r.ejected_until is not None,
+                        "ejected_for": max(r.ejected_until - now, 0.0)
+                        if r.ejected_until is not None
+                        else 0.0,
+                    }
+                    for r in self._replicas
+                ],
+            }
+
+    def _route_read(self) -> Optional[_Replica]:
+        """Réplica para una lectura, o None si debe ir al primario."""
+        if getattr(self._local, "force_primary", 0):
+            return None
+        with self._lock:
+            if self._in_transaction or time.monotonic() < self._sticky_until:
+                return None
+        return self._choose_replica()
+
+    def _choose_replica(self, exclude: Sequence[_Replica] = ()) -> Optional[_Replica]:
+        now = time.monotonic()
+        due: List[_Replica] = []
+        with self._lock:
+            healthy = []
+            for replica in self._replicas:
+                if replica in exclude:
+                    continue
+                if replica.ejected_until is None:
+                    healthy.append(replica)
+                elif replica.ejected_until <= now:
+                    # Reservamos la réplica para que sólo un hilo la pruebe.
+                    replica.ejected_until = now + self.eject_seconds
+                    due.append(replica)
+        for replica in due:
+            if self._reprobe(replica):
+                healthy.append(replica)
+        if not healthy:
+            return None
+        if len(healthy) == 1:
+            return healthy[0]
+        a, b = self._random.sample(healthy, 2)
+        # Las réplicas aún sin medir cuentan como 0 para que reciban tráfico.
+        return a if (a.ewma or 0.0) <= (b.ewma or 0.0) else b
+
+    def _record_read(self, replica: Optional[_Replica], seconds: float) -> None:
+        with self._lock:
+            if replica is None:
+                self._primary_reads += 1
+                return
+            replica.reads += 1
+            if replica.ewma is None:
+                replica.ewma = seconds
+            else:
+                replica.ewma += self.ewma_alpha * (seconds - replica.ewma)
+
+    def _record_write(self) -> None:
+        with self._lock:
+            self._primary_writes += 1
+            if not self._autocommit:
+                self._in_transaction = True
+            elif self.sticky_seconds:
+                self._sticky_until = time.monotonic() + self.sticky_seconds
+
+    def _end_transaction(self, committed: bool) -> None:
+        with self._lock:
+            if committed and self._in_transaction and self.sticky_seconds:
+                self._sticky_until = time.monotonic() + self.sticky_seconds
+            self._in_transaction = False
+
+    def _replica_failed(self, replica: _Replica) -> bool:
+        """True si la réplica quedó expulsada (el error era de la réplica)."""
+        with self._lock:
+            replica.errors += 1
+        if self._probe(replica):
+            return False  # La réplica responde: el error es de la consulta.
+        self._eject(replica)
+        return True
+
+    # --- Salud de réplicas ---
+
+    def _open_replica(self, replica: _Replica) -> None:
+        replica.connector.connect()
+        try:
+            _set_autocommit(replica.connector.connection, True)
+        except Exception:
+            pass
+
+    def _probe(self, replica: _Replica) -> bool:
+        try:
+            cursor = replica.connector.get_cursor()
+            try:
+                cursor.execute(self.probe_sql)
+                cursor.fetchall()
+            finally:
+                cursor.close()
+            return True
+        except Exception:
+            return False
+
+    def _reprobe(self, replica: _Replica) -> bool:
+        try:
+            replica.connector.close_connection()
+        except Exception:
+            pass
+        try:
+            self._open_replica(replica)
+        except Exception:
+            self._eject(replica)
+            return False
+        if not self._probe(replica):
+            self._eject(replica)
+            return False
+        with self._lock:
+            replica.failures = 0
+            replica.ejected_until = None
+            replica.ewma = None
+        return True
+
+    def _eject(self, replica: _Replica) -> None:
+        with self._lock:
+            replica.failures += 1
+            backoff = self.eject_seconds * 2 ** (replica.failures - 1)
+            replica.ejected_until = time.monotonic() + min(backoff, self.max_eject_seconds)
+
+
+class _RoutingConnection:
+    """Proxy de la conexión del primario que avisa al router del fin de transacción."""
+
+    def __init__(self, router: RoutingConnector):
+        self._router = router
+
+    def commit(self) -> None:
+        self._router.primary.connection.commit()
+        self._router._end_transaction(committed=True)
+
+    def rollback(self) -> None:
+        self._router.primary.connection.rollback()
+        self._router._end_transaction(committed=False)
+
+    def autocommit(self, value: bool) -> None:
+        _set_autocommit(self._router.primary.connection, value)
+        self._router._autocommit = value
+        if value:
+            self._router._end_transaction(committed=True)
+
+    def cursor(self) -> "_RoutingCursor":
+        return self._router.get_cursor()
+
+    def close(self) -> None:
+        self._router.close_connection()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._router.primary.connection, name)
+
+
+class _RoutingCursor:
+    """Cursor que decide en cada execute si la sentencia va al primario o a una réplica.
+
+    Mantiene un cursor crudo por destino; fetch*/description/rowcount se
+    delegan al cursor de la última sentencia.
+    """
+
+    def __init__(self, router: RoutingConnector):
+        self._router = router
+        self._cursors: Dict[int, Any] = {}
+        self._active: Any = None
+        self._active_connector: Optional[DBConnectionProtocol] = None
+        self._arraysize: Optional[int] = None
+
+    def _cursor_for(self, connector: DBConnectionProtocol) -> Any:
+        raw = self._cursors.get(id(connector))
+        if raw is None:
+            raw = connector.get_cursor()
+            if self._arraysize is not None:
+                raw.arraysize = self._arraysize
+            self._cursors[id(connector)] = raw
+        return raw
+
+    def _discard(self, connector: DBConnectionProtocol) -> None:
+        raw = self._cursors.pop(id(connector), None)
+        if raw is not None and raw is self._active:
+            self._active, self._active_connector = None, None
+        if raw is not None:
+            try:
+                raw.close()
+            except Exception:
+                pass
+
+    def execute(self, query: str, *args: Any, **kwargs: Any) -> Any:
+        router = self._router
+        if not is_read_query(query):
+            return self._on_primary(query, args, kwargs, write=True)
+
+        tried: List[_Replica] = []
+        replica = router._route_read()
+        while replica is not None:
+            connector = replica.connector
+            start = time.perf_counter()
+            try:
+                raw = self._cursor_for(connector)
+                self._active, self._active_connector = raw, connector
+                result = raw.execute(query, *args, **kwargs)
+            except Exception:
+                self._discard(connector)
+                if not router._replica_failed(replica):
+                    raise
+                tried.append(replica)
+                replica = router._choose_replica(exclude=tried)
+                continue
+            router._record_read(replica, time.perf_counter() - start)
+            return result
+        return self._on_primary(query, args, kwargs, write=False)
+
+    def _on_primary(self, query: str, args: Any, kwargs: Any, write: bool) -> Any:
+        raw = self._cursor_for(self._router.primary)
+        self._active, self._active_connector = raw, self._router.primary
+        result = raw.execute(query, *args, **kwargs)
+        if write:
+            self._router._record_write()
+        else:
+            self._router._record_read(None, 0.0)
+        return result
+
+    def executemany(self, query: str, param_list: List[Any]) -> Any:
+        raw = self._cursor_for(self._router.primary)
+        self._active, self._active_connector = raw, self._router.primary
+        result = raw.executemany(query, param_list)
+        self._router._record_write()
+        return result
+
+    def cancel(self) -> None:
+        """Cancela (desde otro hilo) la sentencia en curso en su servidor."""
+        raw, connector = self._active, self._active_connector
+        if raw is None:
+            return
+        hook = getattr(connector, "cancel_query", None)
+        if callable(hook):
+            hook(raw)
+        elif callable(getattr(raw, "cancel", None)):
+            raw.cancel()
+
+    def _require_active(self) -> Any:
+        if self._active is None:
+            raise Exception("No se ha ejecutado ninguna sentencia en este cursor.")
+        return self._active
+
+    def fetchone(self) -> Any:
+        return self._require_active().fetchone()
+
+    def fetchall(self) -> Any:
+        return self._require_active().fetchall()
+
+    def fetchmany(self, *args: Any) -> Any:
+        return self._require_active().fetchmany(*args)
+
+    @property
+    def description(self) -> Any:
+        return self._active.description if self._active is not None else None
+
+    @property
+    def rowcount(self) -> int:
+        return self._active.rowcount if self._active is not None else -1
+
+    @property
+    def lastrowid(self) -> Any:
+        return getattr(self._active, "lastrowid", None)
+
+    @property
+    def arraysize(self) -> int:
+        return self._arraysize if self._arraysize is not None else 1
+
+    @arraysize.setter
+    def arraysize(self, value: int) -> None:
+        self._arraysize = value
+        for raw in self._cursors.values():
+            raw.arraysize = value
+
+    def close(self) -> None:
+        cursors = list(self._cursors.values())
+        self._cursors.clear()
+        self._active, self._active_connector = None, None
+        for raw in cursors:
+            raw.close()
+
+    def __getattr__(self, name: str) -> Any:
+        # AttributeError (no Exception) para que hasattr/getattr con valor por
+        # defecto funcionen antes de la primera sentencia.
+        if self._active is None:
+            raise AttributeError(name)
+        return getattr(self._active, name)
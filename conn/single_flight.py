@@ -0,0 +1,157 @@
+import threading
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from conn.cancellation import QueryTimeoutError
+from conn.sql_inspect import normalize_sql
+
+
+def flight_key(sql_final: str, params_final: Any, paramstyle: Optional[str]) -> Hashable:
+    """Clave de una lectura: SQL normalizado, parámetros y paramstyle.
+
+    normalize_sql respeta los espacios dentro de literales: 'x  y' y 'x y'
+    nunca se agrupan.
+
+    TypeError si los parámetros no son hashables (esa lectura no se agrupa).
+    """
+    if isinstance(params_final, dict):
+        params_final = tuple(sorted(params_final.items()))
+    key = (normalize_sql(sql_final), params_final, paramstyle)
+    hash(key)
+    return key
+
+
+class MaterializedResult:
+    """Resultado completo de una lectura compartido entre quienes la esperaban."""
+
+    __slots__ = ("description", "rows", "rowcount")
+
+    def __init__(self, description: Any, rows: List[Any], rowcount: int):
+        self.description = description
+        self.rows = rows
+        self.rowcount = rowcount
+
+
+class ResultCursor:
+    """Cursor de sólo lectura sobre un MaterializedResult (lo envuelve DBCursor).
+
+    Cada llamador recibe su propio cursor, pero las filas son las mismas: no
+    deben modificarse.
+    """
+
+    def __init__(self, result: MaterializedResult):
+        self._result = result
+        self._position = 0
+        self.arraysize = 1
+
+    @property
+    def description(self) -> Any:
+        return self._result.description
+
+    @property
+    def rowcount(self) -> int:
+        return self._result.rowcount
+
+    def fetchone(self) -> Any:
+        rows = self._result.rows
+        if self._position >= len(rows):
+            return None
+        self._position += 1
+        return rows[self._position - 1]
+
+    def fetchmany(self, size: Optional[int] = None) -> List[Any]:
+        size = self.arraysize if size is None else size
+        start = self._position
+        self._position = min(start + size, len(self._result.rows))
+        return self._result.rows[start:self._position]
+
+    def fetchall(self) -> List[Any]:
+        start = self._position
+        self._position = len(self._result.rows)
+        return self._result.rows[start:]
+
+    def close(self) -> None:
+        pass
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Agrupa ejecuciones concurrentes idénticas en una sola ("single flight").
+
+    El primer llamador de una clave ejecuta la función; los que llegan
+    mientras está en curso esperan y reciben el mismo resultado (o la misma
+    excepción). No es una caché: al terminar, la siguiente llamada vuelve a
+    ejecutar. Se comparte entre los DatabaseConnector de una misma base de
+    datos (la clave no incluye la conexión).
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.executions = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    def do(
+        self, key: Hashable, fn: Callable[[], Any], timeout: Optional[float] = None
+    ) -> Tuple[Any, bool]:
+        """
+        Devuelve (resultado, compartido). `timeout` limita la espera de quien
+        no ejecuta: al vencer lanza QueryTimeoutError (la ejecución compartida
+        sigue para el resto).
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            if not call.done.wait(timeout):
+                raise QueryTimeoutError(
+                    f"La lectura compartida superó el plazo de {timeout}s.", timeout=timeout
+                )
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, call.waiters > 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            requests = self.executions + self.coalesced
+            return {
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "saved_ratio": self.coalesced / requests if requests else 0.0,
+                "errors": self.errors,
+                "in_flight": len(self._calls),
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.executions = self.coalesced = self.errors = 0
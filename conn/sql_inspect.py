@@ -0,0 +1,75 @@
+import re
+from typing import Set
+
+# Heurísticas ligeras sobre el texto SQL (no es un parser): sirven para decidir
+# si una sentencia es de sólo lectura y qué tablas lee o modifica.
+
+# Literales y nombres entre comillas se conservan tal cual; sólo se colapsan
+# los espacios fuera de ellos.
+_QUOTED_OR_SPACE = re.compile(
+    r"'(?:[^'\\]|\\.|'')*'"
+    r'|"(?:[^"\\]|\\.|"")*"'
+    r"|`[^`]*`|\[[^\]]*\]"
+    r"|(\s+)"
+)
+_FIRST_WORD = re.compile(r"^\s*\(*\s*(\w+)")
+_READ_KEYWORDS = {"SELECT", "WITH", "SHOW", "DESCRIBE", "DESC", "EXPLAIN", "VALUES"}
+_LOCKING_READ = re.compile(
+    r"\bFOR\s+UPDATE\b|\bFOR\s+SHARE\b|\bLOCK\s+IN\s+SHARE\s+MODE\b"
+    r"|\b(UPDLOCK|XLOCK|HOLDLOCK|TABLOCKX)\b",
+    re.IGNORECASE,
+)
+_HIDDEN_WRITE = re.compile(
+    r"\b(INSERT|UPDATE|DELETE|MERGE|INTO)\b", re.IGNORECASE
+)
+_TABLE_NAME = r"((?:[`\"\[]?[\w$#@]+[`\"\]]?\s*\.\s*)*[`\"\[]?[\w$#@]+[`\"\]]?)"
+_WRITE_TABLES = re.compile(
+    r"\bINSERT\s+(?:IGNORE\s+)?(?:INTO\s+)?" + _TABLE_NAME
+    + r"|\bREPLACE\s+(?:INTO\s+)?" + _TABLE_NAME
+    + r"|\bUPDATE\s+" + _TABLE_NAME
+    + r"|\bDELETE\s+(?:FROM\s+)?" + _TABLE_NAME
+    + r"|\bMERGE\s+(?:INTO\s+)?" + _TABLE_NAME
+    + r"|\b(?:TRUNCATE|ALTER|DROP)\s+TABLE\s+(?:IF\s+EXISTS\s+)?" + _TABLE_NAME,
+    re.IGNORECASE,
+)
+_READ_TABLES = re.compile(r"\b(?:FROM|JOIN)\s+" + _TABLE_NAME, re.IGNORECASE)
+
+
+def normalize_sql(sql: str) -> str:
+    """Colapsa espacios en blanco para que variaciones de formato compartan clave.
+
+    Los espacios dentro de literales ('x  y') e identificadores entre
+    comillas se respetan: 'x  y' y 'x y' son consultas distintas.
+    """
+    return _QUOTED_OR_SPACE.sub(lambda m: " " if m.group(1) else m.group(0), sql).strip()
+
+
+def normalize_table(name: str) -> str:
+    """`dbo`.`[Clientes]` -> 'clientes' (sin esquema, comillas ni mayúsculas)."""
+    last = name.split(".")[-1].strip()
+    return last.strip('`"[] ').lower()
+
+
+def is_read_query(sql: str) -> bool:
+    """True si la sentencia parece de sólo lectura y sin bloqueos (FOR UPDATE...)."""
+    match = _FIRST_WORD.match(sql)
+    if match is None or match.group(1).upper() not in _READ_KEYWORDS:
+        return False
+    if _LOCKING_READ.search(sql):
+        return False
+    # SELECT ... INTO (SQL Server) o CTE seguida de DML.
+    return _HIDDEN_WRITE.search(sql) is None
+
+
+def written_tables(sql: str) -> Set[str]:
+    """Tablas que modifica una sentencia de escritura (normalizadas)."""
+    tables = set()
+    for match in _WRITE_TABLES.finditer(sql):
+        name = next(group for group in match.groups() if group)
+        tables.add(normalize_table(name))
+    return tables
+
+
+def read_tables(sql: str) -> Set[str]:
+    """Tablas referenciadas en cláusulas FROM/JOIN (normalizadas)."""
+    return {normalize_table(m.group(1)) for m in _READ_TABLES.finditer(sql)}
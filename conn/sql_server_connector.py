@@ -1,18 +1,34 @@
-import pyodbc
+import math
+import re
+from datetime import datetime
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any, List, Optional, Tuple
 from urllib.parse import quote_plus
-from sqlalchemy import create_engine
-from sqlalchemy.engine import URL, Engine
+
+from conn.engine_registry import EngineRegistry
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
+
+# pyodbc y SQLAlchemy se importan dentro de los métodos que los usan para que
+# importar este módulo no cargue el driver.
 
 
 class SQLServerConnector:
-    def __init__(self, host, database, user, password):
+    def __init__(self, host, database, user, password, query_timeout=None):
         self.host = host
         self.database = database
         self.user = user
         self.password = password
+        # Plazo por defecto (segundos) de cada sentencia en el driver:
+        # pyodbc lo aplica con SQL_ATTR_QUERY_TIMEOUT y cancela la consulta.
+        self.query_timeout = query_timeout
         self.connection = None
+        self._engines = EngineRegistry()
 
     def connect(self) -> None:
+        import pyodbc
+
         try:
             # En tu método connect() y conn_engine()
             self.connection = pyodbc.connect(
@@ -25,6 +41,10 @@ class SQLServerConnector:
                 f"TDS_Version=7.4;"  # Versión para SQL Server 2008 en adelante
                 f"Mars_Connection=Yes;"
             )
+            if self.query_timeout:
+                # pyodbc usa segundos enteros y 0 significa "sin plazo":
+                # un plazo menor de 1 s se redondea a 1, no a 0.
+                self.connection.timeout = max(1, math.ceil(self.query_timeout))
             print("Conectado a SQL Server")
         except pyodbc.Error as e:
             print(f"Error de conexión a SQL Server: {e}")
@@ -41,6 +61,8 @@ class SQLServerConnector:
     # `get_cursor()` o acceda directamente a `self.connection`.
 
     def get_cursor(self):
+        import pyodbc
+
         if self.connection is None:
             raise Exception("No hay conexión activa.")
         try:
@@ -52,7 +74,63 @@ class SQLServerConnector:
             print(f"Error inesperado al obtener el cursor: {e}")
             raise
 
+    def get_stream_cursor(self, batch_size: int, as_dict: bool):
+        """
+        Cursor con arraysize ajustado a batch_size; pyodbc trae las filas del
+        servidor a medida que se consumen, por lo que no carga el resultado completo.
+        """
+        cursor = self.get_cursor()
+        cursor.arraysize = batch_size
+        return cursor
+
+    def cancel_query(self, cursor) -> None:
+        """Cancela la sentencia en curso de `cursor` (SQLCancel); se llama desde otro hilo."""
+        cursor.cancel()
+
+    def bulk_insert_chunk(self, cursor, table, columns, sql, rows) -> None:
+        """
+        Inserta `rows` con fast_executemany (parámetros enviados en bloque) y
+        setinputsizes inferido del propio bloque para evitar que pyodbc adivine
+        los tipos fila por fila.
+        """
+        cursor.fast_executemany = True
+        sizes = _input_sizes(rows, len(columns))
+        if any(size is not None for size in sizes):
+            cursor.setinputsizes(sizes)
+        cursor.executemany(sql, rows)
+
+    def execute_batch(self, cursor, statements) -> List[Any]:
+        """
+        Envía las sentencias (SQL en qmark ya formateado, params en tupla) como
+        lotes T-SQL separados por ';' y recorre los resultados con nextset().
+        Cada lote se parte para no pasar de _MAX_BATCH_PARAMS parámetros
+        (SQL Server admite 2100 por petición).
+        Las sentencias que no generan un resultado por sentencia (SET,
+        DECLARE, DDL, EXEC...) o que contienen varias sentencias (';' en
+        medio) descolocarían los resultados: se detectan antes de enviar nada,
+        se devuelve None y DatabaseConnector las ejecuta una a una.
+        Lo que no puede verse en el texto (SET NOCOUNT ON en la sesión) sólo
+        se detecta después: se lanza RuntimeError, pero las sentencias ya se
+        ejecutaron en la transacción en curso y hay que hacer rollback.
+        """
+        if any(_unbatchable(sql) for sql, _ in statements):
+            return None
+        results: List[Any] = []
+        sqls: List[str] = []
+        params: List[Any] = []
+        for sql, args in statements:
+            if sqls and len(params) + len(args) > _MAX_BATCH_PARAMS:
+                results.extend(_run_batch(cursor, sqls, params))
+                sqls, params = [], []
+            sqls.append(sql)
+            params.extend(args)
+        results.extend(_run_batch(cursor, sqls, params))
+        return results
+
     def close_connection(self) -> None:
+        import pyodbc
+
+        self._engines.dispose_all()
         if self.connection:
             try:
                 self.connection.close()
@@ -62,7 +140,12 @@ class SQLServerConnector:
             except Exception as e:
                 print(f"Error inesperado al cerrar la conexión: {e}")
 
-    def conn_engine(self) -> Engine:
+    def conn_engine(self, **engine_options: Any) -> "Engine":
+        """
+        Devuelve un Engine de SQLAlchemy reutilizable (uno por URL y opciones).
+        Acepta opciones de pool como pool_size, max_overflow, pool_pre_ping y
+        pool_recycle; los Engines se liberan en close_connection().
+        """
         url_sqlserver = (
             f"DRIVER={{FreeTDS}};"
             f"SERVER={self.host};"
@@ -74,10 +157,12 @@ class SQLServerConnector:
             f"Mars_Connection=Yes;"
         )
 
+        from sqlalchemy.engine import URL
+
         connection_url = URL.create(
             "mssql+pyodbc", query={"odbc_connect": url_sqlserver}
         )
-        return create_engine(connection_url)
+        return self._engines.get(connection_url, **engine_options)
 
     @property
     def paramstyle(self) -> str:
@@ -85,8 +170,124 @@ class SQLServerConnector:
         Expone el paramstyle utilizado por el driver pyodbc (qmark).
         Esto permite que DatabaseConnector lo detecte.
         """
-        # Si usas pyodbc, generalmente es 'qmark'
-        return getattr(pyodbc, "paramstyle", "qmark")
+        # pyodbc siempre usa 'qmark'; no lo importamos sólo para consultarlo.
+        return "qmark"
+
+    @property
+    def dialect(self) -> str:
+        """Dialecto SQL (ver conn.dialects)."""
+        return "mssql"
+
+
+_MAX_BATCH_PARAMS = 2000
+
+# Sentencias que no producen exactamente un resultado o rowcount en un lote.
+_NO_SINGLE_RESULT = re.compile(
+    r"^\s*(SET|DECLARE|PRINT|USE|CREATE|ALTER|DROP|TRUNCATE|GRANT|REVOKE|DENY"
+    r"|BEGIN|COMMIT|ROLLBACK|SAVE|EXEC|EXECUTE|IF|WHILE|RAISERROR|THROW)\b",
+    re.IGNORECASE,
+)
+
+
+def _unbatchable(sql: str) -> bool:
+    return bool(_NO_SINGLE_RESULT.match(sql)) or ";" in sql.rstrip().rstrip(";")
+
+
+def _run_batch(cursor, sqls: List[str], params: List[Any]) -> List[Any]:
+    batch = ";\n".join(sql.rstrip().rstrip(";") for sql in sqls)
+    if params:
+        cursor.execute(batch, *params)
+    else:
+        cursor.execute(batch)
+    results: List[Any] = []
+    while True:
+        if cursor.description is not None:
+            results.append(list(cursor.fetchall()))
+        else:
+            results.append(cursor.rowcount)
+        if not cursor.nextset():
+            break
+    if len(results) != len(sqls):
+        raise RuntimeError(
+            f"El lote de {len(sqls)} sentencias devolvió {len(results)} resultados: "
+            "no se pueden asociar a cada sentencia (¿SET NOCOUNT ON en la sesión?). "
+            "Las sentencias YA se ejecutaron y siguen sin confirmar: haga rollback() "
+            "antes de continuar."
+        )
+    return results
+
+
+def _input_sizes(rows, n_columns: int) -> List[Optional[Tuple[int, int, int]]]:
+    """Tipos (sql_type, size, decimal_digits) por columna para setinputsizes."""
+    import pyodbc
+
+    sizes: List[Optional[Tuple[int, int, int]]] = []
+    for i in range(n_columns):
+        kind = _column_kind([row[i] for row in rows])
+        sizes.append(None if kind is None else (getattr(pyodbc, kind[0]), kind[1], kind[2]))
+    return sizes
+
+
+_BIGINT_RANGE = (-(2 ** 63), 2 ** 63 - 1)
+
+
+def _column_kind(values) -> Optional[Tuple[str, int, int]]:
+    """
+    Tipo (nombre de la constante pyodbc, size, decimal_digits) que admite
+    todos los valores de la columna: se mira cada valor, no sólo el primero,
+    y se ensancha al tipo más amplio visto (bit < bigint < decimal < double).
+    None si la columna está vacía o mezcla tipos incompatibles: pyodbc
+    infiere entonces el tipo por valor.
+    """
+    present = [v for v in values if v is not None]
+    kinds = {_value_kind(v) for v in present}
+    if not kinds or None in kinds:
+        return None
+    if kinds == {"bit"}:
+        return ("SQL_BIT", 0, 0)
+    if kinds <= {"bit", "int"}:
+        return ("SQL_BIGINT", 0, 0)
+    if "float" in kinds and kinds <= {"bit", "int", "float", "decimal"}:
+        return ("SQL_DOUBLE", 0, 0)
+    if kinds <= {"bit", "int", "decimal"}:
+        return _decimal_kind(present)
+    if kinds == {"datetime"}:
+        return ("SQL_TYPE_TIMESTAMP", 0, 6)
+    if kinds == {"str"}:
+        length = max(len(v) for v in present)
+        # 0 => nvarchar(max) cuando supera el límite de nvarchar(n).
+        return ("SQL_WVARCHAR", length if length <= 4000 else 0, 0)
+    return None
+
+
+def _value_kind(value: Any) -> Optional[str]:
+    if isinstance(value, bool):
+        return "bit"
+    if isinstance(value, int):
+        return "int" if _BIGINT_RANGE[0] <= value <= _BIGINT_RANGE[1] else "decimal"
+    if isinstance(value, float):
+        return "float"
+    if isinstance(value, Decimal):
+        return "decimal"
+    if isinstance(value, datetime):
+        return "datetime"
+    if isinstance(value, str):
+        return "str"
+    return None
+
+
+def _decimal_kind(values) -> Optional[Tuple[str, int, int]]:
+    # Los enteros cuentan como decimales de escala 0. NaN/Infinity no tienen
+    # exponente numérico (el servidor los rechaza): no influyen en el tamaño.
+    parts = [Decimal(v).as_tuple() for v in values if Decimal(v).is_finite()]
+    if not parts:
+        return None
+    scale = max(max(-p.exponent, 0) for p in parts)
+    int_digits = max(max(len(p.digits) + p.exponent, 1) for p in parts)
+    if int_digits > 38:
+        return None
+    precision = min(int_digits + scale, 38)
+    return ("SQL_DECIMAL", precision, precision - int_digits)
 
 
 # Ejemplo de uso
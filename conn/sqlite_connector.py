@@ -0,0 +1,121 @@
+import re
+import sqlite3
+from typing import TYPE_CHECKING, Any, Dict
+
+from conn.engine_registry import EngineRegistry
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
+
+_PARAMSTYLES = ("qmark", "format", "named", "pyformat", "numeric")
+
+_FORMAT_PLACEHOLDER = re.compile(r"%%|%s")
+_PYFORMAT_PLACEHOLDER = re.compile(r"%%|%\((\w+)\)s")
+_NUMERIC_PLACEHOLDER = re.compile(r":(\d+)")
+
+
+def _to_sqlite(sql: str, paramstyle: str) -> str:
+    """Traduce los marcadores de `paramstyle` a los que entiende sqlite3."""
+    if paramstyle == "format":
+        return _FORMAT_PLACEHOLDER.sub(lambda m: "%" if m.group(0) == "%%" else "?", sql)
+    if paramstyle == "pyformat":
+        return _PYFORMAT_PLACEHOLDER.sub(
+            lambda m: "%" if m.group(0) == "%%" else f":{m.group(1)}", sql
+        )
+    if paramstyle == "numeric":
+        return _NUMERIC_PLACEHOLDER.sub(r"?\1", sql)
+    return sql
+
+
+class _SQLiteCursor:
+    """Cursor sqlite3 que acepta SQL escrito en el paramstyle simulado."""
+
+    def __init__(self, raw: sqlite3.Cursor, connector: "SQLiteConnector"):
+        self._raw = raw
+        self._connector = connector
+
+    def execute(self, query: str, params: Any = ()) -> Any:
+        return self._raw.execute(self._connector._translate(query), params)
+
+    def executemany(self, query: str, param_list: Any) -> Any:
+        return self._raw.executemany(self._connector._translate(query), param_list)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._raw, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in ("_raw", "_connector"):
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._raw, name, value)
+
+
+class SQLiteConnector:
+    """Conector sqlite3 en proceso que implementa DBConnectionProtocol.
+
+    Sirve para pruebas y benchmarks sin servidor: `paramstyle` permite simular
+    el estilo de cualquier driver (qmark, format, named, pyformat, numeric);
+    el SQL se traduce a marcadores de sqlite3 antes de ejecutarse.
+    """
+
+    def __init__(self, database: str = ":memory:", paramstyle: str = "qmark", **connect_kwargs):
+        if paramstyle not in _PARAMSTYLES:
+            raise ValueError(f"paramstyle no soportado: {paramstyle}")
+        self.database = database
+        self._paramstyle = paramstyle
+        self._connect_kwargs = connect_kwargs
+        self.connection = None
+        self._engines = EngineRegistry()
+        self._translated: Dict[str, str] = {}
+
+    def connect(self) -> None:
+        try:
+            self.connection = sqlite3.connect(
+                self.database, check_same_thread=False, **self._connect_kwargs
+            )
+        except sqlite3.Error as e:
+            print(f"Error de conexión a SQLite: {e}")
+            self.connection = None
+            raise
+
+    def get_cursor(self):
+        if self.connection is None:
+            raise Exception("No hay conexión activa.")
+        return _SQLiteCursor(self.connection.cursor(), self)
+
+    def cancel_query(self, cursor) -> None:
+        """Interrumpe la sentencia en curso de la conexión; se llama desde otro hilo."""
+        if self.connection is not None:
+            self.connection.interrupt()
+
+    def close_connection(self) -> None:
+        self._engines.dispose_all()
+        if self.connection:
+            try:
+                self.connection.close()
+            except sqlite3.Error as e:
+                print(f"Error al cerrar la conexión: {e}")
+            self.connection = None
+
+    def conn_engine(self, **engine_options: Any) -> "Engine":
+        if self.database == ":memory:":
+            url = "sqlite://"
+        else:
+            url = f"sqlite:///{self.database}"
+        return self._engines.get(url, **engine_options)
+
+    @property
+    def paramstyle(self) -> str:
+        return self._paramstyle
+
+    @property
+    def dialect(self) -> str:
+        return "sqlite"
+
+    def _translate(self, sql: str) -> str:
+        translated = self._translated.get(sql)
+        if translated is None:
+            if len(self._translated) > 1024:
+                self._translated.clear()
+            translated = self._translated[sql] = _to_sqlite(sql, self._paramstyle)
+        return translated
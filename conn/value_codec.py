@@ -0,0 +1,64 @@
+import datetime
+import decimal
+import json
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+# Serialización JSON con tipo de valores de clave (marcas de agua, cursores
+# de paginación): ida y vuelta exacta para fechas, Decimal y bytes.
+
+
+def _encode(value: Any) -> List[Any]:
+    # bool antes que int y datetime antes que date (son subclases).
+    if value is None:
+        return ["null", None]
+    if isinstance(value, bool):
+        return ["bool", value]
+    if isinstance(value, int):
+        return ["int", value]
+    if isinstance(value, float):
+        return ["float", value]
+    if isinstance(value, decimal.Decimal):
+        return ["decimal", str(value)]
+    if isinstance(value, datetime.datetime):
+        return ["datetime", value.isoformat()]
+    if isinstance(value, datetime.date):
+        return ["date", value.isoformat()]
+    if isinstance(value, (bytes, bytearray)):
+        return ["bytes", bytes(value).hex()]
+    if isinstance(value, str):
+        return ["str", value]
+    raise TypeError(f"Tipo de valor no soportado: {type(value).__name__}")
+
+
+_DECODERS: Dict[str, Callable[[Any], Any]] = {
+    "null": lambda v: None,
+    "bool": bool,
+    "int": int,
+    "float": float,
+    "decimal": decimal.Decimal,
+    "datetime": datetime.datetime.fromisoformat,
+    "date": datetime.date.fromisoformat,
+    "bytes": bytes.fromhex,
+    "str": str,
+}
+
+
+def encode_values(values: Sequence[Any]) -> List[List[Any]]:
+    """Valores -> lista JSON serializable [[tipo, valor], ...]."""
+    return [_encode(v) for v in values]
+
+
+def decode_values(encoded: Sequence[Sequence[Any]]) -> Tuple[Any, ...]:
+    """Inverso de encode_values; ValueError si el contenido no es válido."""
+    try:
+        return tuple(_DECODERS[kind](value) for kind, value in encoded)
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Valores codificados inválidos: {e}") from e
+
+
+def dumps(values: Sequence[Any]) -> str:
+    return json.dumps(encode_values(values))
+
+
+def loads(text: str) -> Tuple[Any, ...]:
+    return decode_values(json.loads(text))
@@ -0,0 +1,202 @@
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from conn.database_connector import DatabaseConnector
+
+
+def _estimate_bytes(params: Sequence[Any]) -> int:
+    size = 0
+    for value in params:
+        if isinstance(value, (str, bytes, bytearray)):
+            size += len(value)
+        else:
+            size += 8
+    return size
+
+
+class WriteBatcher:
+    """Agrupa escrituras de una fila en lotes con un único commit (group commit).
+
+    `submit(sql, params)` encola la sentencia y devuelve un Future que se
+    resuelve cuando su lote quedó confirmado (o falla con la excepción del
+    lote). Un hilo en segundo plano vacía el búfer cuando se alcanza
+    `max_rows`, `max_bytes` o pasan `max_delay` segundos desde la sentencia
+    más antigua; cada vaciado hace un executemany por cada tramo consecutivo
+    con el mismo SQL y un solo commit.
+
+    Si hay `max_pending` sentencias sin confirmar, `submit` bloquea
+    (contrapresión) hasta `submit_timeout` segundos y luego lanza TimeoutError.
+
+    El DatabaseConnector debe usarse sólo a través del batcher mientras esté
+    abierto. `close()` vacía lo pendiente y detiene el hilo.
+    """
+
+    def __init__(
+        self,
+        db: DatabaseConnector,
+        max_rows: int = 500,
+        max_bytes: int = 1_000_000,
+        max_delay: float = 0.05,
+        max_pending: int = 10_000,
+        submit_timeout: Optional[float] = None,
+    ):
+        if max_rows < 1 or max_pending < max_rows:
+            raise ValueError("Se requiere 1 <= max_rows <= max_pending")
+        self._db = db
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.max_delay = max_delay
+        self.max_pending = max_pending
+        self.submit_timeout = submit_timeout
+
+        self._cond = threading.Condition()
+        self._buffer: List[Tuple[str, Sequence[Any], Future]] = []
+        self._buffer_bytes = 0
+        self._oldest: Optional[float] = None
+        self._in_flight = 0
+        self._closing = False
+        self._flush_lock = threading.Lock()
+
+        self._batches = 0
+        self._rows = 0
+        self._errors = 0
+        self._flush_time = 0.0
+
+        self._thread = threading.Thread(
+            target=self._loop, name="write-batcher", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, sql: str, params: Optional[Sequence[Any]] = None) -> Future:
+        params = list(params or [])
+        future: Future = Future()
+        size = _estimate_bytes(params)
+        deadline = (
+            None if self.submit_timeout is None else time.monotonic() + self.submit_timeout
+        )
+        with self._cond:
+            while len(self._buffer) + self._in_flight >= self.max_pending:
+                if self._closing:
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError("WriteBatcher lleno: demasiadas escrituras pendientes.")
+                self._cond.wait(remaining)
+            if self._closing:
+                raise RuntimeError("WriteBatcher está cerrado.")
+            self._buffer.append((sql, params, future))
+            self._buffer_bytes += size
+            if self._oldest is None:
+                # Primer elemento: el hilo debe empezar a contar max_delay.
+                self._oldest = time.monotonic()
+                self._cond.notify_all()
+            elif len(self._buffer) >= self.max_rows or self._buffer_bytes >= self.max_bytes:
+                self._cond.notify_all()
+        return future
+
+    def flush(self) -> None:
+        """Vacía el búfer ahora, en el hilo que llama."""
+        self._drain()
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "pending": len(self._buffer) + self._in_flight,
+                "batches": self._batches,
+                "rows": self._rows,
+                "errors": self._errors,
+                "flush_time": self._flush_time,
+                "avg_batch_rows": self._rows / self._batches if self._batches else 0.0,
+            }
+
+    def __enter__(self) -> "WriteBatcher":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    # --- Internos ---
+
+    def _take(self) -> List[Tuple[str, Sequence[Any], Future]]:
+        """Retira el búfer actual (llamar con el lock tomado)."""
+        batch = self._buffer
+        self._buffer = []
+        self._buffer_bytes = 0
+        self._oldest = None
+        self._in_flight += len(batch)
+        return batch
+
+    def _due(self) -> bool:
+        if not self._buffer:
+            return False
+        if len(self._buffer) >= self.max_rows or self._buffer_bytes >= self.max_bytes:
+            return True
+        return time.monotonic() - (self._oldest or 0.0) >= self.max_delay
+
+    def _loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._closing and not self._due():
+                    if self._buffer:
+                        wait = self.max_delay - (time.monotonic() - (self._oldest or 0.0))
+                        self._cond.wait(max(wait, 0.0))
+                    else:
+                        self._cond.wait()
+                closing = self._closing
+            self._drain()
+            if closing:
+                return
+
+    def _drain(self) -> None:
+        # El búfer se retira con _flush_lock tomado para que los lotes se
+        # escriban en el mismo orden en que se enviaron.
+        with self._flush_lock:
+            with self._cond:
+                batch = self._take()
+            self._write(batch)
+
+    def _write(self, batch: List[Tuple[str, Sequence[Any], Future]]) -> None:
+        if not batch:
+            return
+        start = time.perf_counter()
+        error: Optional[BaseException] = None
+        try:
+            i = 0
+            while i < len(batch):
+                sql = batch[i][0]
+                j = i
+                while j < len(batch) and batch[j][0] == sql:
+                    j += 1
+                cursor = self._db.executemany(sql, [params for _, params, _ in batch[i:j]])
+                cursor.close()
+                i = j
+            self._db.commit()
+        except BaseException as e:
+            error = e
+            try:
+                self._db.rollback()
+            except Exception:
+                pass
+
+        for _, _, future in batch:
+            if error is None:
+                future.set_result(None)
+            else:
+                future.set_exception(error)
+
+        with self._cond:
+            self._in_flight -= len(batch)
+            self._batches += 1
+            self._rows += len(batch)
+            self._flush_time += time.perf_counter() - start
+            if error is not None:
+                self._errors += 1
+            self._cond.notify_all()
@@ -4,6 +4,31 @@ import sys
 TEST_MODULES = [
     "tests.test_cursor_wrapper",
     "tests.test_database_connector",
+    "tests.test_query_template",
+    "tests.test_connection_pool",
+    "tests.test_engine_registry",
+    "tests.test_stream",
+    "tests.test_columnar",
+    "tests.test_bulk_insert",
+    "tests.test_async_database_connector",
+    "tests.test_fan_out",
+    "tests.test_result_cache",
+    "tests.test_instrumentation",
+    "tests.test_sqlite_connector",
+    "tests.test_lazy_imports",
+    "tests.test_cursor_reuse",
+    "tests.test_write_batcher",
+    "tests.test_routing_connector",
+    "tests.test_execute_batch",
+    "tests.test_export",
+    "tests.test_copy_table",
+    "tests.test_incremental_sync",
+    "tests.test_pagination",
+    "tests.test_parallel_extract",
+    "tests.test_query_timeout",
+    "tests.test_single_flight",
+    "tests.test_adaptive_batch",
+    "tests.test_resilient_connector",
 ]
 
 if __name__ == "__main__":
@@ -0,0 +1,142 @@
+from conn.adaptive_batch import AdaptiveBatchSizer, classify_error
+from conn.database_connector import DatabaseConnector
+from conn.sqlite_connector import SQLiteConnector
+
+
+class PacketLimitedCursor:
+    """Cursor que rechaza executemany de más de `limit` filas como MySQL."""
+
+    def __init__(self, connector):
+        self.connector = connector
+
+    def executemany(self, query, param_list):
+        if len(param_list) > self.connector.limit:
+            raise RuntimeError(1153, "Got a packet bigger than 'max_allowed_packet' bytes")
+        self.connector.rows.extend(param_list)
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self):
+        self.commits = 0
+        self.rollbacks = 0
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+class PacketLimitedConnector:
+    paramstyle = "qmark"
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.rows = []
+        self.connection = FakeConnection()
+
+    def connect(self):
+        pass
+
+    def get_cursor(self):
+        return PacketLimitedCursor(self)
+
+    def close_connection(self):
+        pass
+
+    def conn_engine(self, **engine_options):
+        raise NotImplementedError
+
+
+def test_sizer_grows_then_backs_off():
+    sizer = AdaptiveBatchSizer(initial_size=10, max_size=1000, target_seconds=1.0)
+    sizer.record(10, 0.01)
+    sizer.record(20, 0.01)
+    assert sizer.size == 40  # arranque lento: duplica
+
+    sizer.record(40, 4.0)
+    assert sizer.size == 20  # cuatro veces más lento que el objetivo: a la mitad
+    sizer.record(20, 0.01)
+    assert sizer.size == 22  # después, crecimiento aditivo
+
+    sizer.backoff()
+    assert sizer.size == 11
+    stats = sizer.stats()
+    assert stats["chunks"] == 4 and stats["backoffs"] == 1 and stats["slow_chunks"] == 1
+
+
+def test_classify_error():
+    assert classify_error(RuntimeError(1153, "packet")) == "packet"
+    assert classify_error(RuntimeError("40001", "[40001] Transaction was deadlocked")) == "deadlock"
+    assert classify_error(RuntimeError("too many SQL variables")) == "packet"
+    assert classify_error(ValueError("otro")) is None
+
+
+def test_adaptive_executemany_backs_off_on_packet_errors():
+    connector = PacketLimitedConnector(limit=30)
+    db = DatabaseConnector(connector)
+
+    stats = db.executemany_adaptive(
+        "INSERT INTO t VALUES ({})", ([i] for i in range(500)),
+        target_seconds=10, initial_size=100, commit=True,
+    )
+
+    assert connector.rows == [(i,) for i in range(500)]
+    assert stats["rows"] == 500
+    assert stats["retries"] >= 2
+    assert stats["chunk_size"] <= 60
+    assert connector.connection.rollbacks == stats["retries"]
+
+    report = db.adaptive_stats()["INSERT INTO t VALUES ({})"]
+    assert report["rows"] == 500 and report["backoffs"] == stats["retries"]
+
+
+def test_packet_errors_without_commit_propagate():
+    connector = PacketLimitedConnector(limit=30)
+    db = DatabaseConnector(connector)
+    try:
+        db.executemany_adaptive(
+            "INSERT INTO t VALUES ({})", ([i] for i in range(100)), initial_size=50
+        )
+    except RuntimeError as e:
+        assert classify_error(e) == "packet"
+    else:
+        raise AssertionError("se esperaba el error de paquete")
+    # Sin commit no se reintenta: el bloque no se reenvía ni se deshace a medias.
+    assert connector.rows == [] and connector.connection.rollbacks == 0
+    assert db.adaptive_stats()["INSERT INTO t VALUES ({})"]["chunk_size"] == 25
+
+
+def test_adaptive_executemany_grows_toward_target_on_sqlite():
+    connector = SQLiteConnector(":memory:")
+    connector.connect()
+    db = DatabaseConnector(connector)
+    db.execute("CREATE TABLE t (id INTEGER, name TEXT)", [])
+
+    rows = ([i, f"n{i}"] for i in range(20000))
+    stats = db.executemany_adaptive(
+        "INSERT INTO t VALUES ({}, {})", rows, target_seconds=5, initial_size=10
+    )
+    db.commit()
+
+    assert stats["rows"] == 20000
+    assert stats["chunk_size"] > 10
+    assert stats["chunks"] < 2000
+    assert db.execute("SELECT COUNT(*) FROM t", []).fetchone() == (20000,)
+    db.close_connection()
+
+
+def test_non_retryable_errors_propagate():
+    connector = SQLiteConnector(":memory:")
+    connector.connect()
+    db = DatabaseConnector(connector)
+    try:
+        db.executemany_adaptive("INSERT INTO missing VALUES ({})", [[1], [2]])
+    except Exception as e:
+        assert classify_error(e) is None
+    else:
+        raise AssertionError("se esperaba un error")
+    db.close_connection()
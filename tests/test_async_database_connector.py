@@ -0,0 +1,170 @@
+import asyncio
+import threading
+import time
+
+from conn.async_database_connector import AsyncDatabaseConnector
+
+
+class FakeCursor:
+    description = (("id", None),)
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.rowcount = -1
+        self._rows = []
+
+    def execute(self, query, *args, **kwargs):
+        self.connection.queries.append((query, threading.get_ident()))
+        if query.startswith("SLEEP"):
+            time.sleep(0.1)
+        if query.startswith("FAIL"):
+            raise RuntimeError("falló")
+        self._rows = [(i,) for i in range(5)]
+        self.rowcount = 1
+
+    def fetchone(self):
+        return self._rows[0]
+
+    def fetchall(self):
+        return list(self._rows)
+
+    def fetchmany(self, size):
+        rows, self._rows = self._rows[:size], self._rows[size:]
+        return rows
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self):
+        self.queries = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def close(self):
+        pass
+
+
+class FakeConnector:
+    paramstyle = "qmark"
+    created = []
+
+    def __init__(self):
+        self.connection = None
+
+    def connect(self):
+        self.connection = FakeConnection()
+        FakeConnector.created.append(self.connection)
+
+    def get_cursor(self):
+        return self.connection.cursor()
+
+    def close_connection(self):
+        pass
+
+    def conn_engine(self):
+        return None
+
+
+def test_async_connector_runs_on_bounded_dedicated_connections():
+    FakeConnector.created = []
+
+    async def main():
+        async with AsyncDatabaseConnector(FakeConnector, max_workers=2) as db:
+            start = time.perf_counter()
+            await asyncio.gather(*(db.fetchall("SLEEP {}", [i]) for i in range(4)))
+            elapsed = time.perf_counter() - start
+
+            assert await db.fetchone("SELECT {}", [1]) == (0,)
+            assert await db.execute("UPDATE t SET a = {}", [1]) == 1
+            rows = [row async for row in db.stream("SELECT 1", batch_size=2)]
+            return elapsed, rows
+
+    elapsed, rows = asyncio.run(main())
+
+    assert len(FakeConnector.created) == 2
+    assert 0.15 <= elapsed < 0.35  # 4 consultas de 0.1s en 2 conexiones
+    for conn in FakeConnector.created:
+        # Cada conexión se usa siempre desde el mismo hilo.
+        assert len({ident for _, ident in conn.queries}) == 1
+    assert sum(conn.commits for conn in FakeConnector.created) == 1
+    assert rows == [(i,) for i in range(5)]
+
+
+def test_async_session_rollback_and_timeout():
+    FakeConnector.created = []
+
+    async def main():
+        db = AsyncDatabaseConnector(FakeConnector, max_workers=1)
+        try:
+            async with db.session() as session:
+                await session.execute("INSERT INTO t VALUES ({})", [1])
+                await session.execute("FAIL")
+        except RuntimeError:
+            pass
+
+        try:
+            await db.fetchall("SLEEP", timeout=0.01)
+        except asyncio.TimeoutError:
+            timed_out = True
+        else:
+            timed_out = False
+
+        # La conexión sigue usable tras el timeout.
+        rows = await db.fetchall("SELECT 1")
+        await db.close()
+        return timed_out, rows
+
+    timed_out, rows = asyncio.run(main())
+    assert timed_out is True
+    assert len(rows) == 5
+    # La sesión fallida más el cierre de cada lectura de nivel superior.
+    assert FakeConnector.created[0].rollbacks == 3
+
+
+def test_timed_out_write_is_rolled_back_not_committed():
+    FakeConnector.created = []
+
+    async def main():
+        db = AsyncDatabaseConnector(FakeConnector, max_workers=1)
+        try:
+            await db.execute("SLEEP INSERT INTO t VALUES ({})", [1], timeout=0.01)
+        except asyncio.TimeoutError:
+            timed_out = True
+        else:
+            timed_out = False
+        # La siguiente llamada corre después de que la anterior termine.
+        await db.fetchall("SELECT 1")
+        await db.close()
+        return timed_out
+
+    assert asyncio.run(main()) is True
+    conn = FakeConnector.created[0]
+    assert conn.commits == 0
+    assert conn.rollbacks == 2  # la escritura vencida y el cierre de la lectura
+
+
+def test_top_level_reads_end_their_transaction():
+    FakeConnector.created = []
+
+    async def main():
+        async with AsyncDatabaseConnector(FakeConnector, max_workers=1) as db:
+            await db.fetchone("SELECT 1")
+            await db.fetchall("SELECT 2")
+            rows = [row async for row in db.stream("SELECT 3", batch_size=2)]
+            return rows
+
+    rows = asyncio.run(main())
+    assert len(rows) == 5
+    (conn,) = FakeConnector.created
+    assert conn.rollbacks == 3 and conn.commits == 0
@@ -0,0 +1,108 @@
+from datetime import datetime
+from decimal import Decimal
+
+from conn.database_connector import DatabaseConnector
+from conn.mysql_connector import MySQLConnector
+from conn.sql_server_connector import _column_kind
+
+
+class FakeRawCursor:
+    def __init__(self):
+        self.executed = []
+        self.many = []
+
+    def execute(self, query, *args, **kwargs):
+        self.executed.append(query)
+
+    def executemany(self, query, param_list):
+        self.many.append((query, list(param_list)))
+
+    def mogrify(self, query, args):
+        return query % tuple(repr(a) for a in args)
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self):
+        self.commits = 0
+        self.raw = FakeRawCursor()
+
+    def commit(self):
+        self.commits += 1
+
+    def cursor(self):
+        return self.raw
+
+    def close(self):
+        pass
+
+
+class FakeConnector:
+    paramstyle = "qmark"
+
+    def __init__(self):
+        self.connection = FakeConnection()
+
+    def connect(self):
+        pass
+
+    def get_cursor(self):
+        return self.connection.cursor()
+
+    def close_connection(self):
+        pass
+
+    def conn_engine(self):
+        return None
+
+
+def test_bulk_insert_generic_path_chunks_generator_and_commits():
+    connector = FakeConnector()
+    db = DatabaseConnector(connector)
+
+    rows = ((i, f"n{i}") for i in range(5))
+    stats = db.bulk_insert("t", ["id", "name"], rows, chunk_size=2, commit=True)
+
+    many = connector.connection.raw.many
+    assert [len(params) for _, params in many] == [2, 2, 1]
+    assert many[0][0] == "INSERT INTO t (id, name) VALUES (?, ?)"
+    assert stats["rows"] == 5 and stats["chunks"] == 3
+    assert connector.connection.commits == 3
+    assert stats["rows_per_sec"] > 0
+
+
+def test_mysql_bulk_insert_multi_row_values_respects_packet_size():
+    connector = MySQLConnector("host", "db", "user", "pwd")
+    connector.connection = FakeConnection()
+    # Cada fila literal ocupa 10 bytes: con este límite caben 2 por sentencia.
+    prefix = "INSERT INTO t (id, name) VALUES "
+    connector._max_allowed_packet = 1024 + len(prefix) + 25
+    db = DatabaseConnector(connector)
+
+    stats = db.bulk_insert("t", ["id", "name"], [(i, f"n{i}") for i in range(5)])
+
+    executed = connector.connection.raw.executed
+    assert executed[0] == prefix + "(0, 'n0'),(1, 'n1')"
+    assert executed[-1] == prefix + "(4, 'n4')"
+    assert len(executed) == 3 and stats["rows"] == 5
+
+
+def test_sql_server_input_sizes_widen_over_every_value():
+    # _input_sizes importa pyodbc: se prueba la inferencia por columna.
+    assert _column_kind([None, True, False]) == ("SQL_BIT", 0, 0)
+    assert _column_kind([True, 7]) == ("SQL_BIGINT", 0, 0)
+    assert _column_kind([1, 2.5]) == ("SQL_DOUBLE", 0, 0)
+    assert _column_kind([Decimal("1.5"), Decimal("123.25")]) == ("SQL_DECIMAL", 5, 2)
+    assert _column_kind([Decimal("0.001"), 12345]) == ("SQL_DECIMAL", 8, 3)
+    assert _column_kind([2 ** 70]) == ("SQL_DECIMAL", 22, 0)
+    assert _column_kind([Decimal("NaN"), Decimal("Infinity"), Decimal("2.50")]) == (
+        "SQL_DECIMAL", 3, 2
+    )
+    assert _column_kind([Decimal("NaN")]) is None
+    assert _column_kind(["ab", "abcd"]) == ("SQL_WVARCHAR", 4, 0)
+    assert _column_kind(["x" * 5000]) == ("SQL_WVARCHAR", 0, 0)
+    assert _column_kind([datetime(2024, 1, 1)]) == ("SQL_TYPE_TIMESTAMP", 0, 6)
+    assert _column_kind([1, "a"]) is None
+    assert _column_kind([None, None]) is None
@@ -0,0 +1,78 @@
+import datetime
+import decimal
+
+from conn.columnar import column_kind, fetch_columns
+from conn.database_connector import DatabaseConnector
+
+
+class FakeCursor:
+    def __init__(self, rows, description):
+        self._rows = list(rows)
+        self.description = description
+        self.arraysize = 1
+
+    def execute(self, query, *args, **kwargs):
+        pass
+
+    def fetchmany(self, size):
+        rows, self._rows = self._rows[:size], self._rows[size:]
+        return rows
+
+    def close(self):
+        pass
+
+
+class FakeConnector:
+    paramstyle = "qmark"
+
+    def __init__(self, rows, description):
+        self.connection = object()
+        self._rows = rows
+        self._description = description
+
+    def connect(self):
+        pass
+
+    def get_cursor(self):
+        return FakeCursor(self._rows, self._description)
+
+    def close_connection(self):
+        pass
+
+    def conn_engine(self):
+        return None
+
+
+def test_column_kind_from_pyodbc_and_pymysql_descriptions():
+    assert column_kind(("a", bool)) == "bool"
+    assert column_kind(("a", int)) == "int"
+    assert column_kind(("a", datetime.datetime)) == "datetime"
+    assert column_kind(("a", decimal.Decimal)) == "decimal"
+    assert column_kind(("a", 8)) == "int"  # FIELD_TYPE.LONGLONG
+    assert column_kind(("a", 253)) == "str"  # FIELD_TYPE.VAR_STRING
+    assert column_kind(("a", None)) == "object"
+
+
+def test_fetch_columns_typed_arrays_with_nulls_and_growth():
+    description = (("id", int), ("amount", float), ("active", bool), ("name", str))
+    rows = [(1, 1.5, True, "a"), (2, None, False, "b"), (None, 3.0, None, "c")]
+    cursor = FakeCursor(rows, description)
+
+    cols = fetch_columns(cursor, batch_size=2)
+
+    assert list(cols) == ["id", "amount", "active", "name"]
+    assert cols["id"].dtype == "float64"  # promovido por el NULL
+    assert cols["amount"].dtype == "float64" and cols["amount"][1] != cols["amount"][1]
+    assert cols["active"].dtype == object and cols["active"][2] is None
+    assert cols["name"].tolist() == ["a", "b", "c"]
+
+
+def test_fetch_dataframe_from_dict_rows():
+    description = (("id", 3), ("name", 253))
+    rows = [{"id": i, "name": f"n{i}"} for i in range(5)]
+    db = DatabaseConnector(FakeConnector(rows, description))
+
+    df = db.fetch_dataframe("SELECT id, name FROM t", batch_size=2)
+
+    assert df["id"].dtype == "int64"
+    assert df["name"].tolist() == [f"n{i}" for i in range(5)]
@@ -0,0 +1,119 @@
+import threading
+import time
+
+from conn.connection_pool import ConnectionPool, PoolTimeoutError
+from conn.connection_protocolo import DBConnectionProtocol
+from conn.database_connector import DatabaseConnector
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = False
+        self.rolled_back = False
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        self.rolled_back = True
+
+    def cursor(self):
+        class C:
+            def execute(self, q, *a, **k):
+                return None
+
+            def fetchone(self):
+                return (1,)
+
+            def close(self):
+                pass
+
+        return C()
+
+    def close(self):
+        self.closed = True
+
+
+class FakeConnector:
+    paramstyle = "qmark"
+
+    def __init__(self):
+        self.connection = None
+
+    def connect(self):
+        self.connection = FakeConnection()
+
+    def get_cursor(self):
+        return self.connection.cursor()
+
+    def close_connection(self):
+        self.connection.close()
+
+    def conn_engine(self):
+        return None
+
+
+def test_pool_implements_protocol_and_checkout():
+    pool = ConnectionPool(FakeConnector, min_size=2, max_size=3)
+    assert isinstance(pool, DBConnectionProtocol)
+    pool.connect()
+    assert pool.stats()["idle"] == 2 and pool.connection is None
+
+    with pool.checkout() as db:
+        assert isinstance(db, DatabaseConnector)
+        assert db.paramstyle == "qmark"
+        assert pool.connection is db.connection
+        db.execute("SELECT {}", [1])
+        assert pool.stats()["in_use"] == 1
+
+    stats = pool.stats()
+    assert stats["in_use"] == 0 and stats["created"] == 2 and stats["checkouts"] == 1
+
+    pool.close_connection()
+    assert pool.stats()["size"] == 0
+
+
+def test_pool_blocks_until_release_and_times_out():
+    pool = ConnectionPool(FakeConnector, min_size=0, max_size=1, timeout=0.05)
+    first = pool.acquire()
+
+    try:
+        pool.acquire()
+    except PoolTimeoutError:
+        pass
+    else:
+        raise AssertionError("Se esperaba PoolTimeoutError")
+
+    threading.Timer(0.05, pool.release, args=(first,)).start()
+    second = pool.acquire(timeout=2)
+    assert second is first
+
+    stats = pool.stats()
+    assert stats["timeouts"] == 1 and stats["waits"] == 2
+    assert stats["wait_time_max"] >= 0.04
+
+
+def test_pool_rolls_back_on_error_and_recycles_idle():
+    pool = ConnectionPool(FakeConnector, min_size=0, max_size=2, max_idle=0.01)
+    try:
+        with pool.checkout() as db:
+            conn = db.connection
+            raise ValueError("boom")
+    except ValueError:
+        pass
+    assert conn.rolled_back is True
+
+    first, second = pool.acquire(), pool.acquire()
+    pool.release(first)
+    time.sleep(0.02)
+    pool.release(second)
+    # `first` superó max_idle y se cerró al devolver `second`.
+    assert first.connection.closed is True
+    assert pool.stats()["idle"] == 1 and pool.stats()["destroyed"] == 1
+
+    # Sin más release(): acquire() retira la ociosa vencida y abre otra.
+    time.sleep(0.02)
+    third = pool.acquire()
+    assert third is not second and second.connection.closed is True
+    assert pool.stats()["destroyed"] == 2 and pool.stats()["size"] == 1
+    pool.release(third)
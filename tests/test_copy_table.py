@@ -0,0 +1,176 @@
+import os
+import shutil
+import tempfile
+import time
+
+from conn.copy_table import CopyError, copy_table
+from conn.database_connector import DatabaseConnector
+from conn.sqlite_connector import SQLiteConnector
+
+
+class FailingDatabaseConnector(DatabaseConnector):
+    """Falla en la llamada número `fail_on` a bulk_insert (contando desde 1)."""
+
+    def __init__(self, connector, fail_on):
+        super().__init__(connector)
+        self.fail_on = fail_on
+        self.calls = 0
+
+    def bulk_insert(self, *args, **kwargs):
+        self.calls += 1
+        if self.calls == self.fail_on:
+            raise RuntimeError("destino caído")
+        return super().bulk_insert(*args, **kwargs)
+
+
+class FailingBatchConnector(DatabaseConnector):
+    """Falla al insertar el lote cuya primera fila tiene id `fail_id`."""
+
+    def __init__(self, connector, fail_id):
+        super().__init__(connector)
+        self.fail_id = fail_id
+
+    def bulk_insert(self, table, columns, rows, *args, **kwargs):
+        if rows[0][0] == self.fail_id:
+            time.sleep(0.2)  # deja que otros escritores confirmen lotes posteriores
+            raise RuntimeError("destino caído")
+        return super().bulk_insert(table, columns, rows, *args, **kwargs)
+
+
+def _source(rows):
+    connector = SQLiteConnector(":memory:")
+    connector.connect()
+    db = DatabaseConnector(connector)
+    db.execute("CREATE TABLE origen (id INTEGER, nombre TEXT)", [])
+    db.executemany("INSERT INTO origen VALUES ({}, {})", [[i, f"n{i}"] for i in range(rows)])
+    db.commit()
+    return db
+
+
+def _target_factory(path, fail_on=None):
+    def factory():
+        connector = SQLiteConnector(path, timeout=30)
+        connector.connect()
+        if fail_on is None:
+            return DatabaseConnector(connector)
+        return FailingDatabaseConnector(connector, fail_on)
+
+    return factory
+
+
+def _count(path):
+    db = _target_factory(path)()
+    try:
+        return db.execute("SELECT COUNT(*), COUNT(DISTINCT id) FROM destino", []).fetchone()
+    finally:
+        db.close_connection()
+
+
+def _create_target(path):
+    db = _target_factory(path)()
+    db.execute("CREATE TABLE destino (id INTEGER PRIMARY KEY, nombre TEXT)", [])
+    db.commit()
+    db.close_connection()
+
+
+def test_copy_table_with_parallel_writers_and_progress():
+    tmpdir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmpdir, "destino.db")
+        _create_target(path)
+        source = _source(1050)
+        progress = []
+
+        stats = copy_table(
+            source,
+            _target_factory(path),
+            "SELECT id, nombre FROM origen ORDER BY id",
+            "destino",
+            batch_size=100,
+            writers=3,
+            queue_size=2,
+            progress=progress.append,
+        )
+
+        assert stats["rows"] == 1050 and stats["batches"] == 11
+        assert stats["next_batch"] == 11
+        assert len(progress) == 11 and progress[-1]["rows"] == 1050
+        assert _count(path) == (1050, 1050)
+        source.close_connection()
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+def test_copy_table_resumes_from_failed_batch():
+    tmpdir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmpdir, "destino.db")
+        _create_target(path)
+        source = _source(550)
+        query = "SELECT id, nombre FROM origen ORDER BY id"
+
+        try:
+            copy_table(source, _target_factory(path, fail_on=4), query, "destino", batch_size=100)
+        except CopyError as e:
+            error = e
+        else:
+            raise AssertionError("se esperaba CopyError")
+        assert error.next_batch == 3 and error.skip_batches == set()
+        assert error.stats["rows"] == 300
+        assert _count(path) == (300, 300)
+
+        stats = copy_table(
+            source, _target_factory(path), query, "destino", batch_size=100, start_batch=3
+        )
+        assert stats["rows"] == 250 and stats["next_batch"] == 6
+        assert _count(path) == (550, 550)
+        source.close_connection()
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+def test_copy_table_resume_with_parallel_writers_skips_committed_batches():
+    tmpdir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmpdir, "destino.db")
+        _create_target(path)
+        source = _source(1000)
+        query = "SELECT id, nombre FROM origen ORDER BY id"
+
+        def failing():
+            connector = SQLiteConnector(path, timeout=30)
+            connector.connect()
+            return FailingBatchConnector(connector, fail_id=200)
+
+        try:
+            copy_table(source, failing, query, "destino", batch_size=100, writers=3)
+        except CopyError as e:
+            error = e
+        else:
+            raise AssertionError("se esperaba CopyError")
+        assert error.next_batch == 2
+        assert error.skip_batches and min(error.skip_batches) > 2
+        copied = _count(path)[0]
+        assert copied == 200 + 100 * len(error.skip_batches)
+
+        # destino.id es PRIMARY KEY: un lote duplicado haría fallar la reanudación.
+        stats = copy_table(
+            source, _target_factory(path), query, "destino", batch_size=100, writers=3,
+            start_batch=error.next_batch, skip_batches=error.skip_batches,
+        )
+        assert stats["rows"] == 1000 - copied and stats["next_batch"] == 10
+        assert _count(path) == (1000, 1000)
+        source.close_connection()
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+def test_copy_table_requires_factory_for_several_writers():
+    source = _source(1)
+    try:
+        copy_table(source, source, "SELECT * FROM origen", "destino", writers=2)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("se esperaba ValueError")
+    source.close_connection()
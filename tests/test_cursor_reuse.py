@@ -0,0 +1,109 @@
+import threading
+
+from conn.cancellation import QueryTimeoutError
+from conn.database_connector import DatabaseConnector
+from conn.result_cache import CachedDatabaseConnector
+from conn.single_flight import SingleFlight
+from conn.sqlite_connector import SQLiteConnector
+
+
+class CountingSQLiteConnector(SQLiteConnector):
+    def __init__(self):
+        super().__init__(":memory:")
+        self.cursors = 0
+
+    def get_cursor(self):
+        self.cursors += 1
+        return super().get_cursor()
+
+
+def test_reuse_cursor_keeps_one_cursor_per_thread():
+    connector = CountingSQLiteConnector()
+    connector.connect()
+    db = DatabaseConnector(connector, reuse_cursor=True)
+
+    db.execute("CREATE TABLE t (id INTEGER)", [])
+    with db.execute("INSERT INTO t VALUES ({})", [1]):
+        pass  # cerrar el cursor devuelto no cierra el cursor reutilizable
+    db.executemany("INSERT INTO t VALUES ({})", [[2], [3]])
+    assert db.execute("SELECT COUNT(*) FROM t", []).fetchone() == (3,)
+    assert connector.cursors == 1
+
+    worker = threading.Thread(target=lambda: db.execute("SELECT 1", []))
+    worker.start()
+    worker.join()
+    assert connector.cursors == 2
+
+    db.close_connection()
+
+
+def test_cursors_of_finished_threads_are_released():
+    connector = CountingSQLiteConnector()
+    connector.connect()
+    db = DatabaseConnector(connector, reuse_cursor=True)
+    db.execute("SELECT 1", [])
+
+    for _ in range(5):
+        worker = threading.Thread(target=lambda: db.execute("SELECT 1", []))
+        worker.start()
+        worker.join()
+    assert connector.cursors == 6
+    # Sólo quedan el cursor del hilo principal y el del último hilo: los
+    # anteriores se liberaron al crear cada cursor nuevo.
+    assert len(db._thread_cursors) == 2 and len(db._resources) == 2
+    assert db.execute("SELECT {}", [2]).fetchone() == (2,)
+    db.close_connection()
+
+
+def test_prepared_statement_reuses_cursor_and_sql():
+    connector = CountingSQLiteConnector()
+    connector.connect()
+    db = DatabaseConnector(connector)
+    db.execute("CREATE TABLE t (id INTEGER, name TEXT)", [])
+
+    insert = db.prepare("INSERT INTO t VALUES ({}, {})")
+    cursors_before = connector.cursors
+    for i in range(3):
+        insert.execute([i, f"n{i}"])
+    insert.executemany([[3, "n3"], [4, "n4"]])
+    assert connector.cursors == cursors_before
+
+    with db.prepare("SELECT name FROM t WHERE id = {}") as select:
+        assert select.execute([4]).fetchone() == ("n4",)
+        assert select.execute([0]).fetchone() == ("n0",)
+    assert select.closed is True
+
+    db.close_connection()
+    assert insert.closed is True
+
+
+def test_prepared_statements_share_the_execute_path():
+    connector = CountingSQLiteConnector()
+    connector.connect()
+    db = CachedDatabaseConnector(connector, single_flight=SingleFlight())
+    db.execute("CREATE TABLE t (id INTEGER, name TEXT)", [])
+    db.execute("INSERT INTO t VALUES ({}, {})", [1, "a"])
+    db.commit()
+    assert db.query("SELECT name FROM t WHERE id = {}", [1]) == [("a",)]
+
+    # La escritura preparada invalida la caché y corta la agrupación de lecturas.
+    with db.prepare("UPDATE t SET name = {} WHERE id = {}") as update:
+        update.execute(["b", 1])
+    assert db._in_transaction is True
+    assert db.query("SELECT name FROM t WHERE id = {}", [1]) == [("b",)]
+    db.commit()
+
+    # Plazo y cancelación: el cursor cancelado se reemplaza.
+    endless = db.prepare(
+        "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c) "
+        "SELECT COUNT(*) FROM c WHERE x > {}"
+    )
+    try:
+        endless.execute([0], timeout=0.05)
+    except QueryTimeoutError:
+        pass
+    else:
+        raise AssertionError("se esperaba QueryTimeoutError")
+    with db.prepare("SELECT COUNT(*) FROM t WHERE id > {}") as count:
+        assert count.execute([0]).fetchone() == (1,)
+    db.close_connection()
@@ -0,0 +1,16 @@
+from conn.engine_registry import EngineRegistry
+
+
+def test_engine_registry_reuses_engine_per_url_and_options():
+    registry = EngineRegistry()
+    engine = registry.get("sqlite://")
+    assert registry.get("sqlite://") is engine
+    assert registry.get("sqlite://", pool_pre_ping=None) is engine
+
+    tuned = registry.get("sqlite://", pool_pre_ping=True)
+    assert tuned is not engine
+    assert len(registry) == 2
+
+    registry.dispose_all()
+    assert len(registry) == 0
+    assert registry.get("sqlite://") is not engine
@@ -0,0 +1,143 @@
+from conn.database_connector import DatabaseConnector
+from conn.mysql_connector import MySQLConnector
+from conn.sql_server_connector import SQLServerConnector
+from conn.sqlite_connector import SQLiteConnector
+
+
+class FakeBatchCursor:
+    """Cursor que simula un lote: cada sentencia separada por ';' es un resultado."""
+
+    def __init__(self):
+        self.sent = []
+        self._results = []
+        self.description = None
+        self.rowcount = -1
+        self.nocount = False
+
+    def mogrify(self, query, args=None):
+        if args is None:
+            return query
+        return query % tuple(repr(a) for a in args)
+
+    def execute(self, query, *args):
+        self.sent.append((query, args))
+        self._results = []
+        for sql in query.split(";\n"):
+            if sql.startswith("SELECT"):
+                self._results.append([(sql,)])
+            elif self.nocount:
+                continue
+            else:
+                self._results.append(1)
+        self._load()
+
+    def _load(self):
+        result = self._results.pop(0)
+        if isinstance(result, list):
+            self.description = [("col",)]
+            self._rows = result
+            self.rowcount = len(result)
+        else:
+            self.description = None
+            self.rowcount = result
+
+    def fetchall(self):
+        return self._rows
+
+    def nextset(self):
+        if not self._results:
+            return None
+        self._load()
+        return True
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, cursor):
+        self.raw = cursor
+
+    def cursor(self):
+        return self.raw
+
+
+def test_mysql_multi_statements_sends_one_round_trip():
+    connector = MySQLConnector("host", "db", "user", "pwd", multi_statements=True)
+    connector.connection = FakeConnection(FakeBatchCursor())
+    connector._max_allowed_packet = 1 << 20
+    db = DatabaseConnector(connector)
+
+    results = db.execute_batch([
+        ("UPDATE t SET a = {} WHERE id = {}", [1, 2]),
+        "SELECT 1;",
+        ("INSERT INTO t VALUES ({})", ["x"]),
+    ])
+
+    sent = connector.connection.raw.sent
+    assert len(sent) == 1
+    assert sent[0][0] == "UPDATE t SET a = 1 WHERE id = 2;\nSELECT 1;\nINSERT INTO t VALUES ('x')"
+    assert results == [1, [("SELECT 1",)], 1]
+
+
+def test_mysql_without_multi_statements_falls_back_to_sequential():
+    connector = MySQLConnector("host", "db", "user", "pwd")
+    connector.connection = FakeConnection(FakeBatchCursor())
+    db = DatabaseConnector(connector)
+
+    results = db.execute_batch([("UPDATE t SET a = {}", [1]), "SELECT 2"])
+    assert len(connector.connection.raw.sent) == 2
+    assert results == [1, [("SELECT 2",)]]
+
+
+def test_sql_server_batch_flattens_qmark_params_and_splits_by_param_limit():
+    # Se llama al hook directamente: get_cursor() importaría pyodbc.
+    connector = SQLServerConnector("host", "db", "user", "pwd")
+    cursor = FakeBatchCursor()
+
+    statements = [("INSERT INTO t VALUES (?, ?)", (i, i)) for i in range(1500)]
+    results = connector.execute_batch(cursor, statements + [("SELECT 3", ())])
+
+    assert [len(args) for _, args in cursor.sent] == [2000, 1000]
+    assert cursor.sent[0][0].count(";\n") == 999
+    assert len(results) == 1501 and results[-1] == [("SELECT 3",)]
+
+
+def test_sql_server_batch_leaves_statements_without_result_to_sequential():
+    connector = SQLServerConnector("host", "db", "user", "pwd")
+    cursor = FakeBatchCursor()
+
+    statements = [("DECLARE @x INT", ()), ("UPDATE t SET a = ?", (1,))]
+    assert connector.execute_batch(cursor, statements) is None
+    compound = [("UPDATE t SET a = 1; SELECT 2;", ()), ("SELECT 3", ())]
+    assert connector.execute_batch(cursor, compound) is None
+    assert cursor.sent == []
+
+
+def test_sql_server_batch_rejects_misaligned_results():
+    connector = SQLServerConnector("host", "db", "user", "pwd")
+    cursor = FakeBatchCursor()
+    cursor.nocount = True  # SET NOCOUNT ON en la sesión: los UPDATE no devuelven nada
+
+    try:
+        connector.execute_batch(cursor, [("UPDATE t SET a = ?", (1,)), ("SELECT 1", ())])
+    except RuntimeError as e:
+        assert "2 sentencias" in str(e) and "rollback" in str(e)
+    else:
+        raise AssertionError("se esperaba RuntimeError")
+
+
+def test_sequential_fallback_on_sqlite_returns_rows_and_rowcounts():
+    connector = SQLiteConnector(":memory:", paramstyle="named")
+    connector.connect()
+    db = DatabaseConnector(connector)
+
+    results = db.execute_batch([
+        "CREATE TABLE t (id INTEGER, nombre TEXT)",
+        ("INSERT INTO t VALUES ({}, {})", [1, "a"]),
+        ("UPDATE t SET nombre = {} WHERE id = {}", ["b", 1]),
+        ("SELECT nombre FROM t WHERE id = {}", [1]),
+    ])
+    assert results[1:] == [1, 1, [("b",)]]
+    assert db.execute_batch([]) == []
+    db.close_connection()
@@ -0,0 +1,127 @@
+import csv
+import datetime
+import decimal
+import gzip
+import os
+import shutil
+import tempfile
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from conn.database_connector import DatabaseConnector
+from conn.sqlite_connector import SQLiteConnector
+
+
+class FakeDictCursor:
+    """Imita el DictCursor de pymysql: filas dict y códigos FIELD_TYPE."""
+
+    def __init__(self, rows, description):
+        self._rows = list(rows)
+        self.description = description
+
+    def execute(self, query, *args, **kwargs):
+        pass
+
+    def fetchmany(self, size):
+        rows, self._rows = self._rows[:size], self._rows[size:]
+        return rows
+
+    def close(self):
+        pass
+
+
+class FakeDictConnector:
+    paramstyle = "format"
+
+    def __init__(self, rows, description):
+        self.connection = object()
+        self._rows = rows
+        self._description = description
+
+    def connect(self):
+        pass
+
+    def get_cursor(self):
+        return FakeDictCursor(self._rows, self._description)
+
+    def close_connection(self):
+        pass
+
+    def conn_engine(self):
+        return None
+
+
+def _sqlite_db():
+    connector = SQLiteConnector(":memory:")
+    connector.connect()
+    db = DatabaseConnector(connector)
+    db.execute("CREATE TABLE ventas (id INTEGER, cliente TEXT, monto REAL)", [])
+    db.executemany(
+        "INSERT INTO ventas VALUES ({}, {}, {})",
+        [[i, None if i == 2 else f"c{i}", i * 1.5] for i in range(5)],
+    )
+    return db
+
+
+def test_export_csv_in_batches_with_gzip():
+    tmpdir = tempfile.mkdtemp()
+    try:
+        db = _sqlite_db()
+        path = os.path.join(tmpdir, "ventas.csv.gz")
+        stats = db.export("SELECT * FROM ventas WHERE id >= {}", [0], path, batch_size=2, compression="gzip")
+
+        assert stats["rows"] == 5 and stats["batches"] == 3
+        assert stats["bytes"] == os.path.getsize(path)
+        assert stats["rows_per_sec"] > 0
+        with gzip.open(path, "rt", newline="") as f:
+            rows = list(csv.reader(f))
+        assert rows[0] == ["id", "cliente", "monto"]
+        assert rows[3] == ["2", "", "3.0"]
+        db.close_connection()
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+def test_export_parquet_infers_types_when_description_has_none():
+    tmpdir = tempfile.mkdtemp()
+    try:
+        db = _sqlite_db()
+        path = os.path.join(tmpdir, "ventas.parquet")
+        stats = db.export("SELECT * FROM ventas", None, path, format="parquet", batch_size=2)
+
+        table = pq.read_table(path)
+        assert stats["rows"] == 5 and table.num_rows == 5
+        assert table.schema.field("id").type == pa.int64()
+        assert table.schema.field("cliente").type == pa.string()
+        assert table.schema.field("monto").type == pa.float64()
+        assert table.column("cliente").to_pylist()[2] is None
+        db.close_connection()
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+def test_export_arrow_from_dict_rows_uses_description_types():
+    description = [
+        ("id", 3, None, None, None, None, None),  # LONG
+        ("monto", 246, None, None, 10, 2, None),  # NEWDECIMAL(10, 2)
+        ("fecha", 12, None, None, None, None, None),  # DATETIME
+    ]
+    rows = [
+        {"id": i, "monto": decimal.Decimal(f"{i}.25"), "fecha": datetime.datetime(2024, 1, i + 1)}
+        for i in range(3)
+    ]
+    db = DatabaseConnector(FakeDictConnector(rows, description))
+    tmpdir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmpdir, "ventas.arrow")
+        stats = db.export("SELECT * FROM ventas", None, path, format="arrow", compression="zstd")
+
+        with pa.ipc.open_file(path) as reader:
+            table = reader.read_all()
+        assert stats["rows"] == 3
+        assert table.schema.field("monto").type == pa.decimal128(10, 2)
+        assert table.schema.field("fecha").type == pa.timestamp("us")
+        assert table.column("monto").to_pylist()[1] == decimal.Decimal("1.25")
+    finally:
+        shutil.rmtree(tmpdir)
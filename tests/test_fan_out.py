@@ -0,0 +1,75 @@
+import time
+
+from conn.database_connector import DatabaseConnector
+from conn.fan_out import fan_out
+
+
+class FakeCursor:
+    def __init__(self, delay, fail):
+        self.delay = delay
+        self.fail = fail
+
+    def execute(self, query, *args, **kwargs):
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("servidor caído")
+
+    def fetchall(self):
+        return [(self.delay,)]
+
+    def close(self):
+        pass
+
+
+class FakeConnector:
+    paramstyle = "qmark"
+
+    def __init__(self, delay, fail=False):
+        self.connection = object()
+        self.delay = delay
+        self.fail = fail
+
+    def connect(self):
+        pass
+
+    def get_cursor(self):
+        return FakeCursor(self.delay, self.fail)
+
+    def close_connection(self):
+        pass
+
+    def conn_engine(self):
+        return None
+
+
+def test_fan_out_runs_targets_concurrently_and_captures_errors():
+    delays = (0.3, 0.25)
+    targets = {
+        "derecha": (DatabaseConnector(FakeConnector(delays[0])), "SELECT {}", [1]),
+        "izquierda": (DatabaseConnector(FakeConnector(delays[1])), "SELECT 1", None),
+        "mysql": (lambda: DatabaseConnector(FakeConnector(0.0, fail=True)), "SELECT 1", None),
+    }
+
+    start = time.perf_counter()
+    results = fan_out(targets)
+    elapsed = time.perf_counter() - start
+
+    assert [r["target"] for r in results] == ["derecha", "izquierda", "mysql"]
+    assert results[0]["rows"] == [(0.3,)] and results[0]["error"] is None
+    assert isinstance(results[2]["error"], RuntimeError)
+    # En paralelo tarda lo que la más lenta (0.3s); en serie, la suma (0.55s).
+    # Margen amplio para runners de CI cargados.
+    assert elapsed < sum(delays) * 0.9
+
+
+def test_fan_out_as_completed_and_timeout():
+    targets = {
+        "lenta": (DatabaseConnector(FakeConnector(0.3)), "SELECT 1", None),
+        "rapida": (DatabaseConnector(FakeConnector(0.0)), "SELECT 1", None),
+    }
+
+    results = list(fan_out(targets, as_completed=True, timeout=0.1))
+
+    assert results[0]["target"] == "rapida" and results[0]["error"] is None
+    assert results[1]["target"] == "lenta"
+    assert isinstance(results[1]["error"], TimeoutError)
@@ -0,0 +1,162 @@
+import datetime
+import os
+import shutil
+import tempfile
+
+from conn.database_connector import DatabaseConnector
+from conn.dialects import keyset_predicate, limit_query, upsert_sql
+from conn.incremental_sync import WatermarkStore, sync_table
+from conn.sqlite_connector import SQLiteConnector
+
+COLUMNS = ["id", "nombre", "updated_at"]
+
+
+def _db():
+    connector = SQLiteConnector(":memory:")
+    connector.connect()
+    db = DatabaseConnector(connector)
+    db.execute("CREATE TABLE clientes (id INTEGER PRIMARY KEY, nombre TEXT, updated_at TEXT)", [])
+    return db
+
+
+def _sync(source, target, store, **kwargs):
+    return sync_table(
+        source, target, "clientes", "clientes", COLUMNS,
+        key_columns=["id"], mark_columns=["updated_at", "id"], store=store, **kwargs
+    )
+
+
+def test_dialect_sql_builders():
+    assert limit_query("mssql", "SELECT DISTINCT a FROM t ORDER BY a", 10) == (
+        "SELECT DISTINCT TOP (10) a FROM t ORDER BY a"
+    )
+    assert limit_query("mysql", "SELECT a FROM t", 10) == "SELECT a FROM t LIMIT 10"
+    assert keyset_predicate(["a", "b"], [1, 2]) == (
+        "((a > {}) OR (a = {} AND b > {}))", [1, 1, 2]
+    )
+    assert upsert_sql("mysql", "t", ["id", "v"], ["id"]) == (
+        "INSERT INTO t (id, v) VALUES ({}, {}) ON DUPLICATE KEY UPDATE v = VALUES(v)"
+    )
+    assert upsert_sql("mssql", "t", ["id", "v"], ["id"]) == (
+        "MERGE INTO t WITH (HOLDLOCK) AS tgt USING (VALUES ({}, {})) AS src (id, v) "
+        "ON tgt.id = src.id WHEN MATCHED THEN UPDATE SET tgt.v = src.v "
+        "WHEN NOT MATCHED THEN INSERT (id, v) VALUES (src.id, src.v);"
+    )
+
+
+def test_sync_copies_only_rows_past_the_watermark():
+    tmpdir = tempfile.mkdtemp()
+    try:
+        store = WatermarkStore(os.path.join(tmpdir, "marks.db"))
+        source, target = _db(), _db()
+        source.executemany(
+            "INSERT INTO clientes VALUES ({}, {}, {})",
+            [[i, f"c{i}", "2024-01-01"] for i in range(25)],
+        )
+        source.commit()
+
+        stats = _sync(source, target, store, batch_size=10)
+        assert stats["rows"] == 25 and stats["batches"] == 3
+        assert store.get("clientes->clientes") == ("2024-01-01", 24)
+
+        # Una modificación y un alta: la siguiente corrida sólo trae esas dos.
+        source.execute("UPDATE clientes SET nombre = {}, updated_at = {} WHERE id = {}", ["nuevo", "2024-01-02", 3])
+        source.execute("INSERT INTO clientes VALUES ({}, {}, {})", [99, "c99", "2024-01-02"])
+        source.commit()
+        stats = _sync(source, target, store, batch_size=10)
+        assert stats["rows"] == 2
+
+        rows = target.execute("SELECT COUNT(*), MAX(id) FROM clientes", []).fetchone()
+        assert rows == (26, 99)
+        assert target.execute("SELECT nombre FROM clientes WHERE id = {}", [3]).fetchone() == ("nuevo",)
+        assert _sync(source, target, store)["rows"] == 0
+
+        # La marca sobrevive al proceso: se relee del archivo.
+        store.close()
+        assert WatermarkStore(os.path.join(tmpdir, "marks.db")).get("clientes->clientes") == ("2024-01-02", 99)
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+def test_replayed_batch_after_crash_is_idempotent():
+    tmpdir = tempfile.mkdtemp()
+    try:
+        store = WatermarkStore(os.path.join(tmpdir, "marks.db"))
+        source, target = _db(), _db()
+        source.executemany(
+            "INSERT INTO clientes VALUES ({}, {}, {})",
+            [[i, f"c{i}", "2024-01-01"] for i in range(5)],
+        )
+        source.commit()
+
+        original_set = store.set
+
+        def crash(name, watermark):
+            raise RuntimeError("caída tras el commit")
+
+        store.set = crash
+        try:
+            _sync(source, target, store)
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError("se esperaba RuntimeError")
+        assert store.get("clientes->clientes") is None
+
+        store.set = original_set
+        assert _sync(source, target, store)["rows"] == 5
+        assert target.execute("SELECT COUNT(*) FROM clientes", []).fetchone() == (5,)
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+class RollbackCountingConnector(DatabaseConnector):
+    def __init__(self, connector):
+        super().__init__(connector)
+        self.rollbacks = 0
+
+    def rollback(self):
+        self.rollbacks += 1
+        return super().rollback()
+
+
+def test_sync_ends_source_read_transaction_and_rejects_null_marks():
+    tmpdir = tempfile.mkdtemp()
+    try:
+        store = WatermarkStore(os.path.join(tmpdir, "marks.db"))
+        connector = SQLiteConnector(":memory:")
+        connector.connect()
+        source = RollbackCountingConnector(connector)
+        source.execute("CREATE TABLE clientes (id INTEGER PRIMARY KEY, nombre TEXT, updated_at TEXT)", [])
+        source.executemany(
+            "INSERT INTO clientes VALUES ({}, {}, {})",
+            [[i, f"c{i}", "2024-01-01"] for i in range(15)],
+        )
+        source.commit()
+        target = _db()
+
+        assert _sync(source, target, store, batch_size=10)["batches"] == 2
+        assert source.rollbacks == 2  # una por lectura: no queda instantánea abierta
+
+        source.execute("INSERT INTO clientes VALUES ({}, {}, {})", [50, "sin fecha", None])
+        source.commit()
+        store.delete("clientes->clientes")
+        try:
+            _sync(source, target, store)
+        except ValueError as e:
+            assert "NULL" in str(e)
+        else:
+            raise AssertionError("se esperaba ValueError")
+        store.close()
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+def test_watermark_store_round_trips_types():
+    store = WatermarkStore(":memory:")
+    mark = (datetime.datetime(2024, 5, 1, 12, 30, 0, 123456), 42, "x")
+    store.set("t", mark)
+    assert store.get("t") == mark
+    assert store.all() == {"t": mark}
+    store.delete("t")
+    assert store.get("t") is None
@@ -0,0 +1,68 @@
+import time
+
+from conn.database_connector import DBCursor, DatabaseConnector
+from conn.instrumentation import Instrumentation, InstrumentedDBCursor
+
+
+class FakeCursor:
+    description = (("id", None),)
+    rowcount = 2
+
+    def execute(self, query, *args, **kwargs):
+        if "SLOW" in query:
+            time.sleep(0.02)
+
+    def fetchall(self):
+        return [{"id": 1}, {"id": 2}]
+
+    def close(self):
+        pass
+
+
+class FakeConnector:
+    paramstyle = "qmark"
+
+    def __init__(self):
+        self.connection = object()
+
+    def connect(self):
+        pass
+
+    def get_cursor(self):
+        return FakeCursor()
+
+    def close_connection(self):
+        pass
+
+    def conn_engine(self):
+        return None
+
+
+def test_disabled_instrumentation_uses_plain_cursor():
+    db = DatabaseConnector(FakeConnector())
+    assert type(db.get_cursor()) is DBCursor
+
+
+def test_instrumentation_phases_hooks_and_slow_log():
+    instr = Instrumentation(slow_query_threshold=0.01, measure_bytes=True)
+    seen = []
+    instr.add_hook(before=lambda sql, params: seen.append(("before", sql, params)))
+    instr.add_hook(after=lambda event: seen.append(("after", event["rowcount"])))
+    db = DatabaseConnector(FakeConnector(), instrumentation=instr)
+
+    cur = db.execute("SELECT id FROM t WHERE a = {}", [1])
+    assert isinstance(cur, InstrumentedDBCursor)
+    db.rows_to_dict(cur, cur.fetchall())
+    db.execute("SELECT SLOW", [])
+
+    snap = instr.snapshot()
+    stats = snap["templates"]["SELECT id FROM t WHERE a = ?"]
+    assert stats["count"] == 1 and stats["rows"] == 2  # las convertidas no se recuentan
+    assert stats["fetch"]["rows"] == 2 and stats["convert"]["rows"] == 2
+    assert stats["bytes"] > 0
+    assert stats["execute"]["p99"] >= stats["execute"]["p50"] >= 0
+    assert stats["convert"]["total"] > 0
+    assert seen[0] == ("before", "SELECT id FROM t WHERE a = ?", (1,))
+    assert seen[1] == ("after", 2)
+
+    assert [q["sql"] for q in snap["slow_queries"]] == ["SELECT SLOW"]
@@ -0,0 +1,31 @@
+import os
+import subprocess
+import sys
+
+from conn.connection_protocolo import DBConnectionProtocol
+from conn.mysql_connector import MySQLConnector
+from conn.sql_server_connector import SQLServerConnector
+
+
+def test_importing_connectors_does_not_load_sqlalchemy_or_drivers():
+    code = (
+        "import sys\n"
+        "import conn.database_connector, conn.mysql_connector\n"
+        "import conn.sql_server_connector, conn.connection_pool\n"
+        "heavy = ('sqlalchemy', 'pymysql', 'pyodbc', 'numpy', 'pandas')\n"
+        "print(','.join(m for m in heavy if m in sys.modules))\n"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    assert out.stdout.strip() == ""
+
+
+def test_protocol_checks_still_work_without_driver_imports():
+    assert isinstance(MySQLConnector("h", "d", "u", "p"), DBConnectionProtocol)
+    assert isinstance(SQLServerConnector("h", "d", "u", "p"), DBConnectionProtocol)
+    assert SQLServerConnector("h", "d", "u", "p").paramstyle == "qmark"
@@ -0,0 +1,80 @@
+from conn.database_connector import DatabaseConnector
+from conn.pagination import paginate
+from conn.sqlite_connector import SQLiteConnector
+
+
+class RecordingDatabaseConnector(DatabaseConnector):
+    """Guarda el SQL final de cada execute."""
+
+    dialect = "mssql"
+
+    def __init__(self, connector):
+        super().__init__(connector)
+        self.sql = []
+
+    def execute(self, sql, params):
+        self.sql.append(sql)
+        return super().execute(sql, params)
+
+
+def _db(paramstyle="qmark"):
+    connector = SQLiteConnector(":memory:", paramstyle=paramstyle)
+    connector.connect()
+    db = DatabaseConnector(connector)
+    db.execute("CREATE TABLE pedidos (fecha TEXT, id INTEGER, cliente TEXT)", [])
+    db.executemany(
+        "INSERT INTO pedidos VALUES ({}, {}, {})",
+        [[f"2024-01-{1 + i // 4:02d}", i, "a" if i % 2 else "b"] for i in range(10)],
+    )
+    return db
+
+
+def _ids(page):
+    return [row[1] for row in page["rows"]]
+
+
+def test_keyset_pages_forward_and_backward_with_tokens():
+    db = _db("named")
+    template = "SELECT fecha, id, cliente FROM pedidos WHERE cliente IN ({}, {})"
+    params = ["a", "b"]
+
+    page1 = db.paginate(template, ["fecha", "id"], 4, params)
+    assert _ids(page1) == [0, 1, 2, 3] and page1["prev"] is None
+    page2 = db.paginate(template, ["fecha", "id"], 4, params, cursor=page1["next"])
+    assert _ids(page2) == [4, 5, 6, 7]
+    page3 = db.paginate(template, ["fecha", "id"], 4, params, cursor=page2["next"])
+    assert _ids(page3) == [8, 9] and page3["next"] is None
+
+    back = db.paginate(template, ["fecha", "id"], 4, params, cursor=page3["prev"])
+    assert _ids(back) == [4, 5, 6, 7]
+    first = db.paginate(template, ["fecha", "id"], 4, params, cursor=back["prev"])
+    assert _ids(first) == [0, 1, 2, 3] and first["prev"] is None
+    assert first["next"] is not None
+
+
+def test_token_is_bound_to_the_query():
+    db = _db()
+    page = db.paginate("SELECT * FROM pedidos", ["id"], 3)
+    for sql, token in (
+        ("SELECT * FROM pedidos WHERE cliente = 'a'", page["next"]),
+        ("SELECT * FROM pedidos", "no-es-un-token"),
+    ):
+        try:
+            db.paginate(sql, ["id"], 3, cursor=token)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("se esperaba ValueError")
+
+
+def test_sql_server_uses_top_instead_of_limit():
+    connector = SQLiteConnector(":memory:")
+    connector.connect()
+    db = RecordingDatabaseConnector(connector)
+    try:
+        paginate(db, "SELECT id FROM t", None, ["id"], 20)
+    except Exception:  # SQLite no entiende TOP: sólo miramos el SQL
+        pass
+    else:
+        raise AssertionError("se esperaba un error de SQLite")
+    assert db.sql[0] == "SELECT TOP (21) * FROM (SELECT id FROM t) AS _page ORDER BY id"
@@ -0,0 +1,75 @@
+import csv
+import functools
+import os
+import shutil
+import tempfile
+
+from conn.database_connector import DatabaseConnector
+from conn.parallel_extract import parallel_extract
+from conn.sqlite_connector import SQLiteConnector
+
+
+def _make_source(tmpdir, rows=1000):
+    path = os.path.join(tmpdir, "origen.db")
+    connector = SQLiteConnector(path)
+    connector.connect()
+    db = DatabaseConnector(connector)
+    db.execute("CREATE TABLE ventas (id INTEGER, monto REAL)", [])
+    db.executemany("INSERT INTO ventas VALUES ({}, {})", [[i, i * 0.5] for i in range(rows)])
+    db.execute("INSERT INTO ventas VALUES (NULL, {})", [-1.0])
+    db.commit()
+    db.close_connection()
+    return path
+
+
+def test_modulo_partitions_stream_every_row_once():
+    tmpdir = tempfile.mkdtemp()
+    try:
+        # paramstyle 'format' obliga a escapar el operador módulo como '%%'.
+        factory = functools.partial(SQLiteConnector, _make_source(tmpdir), paramstyle="format")
+        rows = list(
+            parallel_extract(
+                factory, "SELECT id, monto FROM ventas WHERE monto >= {}", "id", 4,
+                params=[-5], batch_size=64,
+            )
+        )
+        ids = sorted(r[0] for r in rows if r[0] is not None)
+        assert ids == list(range(1000))
+        assert sum(1 for r in rows if r[0] is None) == 1
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+def test_range_partitions_write_sharded_files():
+    tmpdir = tempfile.mkdtemp()
+    try:
+        factory = functools.partial(SQLiteConnector, _make_source(tmpdir))
+        out = os.path.join(tmpdir, "salida")
+        stats = parallel_extract(
+            factory, "SELECT id, monto FROM ventas", "id", 3,
+            strategy="range", output_dir=out, batch_size=100,
+        )
+
+        assert stats["rows"] == 1001 and len(stats["partitions"]) == 3
+        ids = []
+        for partition in stats["partitions"]:
+            with open(partition["path"], newline="") as f:
+                ids += [row[0] for row in list(csv.reader(f))[1:]]
+        assert sorted(ids) == sorted([str(i) for i in range(1000)] + [""])
+        assert sorted(os.listdir(out)) == ["part-00000.csv", "part-00001.csv", "part-00002.csv"]
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+def test_closing_stream_early_stops_workers():
+    tmpdir = tempfile.mkdtemp()
+    try:
+        factory = functools.partial(SQLiteConnector, _make_source(tmpdir, rows=5000))
+        stream = parallel_extract(
+            factory, "SELECT * FROM ventas", "id", 2, batch_size=10, as_dict=True, queue_size=1
+        )
+        first = next(stream)
+        assert set(first) == {"id", "monto"}
+        stream.close()  # no debe quedarse colgado con los hijos bloqueados en la cola
+    finally:
+        shutil.rmtree(tmpdir)
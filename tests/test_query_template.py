@@ -0,0 +1,76 @@
+from conn.database_connector import DatabaseConnector
+from conn.query_template import CompiledQuery, QueryTemplateCache
+
+
+class FakeRawCursor:
+    def __init__(self):
+        self.many = []
+
+    def execute(self, query, *args, **kwargs):
+        return None
+
+    def executemany(self, query, param_list):
+        self.many.append((query, list(param_list)))
+
+    def close(self):
+        pass
+
+
+class FakeConnector:
+    def __init__(self, paramstyle):
+        self.connection = object()
+        self.paramstyle = paramstyle
+        self.raw = FakeRawCursor()
+
+    def connect(self):
+        pass
+
+    def get_cursor(self):
+        return self.raw
+
+    def close_connection(self):
+        pass
+
+    def conn_engine(self):
+        return None
+
+
+def test_compiled_query_paramstyles():
+    sql = "SELECT * FROM t WHERE a = {} AND b = {}"
+    assert CompiledQuery(sql, "qmark").sql.endswith("a = ? AND b = ?")
+    assert CompiledQuery(sql, "numeric").sql.endswith("a = :1 AND b = :2")
+
+    named = CompiledQuery(sql, "pyformat")
+    assert named.sql.endswith("a = %(p1)s AND b = %(p2)s")
+    assert named.bind([1, 2]) == {"p1": 1, "p2": 2}
+
+    try:
+        named.bind([1])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("bind debería validar la cantidad de params")
+
+
+def test_template_cache_lru_and_counters():
+    cache = QueryTemplateCache(maxsize=2)
+    first = cache.get("SELECT {}", "qmark")
+    assert cache.get("SELECT {}", "qmark") is first
+    cache.get("SELECT {}", "format")
+    cache.get("SELECT {}, {}", "qmark")  # expulsa la entrada menos reciente
+
+    info = cache.cache_info()
+    assert info["hits"] == 1 and info["misses"] == 3 and info["size"] == 2
+    assert cache.get("SELECT {}", "qmark") is not first
+
+
+def test_executemany_binds_rows_with_cached_template():
+    connector = FakeConnector("named")
+    db = DatabaseConnector(connector, template_cache=QueryTemplateCache())
+
+    db.executemany("INSERT INTO t VALUES ({}, {})", [[1, "a"], [2, "b"]])
+
+    sql, rows = connector.raw.many[0]
+    assert sql == "INSERT INTO t VALUES (:p1, :p2)"
+    assert rows == [{"p1": 1, "p2": "a"}, {"p1": 2, "p2": "b"}]
+    assert db.template_cache_info()["misses"] == 1
@@ -0,0 +1,197 @@
+import asyncio
+import logging
+import threading
+import time
+from functools import partial
+
+from conn.async_database_connector import AsyncDatabaseConnector
+from conn.cancellation import QueryCancelledError, QueryTimeoutError
+from conn.connection_pool import ConnectionPool
+from conn.database_connector import DatabaseConnector
+from conn.routing_connector import RoutingConnector
+from conn.sqlite_connector import SQLiteConnector
+
+# Consulta que no termina por sí sola: sólo la corta una cancelación.
+ENDLESS = (
+    "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c) "
+    "SELECT COUNT(*) FROM c"
+)
+
+
+def _connect(**options):
+    connector = SQLiteConnector(":memory:")
+    connector.connect()
+    return DatabaseConnector(connector, **options)
+
+
+def test_timeout_cancels_statement_and_keeps_connection_usable():
+    db = _connect(query_timeout=5)
+    start = time.perf_counter()
+    try:
+        db.execute(ENDLESS, [], timeout=0.05)
+    except QueryTimeoutError as e:
+        assert isinstance(e, TimeoutError)
+        assert e.timeout == 0.05
+    else:
+        raise AssertionError("se esperaba QueryTimeoutError")
+    assert time.perf_counter() - start < 2
+
+    # Las sentencias rápidas no se ven afectadas por el plazo por defecto.
+    assert db.execute("SELECT {}", [1]).fetchone() == (1,)
+    db.close_connection()
+
+
+def test_cancel_from_another_thread():
+    db = _connect(cancellable=True, reuse_cursor=True)
+    errors = []
+
+    def run():
+        try:
+            db.execute(ENDLESS, [])
+        except QueryCancelledError as e:
+            errors.append(e)
+
+    worker = threading.Thread(target=run)
+    worker.start()
+    cancelled = 0
+    deadline = time.monotonic() + 2
+    while cancelled == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+        cancelled = db.cancel()
+    worker.join(2)
+
+    assert cancelled == 1
+    assert len(errors) == 1 and not isinstance(errors[0], QueryTimeoutError)
+    assert db.cancel() == 0
+    assert db.execute("SELECT 1", []).fetchone() == (1,)
+    db.close_connection()
+
+
+class FakeCursor:
+    def execute(self, query, *args):
+        pass
+
+    def close(self):
+        pass
+
+
+class FakeConnector:
+    paramstyle = "qmark"
+    connection = object()
+
+    def connect(self):
+        pass
+
+    def get_cursor(self):
+        return FakeCursor()
+
+    def close_connection(self):
+        pass
+
+    def conn_engine(self, **engine_options):
+        raise NotImplementedError
+
+
+def test_timeout_without_cancel_support_runs_uncancelled_with_warning():
+    db = DatabaseConnector(FakeConnector(), query_timeout=1, cancellable=True)
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    logger = logging.getLogger("conn.database_connector")
+    logger.addHandler(handler)
+    try:
+        # Sin cancel_query ni cursor.cancel() la sentencia corre sin plazo.
+        db.execute("SELECT 1", [])
+        db.execute("SELECT 1", [], timeout=0.5)
+    finally:
+        logger.removeHandler(handler)
+    assert len(records) == 1  # un solo aviso por conector
+    assert "FakeConnector" in records[0].getMessage()
+
+
+def test_timeout_through_routing_connector_and_pool():
+    router = RoutingConnector(SQLiteConnector(":memory:"), [SQLiteConnector(":memory:")])
+    router.connect()
+    routed = DatabaseConnector(router, query_timeout=5)
+    assert routed.execute("SELECT 1", []).fetchone() == (1,)
+    try:
+        routed.execute(ENDLESS, [], timeout=0.05)
+    except QueryTimeoutError:
+        pass
+    else:
+        raise AssertionError("se esperaba QueryTimeoutError")
+    assert routed.execute("SELECT 2", []).fetchone() == (2,)
+    router.close_connection()
+
+    pool = ConnectionPool(partial(SQLiteConnector, ":memory:"), min_size=1, max_size=2)
+    pool.connect()
+    with pool.checkout() as lease:
+        db = DatabaseConnector(pool, query_timeout=5)
+        assert lease.connection is pool.connection
+        try:
+            db.execute(ENDLESS, [], timeout=0.05)
+        except QueryTimeoutError:
+            pass
+        else:
+            raise AssertionError("se esperaba QueryTimeoutError")
+        assert db.execute("SELECT 3", []).fetchone() == (3,)
+    pool.close_connection()
+
+
+def test_deadlines_share_one_watchdog_thread():
+    db = _connect(query_timeout=5)
+    before = threading.active_count()
+    for i in range(50):
+        assert db.execute("SELECT {}", [i]).fetchone() == (i,)
+    assert threading.active_count() <= before + 1
+    db.close_connection()
+
+
+def test_async_timeout_interrupts_statement():
+    async def main():
+        db = AsyncDatabaseConnector(partial(SQLiteConnector, ":memory:"), max_workers=1)
+        start = time.perf_counter()
+        try:
+            await db.fetchone(ENDLESS, timeout=0.05)
+        except QueryTimeoutError:
+            timed_out = True
+        else:
+            timed_out = False
+        row = await db.fetchone("SELECT {}", [7])
+        elapsed = time.perf_counter() - start
+        await db.close()
+        return timed_out, row, elapsed
+
+    timed_out, row, elapsed = asyncio.run(main())
+    assert timed_out is True
+    assert row == (7,)
+    assert elapsed < 2
+
+
+def test_late_interrupt_does_not_reach_next_statement():
+    from conn.async_database_connector import _Job, _Lane
+
+    lane = _Lane(partial(SQLiteConnector, ":memory:"), 0)
+    stale, current = _Job(), _Job()
+    results = []
+
+    def run(lane):
+        # Una interrupción atrasada del trabajo anterior no corta éste.
+        lane.interrupt(stale)
+        return lane.db.execute("SELECT {}", [5]).fetchone()
+
+    results.append(lane.invoke(run, current))
+    assert results == [(5,)]
+
+    def cancelled(lane):
+        threading.Timer(0.05, lane.interrupt, args=(current,)).start()
+        return lane.db.execute(ENDLESS, []).fetchone()
+
+    try:
+        lane.invoke(cancelled, current)
+    except QueryCancelledError:
+        pass
+    else:
+        raise AssertionError("se esperaba QueryCancelledError")
+    lane.close()
+    lane.executor.shutdown()
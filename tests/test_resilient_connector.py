@@ -0,0 +1,206 @@
+import time
+
+from conn.database_connector import DatabaseConnector
+from conn.resilient_connector import ResilientConnector, TransactionLostError
+from conn.sqlite_connector import SQLiteConnector
+
+
+class FlakySQLiteConnector(SQLiteConnector):
+    """SQLite que falla las primeras `failures` conexiones."""
+
+    def __init__(self, failures=0, delay=0.0):
+        super().__init__(":memory:")
+        self.failures = failures
+        self.delay = delay
+        self.attempts = 0
+
+    def connect(self):
+        self.attempts += 1
+        time.sleep(self.delay)
+        if self.attempts <= self.failures:
+            raise ConnectionError("servidor no disponible")
+        super().connect()
+
+    def kill(self):
+        # Simula una conexión cortada por el servidor.
+        self.connection.close()
+
+
+def test_lazy_connect_on_first_cursor():
+    inner = FlakySQLiteConnector()
+    connector = ResilientConnector(inner)
+    connector.connect()
+    assert inner.attempts == 0 and connector.connection is None
+
+    db = DatabaseConnector(connector)
+    assert db.execute("SELECT {}", [1]).fetchone() == (1,)
+    assert inner.attempts == 1
+    assert connector.stats()["state"] == "up"
+    connector.close_connection()
+
+
+def test_prewarm_retries_with_backoff_in_background():
+    inner = FlakySQLiteConnector(failures=2, delay=0.1)
+    connector = ResilientConnector(inner, prewarm=True, backoff=0.01, max_backoff=0.05)
+    start = time.perf_counter()
+    connector.connect()
+    assert time.perf_counter() - start < 0.05  # no espera el handshake
+
+    assert connector.wait_ready(2)
+    stats = connector.stats()
+    assert stats["connect_failures"] == 2 and stats["connects"] == 1
+    assert stats["reconnects"] == 0
+    assert DatabaseConnector(connector).execute("SELECT 1", []).fetchone() == (1,)
+    connector.close_connection()
+
+
+def test_liveness_check_is_skipped_when_recently_used():
+    inner = FlakySQLiteConnector()
+    connector = ResilientConnector(inner, check_interval=10)
+    db = DatabaseConnector(connector)
+    for _ in range(20):
+        db.execute("SELECT 1", []).fetchone()
+    assert connector.stats()["checks"] == 0
+    connector.close_connection()
+
+
+def test_dead_idle_connection_is_replaced():
+    inner = FlakySQLiteConnector()
+    connector = ResilientConnector(inner, check_interval=0.05, backoff=0.01)
+    db = DatabaseConnector(connector)
+    db.execute("SELECT 1", []).fetchone()
+
+    inner.kill()
+    time.sleep(0.06)
+    assert db.execute("SELECT {}", [2]).fetchone() == (2,)
+    stats = connector.stats()
+    assert stats["checks"] == 1 and stats["failed_checks"] == 1
+    assert stats["reconnects"] == 1
+    connector.close_connection()
+
+
+def test_failed_statement_on_dead_connection_triggers_reconnect():
+    inner = FlakySQLiteConnector()
+    connector = ResilientConnector(inner, check_interval=None, backoff=0.01)
+    db = DatabaseConnector(connector)
+    db.execute("SELECT 1", []).fetchone()
+
+    cursor = connector.get_cursor()
+    inner.kill()
+    try:
+        cursor.execute("SELECT 1")
+    except Exception:
+        pass
+    else:
+        raise AssertionError("se esperaba un error")
+
+    assert connector.wait_ready(2)
+    assert db.execute("SELECT 1", []).fetchone() == (1,)
+    assert connector.stats()["reconnects"] == 1
+    connector.close_connection()
+
+
+def test_connection_lost_mid_transaction_is_reported():
+    inner = FlakySQLiteConnector()
+    connector = ResilientConnector(inner, check_interval=None, backoff=0.01)
+    db = DatabaseConnector(connector)
+    db.execute("CREATE TABLE t (id INTEGER)", [])
+    db.commit()
+    db.execute("INSERT INTO t VALUES ({})", [1])  # sin commit
+
+    inner.kill()
+    try:
+        db.execute("INSERT INTO t VALUES ({})", [2])
+    except TransactionLostError:
+        pass
+    else:
+        raise AssertionError("se esperaba TransactionLostError")
+    assert connector.wait_ready(2)
+
+    # La reconexión no oculta la pérdida: ni commit ni nuevas sentencias.
+    for attempt in (db.commit, lambda: db.execute("SELECT 1", [])):
+        try:
+            attempt()
+        except TransactionLostError:
+            pass
+        else:
+            raise AssertionError("se esperaba TransactionLostError")
+
+    db.rollback()
+    assert db.execute("SELECT {}", [3]).fetchone() == (3,)
+    connector.close_connection()
+
+
+def test_reused_cursor_is_replaced_after_reconnect():
+    inner = FlakySQLiteConnector()
+    connector = ResilientConnector(inner, check_interval=0.05, backoff=0.01)
+    db = DatabaseConnector(connector, reuse_cursor=True)
+    assert db.execute("SELECT 1", []).fetchone() == (1,)
+
+    inner.kill()
+    time.sleep(0.06)
+    assert db.execute("SELECT {}", [2]).fetchone() == (2,)
+    assert connector.stats()["reconnects"] == 1
+    connector.close_connection()
+
+
+def test_sql_error_does_not_check_liveness():
+    inner = FlakySQLiteConnector()
+    connector = ResilientConnector(inner, check_interval=None)
+    db = DatabaseConnector(connector)
+    db.execute("SELECT 1", []).fetchone()
+
+    calls = []
+    original = inner.get_cursor
+
+    def counting_cursor():
+        calls.append(1)
+        return original()
+
+    inner.get_cursor = counting_cursor
+    try:
+        db.execute("SELECT * FROM missing", [])
+    except Exception as e:
+        assert not isinstance(e, TransactionLostError)
+    else:
+        raise AssertionError("se esperaba un error")
+    # Sólo el cursor de la sentencia: ningún SELECT 1 de comprobación.
+    assert len(calls) == 1
+    assert connector.stats()["state"] == "up"
+    connector.close_connection()
+
+
+class _AutocommitConnection:
+    """Conexión sqlite3 con autocommit(value) como pymysql (Python < 3.12)."""
+
+    def __init__(self, raw):
+        self.raw = raw
+
+    def autocommit(self, value):
+        self.raw.isolation_level = None if value else ""
+
+    def __getattr__(self, name):
+        return getattr(self.raw, name)
+
+
+class AutocommitSQLiteConnector(FlakySQLiteConnector):
+    def connect(self):
+        super().connect()
+        self.connection = _AutocommitConnection(self.connection)
+
+
+def test_autocommit_is_restored_after_reconnect():
+    inner = AutocommitSQLiteConnector()
+    connector = ResilientConnector(inner, check_interval=0.05, backoff=0.01)
+    db = DatabaseConnector(connector)
+    db.execute("SELECT 1", []).fetchone()
+    db.autocommit(True)
+
+    inner.kill()
+    time.sleep(0.06)
+    db.execute("CREATE TABLE t (id INTEGER)", [])
+    assert connector.stats()["reconnects"] == 1
+    assert inner.connection.isolation_level is None  # autocommit reaplicado
+    db.execute("INSERT INTO t VALUES ({})", [1])
+    assert not inner.connection.in_transaction
+    connector.close_connection()
@@ -0,0 +1,121 @@
+import time
+
+from conn.result_cache import CachedDatabaseConnector, ResultCache
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def execute(self, query, *args, **kwargs):
+        self.connection.executed.append(query)
+
+    def fetchall(self):
+        return [(len(self.connection.executed),)]
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self):
+        self.executed = []
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def close(self):
+        pass
+
+
+class FakeConnector:
+    paramstyle = "qmark"
+
+    def __init__(self):
+        self.connection = FakeConnection()
+
+    def connect(self):
+        pass
+
+    def get_cursor(self):
+        return self.connection.cursor()
+
+    def close_connection(self):
+        pass
+
+    def conn_engine(self):
+        return None
+
+
+def test_cached_reads_hit_and_writes_invalidate_by_table():
+    connector = FakeConnector()
+    db = CachedDatabaseConnector(connector)
+
+    first = db.query("SELECT * FROM clientes WHERE id = {}", [1])
+    again = db.query("SELECT *   FROM clientes\n WHERE id = {}", [1])
+    other = db.query("SELECT * FROM clientes WHERE id = {}", [2])
+    assert again == first and other != first
+    assert len(connector.connection.executed) == 2
+
+    db.execute("UPDATE dbo.[Clientes] SET nombre = {} WHERE id = {}", ["x", 1])
+    db.query("SELECT * FROM clientes WHERE id = {}", [1])
+    assert len(connector.connection.executed) == 4
+
+    stats = db.cache_stats()
+    assert stats["hits"] == 1 and stats["misses"] == 3
+    assert stats["invalidations"] == 2
+
+
+def test_rollback_drops_rows_cached_inside_the_transaction():
+    connector = FakeConnector()
+    db = CachedDatabaseConnector(connector)
+
+    db.execute("UPDATE clientes SET nombre = {} WHERE id = {}", ["x", 1])
+    uncommitted = db.query("SELECT * FROM clientes WHERE id = {}", [1])
+    db.rollback()
+    after = db.query("SELECT * FROM clientes WHERE id = {}", [1])
+    assert after != uncommitted
+    assert len(connector.connection.executed) == 3
+
+
+def test_whitespace_inside_literals_is_part_of_the_key():
+    connector = FakeConnector()
+    db = CachedDatabaseConnector(connector)
+
+    db.query("SELECT * FROM clientes WHERE nombre = 'x  y'")
+    db.query("SELECT *  FROM clientes WHERE nombre = 'x y'")
+    assert len(connector.connection.executed) == 2
+    db.query("SELECT * FROM clientes\n WHERE nombre = 'x y'")
+    assert len(connector.connection.executed) == 2
+
+
+def test_result_cache_ttl_lru_and_explicit_tags():
+    cache = ResultCache(ttl=0.01, max_entries=2)
+    cache.set("a", [1], tags=["t1"])
+    cache.set("b", [2], tags=["t2"])
+    cache.set("c", [3], tags=["t2"], ttl=60)
+    assert cache.get("a") == (False, None)  # expulsada por LRU
+    assert cache.stats()["evictions"] == 1
+
+    time.sleep(0.02)
+    assert cache.get("b") == (False, None)  # expirada
+    assert cache.get("c") == (True, [3])
+
+    assert cache.invalidate("t2") == 1
+    assert cache.stats()["entries"] == 0
+
+
+def test_result_cache_max_bytes():
+    cache = ResultCache(max_bytes=2000)
+    cache.set("big", ["x" * 5000])
+    assert cache.get("big") == (False, None)
+    cache.set("a", ["x" * 600])
+    cache.set("b", ["y" * 600])
+    cache.set("c", ["z" * 600])
+    assert cache.stats()["bytes"] <= 2000 and cache.get("a") == (False, None)
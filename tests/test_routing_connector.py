@@ -0,0 +1,150 @@
+import os
+import shutil
+import tempfile
+import time
+
+from conn.connection_protocolo import DBConnectionProtocol
+from conn.database_connector import DatabaseConnector
+from conn.routing_connector import RoutingConnector
+from conn.sqlite_connector import SQLiteConnector
+
+
+class TaggedSQLiteConnector(SQLiteConnector):
+    """BD en memoria con una tabla `origen` que dice qué servidor respondió.
+
+    Con `delay`, cada execute tarda esos segundos (réplica lenta).
+    """
+
+    def __init__(self, origin, delay=0.0):
+        super().__init__(":memory:")
+        self.origin = origin
+        self.delay = delay
+
+    def connect(self):
+        super().connect()
+        self.connection.execute("CREATE TABLE origen (nombre TEXT)")
+        self.connection.execute("INSERT INTO origen VALUES (?)", (self.origin,))
+        self.connection.commit()
+
+    def get_cursor(self):
+        cursor = super().get_cursor()
+        if self.delay:
+            original = cursor.execute
+
+            def execute(query, params=()):
+                time.sleep(self.delay)
+                return original(query, params)
+
+            object.__setattr__(cursor, "execute", execute)
+        return cursor
+
+
+def _origin(db):
+    return db.execute("SELECT nombre FROM origen", []).fetchone()[0]
+
+
+def test_reads_go_to_replicas_and_writes_to_primary():
+    router = RoutingConnector(TaggedSQLiteConnector("primario"), [TaggedSQLiteConnector("r0")])
+    router.connect()
+    db = DatabaseConnector(router)
+    assert isinstance(router, DBConnectionProtocol)
+
+    assert _origin(db) == "r0"
+    db.execute("INSERT INTO origen VALUES ({})", ["nuevo"])
+    # Con la transacción abierta, las lecturas ven el primario.
+    assert db.execute("SELECT COUNT(*) FROM origen", []).fetchone() == (2,)
+    db.commit()
+    assert _origin(db) == "r0"
+
+    with router.use_primary():
+        assert _origin(db) == "primario"
+    stats = router.stats()
+    assert stats["primary"]["writes"] == 1
+    assert stats["replicas"][0]["reads"] == 2
+
+
+def test_sticky_seconds_keeps_reads_on_primary_after_commit():
+    router = RoutingConnector(
+        TaggedSQLiteConnector("primario"), [TaggedSQLiteConnector("r0")], sticky_seconds=60
+    )
+    router.connect()
+    db = DatabaseConnector(router)
+    db.execute("INSERT INTO origen VALUES ({})", ["x"])
+    db.commit()
+    assert _origin(db) == "primario"
+
+
+def test_prefers_replica_with_lower_latency():
+    slow = TaggedSQLiteConnector("lenta", delay=0.02)
+    fast = TaggedSQLiteConnector("rapida", delay=0.0)
+    router = RoutingConnector(TaggedSQLiteConnector("primario"), [slow, fast])
+    router.connect()
+    db = DatabaseConnector(router)
+
+    origins = [_origin(db) for _ in range(20)]
+    assert origins.count("rapida") >= 15
+    ewma = {r["name"]: r["ewma"] for r in router.stats()["replicas"]}
+    assert ewma["replica-1"] < ewma["replica-0"]
+
+
+def test_failed_replica_is_ejected_and_reprobed():
+    tmpdir = tempfile.mkdtemp()
+    replica = SQLiteConnector(os.path.join(tmpdir, "replica.db"))
+    replica.connect()
+    replica.get_cursor().execute("CREATE TABLE origen (nombre TEXT)")
+    replica.get_cursor().execute("INSERT INTO origen VALUES ('r0')")
+    replica.connection.commit()
+
+    router = RoutingConnector(
+        TaggedSQLiteConnector("primario"), [replica], eject_seconds=0.05
+    )
+    router.connect()
+    db = DatabaseConnector(router)
+    assert _origin(db) == "r0"
+
+    replica.connection.close()  # la réplica "se cae"
+    assert _origin(db) == "primario"
+    assert router.stats()["replicas"][0]["ejected"] is True
+    assert _origin(db) == "primario"  # sigue expulsada: ni se intenta
+
+    time.sleep(0.06)
+    assert _origin(db) == "r0"  # se reconectó y volvió a la rotación
+    assert router.stats()["replicas"][0]["ejected"] is False
+    router.close_connection()
+    shutil.rmtree(tmpdir)
+
+
+def test_query_error_on_healthy_replica_is_not_ejected():
+    router = RoutingConnector(TaggedSQLiteConnector("primario"), [TaggedSQLiteConnector("r0")])
+    router.connect()
+    db = DatabaseConnector(router)
+
+    try:
+        db.execute("SELECT * FROM no_existe", [])
+    except Exception:
+        pass
+    else:
+        raise AssertionError("se esperaba un error")
+    stats = router.stats()["replicas"][0]
+    assert stats["errors"] == 1
+    assert stats["ejected"] is False
+
+
+def test_cursor_attributes_before_first_statement():
+    router = RoutingConnector(TaggedSQLiteConnector("primario"), [TaggedSQLiteConnector("r0")])
+    router.connect()
+    cursor = router.get_cursor()
+    # Sin sentencia activa, los atributos ausentes son AttributeError.
+    assert getattr(cursor, "nextset", None) is None
+    assert not hasattr(cursor, "lastrowid_raw")
+    try:
+        cursor.fetchone()
+    except AttributeError:
+        raise AssertionError("fetchone debe indicar que no hay sentencia")
+    except Exception:
+        pass
+    else:
+        raise AssertionError("se esperaba un error")
+    cursor.execute("SELECT nombre FROM origen")
+    assert hasattr(cursor, "connection")
+    router.close_connection()
@@ -0,0 +1,150 @@
+import threading
+import time
+
+from conn.database_connector import DatabaseConnector
+from conn.single_flight import SingleFlight, flight_key
+
+
+class FakeServer:
+    def __init__(self, delay=0.1):
+        self.delay = delay
+        self.queries = []
+        self.lock = threading.Lock()
+
+
+class FakeCursor:
+    def __init__(self, server):
+        self.server = server
+        self.description = None
+        self.rowcount = -1
+        self._rows = []
+
+    def execute(self, query, *args):
+        with self.server.lock:
+            self.server.queries.append((query, args))
+        if query.startswith("SELECT"):
+            time.sleep(self.server.delay)
+            if "FAIL" in query:
+                raise RuntimeError("falló")
+            self.description = (("n", None),)
+            self._rows = [(len(self.server.queries),)]
+        self.rowcount = 1
+
+    def executemany(self, query, param_list):
+        for params in param_list:
+            self.execute(query, params)
+
+    def fetchall(self):
+        return list(self._rows)
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+class FakeConnector:
+    paramstyle = "qmark"
+
+    def __init__(self, server):
+        self.server = server
+        self.connection = FakeConnection()
+
+    def connect(self):
+        pass
+
+    def get_cursor(self):
+        return FakeCursor(self.server)
+
+    def close_connection(self):
+        pass
+
+    def conn_engine(self, **engine_options):
+        raise NotImplementedError
+
+
+def _run_concurrently(n, fn):
+    results = [None] * n
+    barrier = threading.Barrier(n)
+
+    def work(i):
+        barrier.wait()
+        try:
+            results[i] = fn(i)
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(n)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_identical_concurrent_reads_share_one_execution():
+    server = FakeServer()
+    group = SingleFlight()
+    dbs = [DatabaseConnector(FakeConnector(server), single_flight=group) for _ in range(8)]
+
+    def read(i):
+        with dbs[i].execute("SELECT  n FROM t WHERE id = {}", [1]) as cursor:
+            return cursor.fetchall()
+
+    results = _run_concurrently(8, read)
+
+    assert len(server.queries) == 1
+    assert all(rows == [(1,)] for rows in results)
+    stats = group.stats()
+    assert stats["executions"] == 1
+    assert stats["coalesced"] == 7
+    assert stats["in_flight"] == 0
+    assert dbs[0].single_flight_stats() == stats
+
+    # Otros parámetros son otra lectura.
+    _run_concurrently(2, lambda i: dbs[i].execute("SELECT n FROM t WHERE id = {}", [i]))
+    assert len(server.queries) == 3
+
+
+def test_flight_key_keeps_whitespace_inside_literals():
+    spaced = flight_key("SELECT * FROM t WHERE a = 'x  y'", (), "qmark")
+    single = flight_key("SELECT * FROM t WHERE a = 'x y'", (), "qmark")
+    reformatted = flight_key("SELECT *\n  FROM t WHERE a = 'x y'", (), "qmark")
+    assert spaced != single and single == reformatted
+
+
+def test_writes_and_transactional_reads_are_not_coalesced():
+    server = FakeServer(delay=0.05)
+    group = SingleFlight()
+    db = DatabaseConnector(FakeConnector(server), single_flight=group)
+
+    db.execute("UPDATE t SET n = {}", [1])
+    db.execute("SELECT n FROM t", []).fetchall()
+    assert group.stats()["executions"] == 0
+
+    db.commit()
+    db.execute("SELECT n FROM t", []).fetchall()
+    assert group.stats()["executions"] == 1
+
+    db.executemany("INSERT INTO t VALUES ({})", [[1], [2]])
+    db.execute("SELECT n FROM t", [])
+    assert group.stats()["executions"] == 1
+    db.rollback()
+
+
+def test_errors_reach_every_waiter():
+    server = FakeServer()
+    group = SingleFlight()
+    dbs = [DatabaseConnector(FakeConnector(server), single_flight=group) for _ in range(4)]
+
+    results = _run_concurrently(4, lambda i: dbs[i].execute("SELECT FAIL", []))
+
+    assert len(server.queries) == 1
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert group.stats()["errors"] == 1
@@ -0,0 +1,18 @@
+from conn.connection_protocolo import DBConnectionProtocol
+from conn.database_connector import DatabaseConnector
+from conn.sqlite_connector import SQLiteConnector
+
+
+def test_sqlite_connector_simulates_every_paramstyle():
+    for style in ("qmark", "format", "named", "pyformat", "numeric"):
+        connector = SQLiteConnector(paramstyle=style)
+        assert isinstance(connector, DBConnectionProtocol)
+        connector.connect()
+        db = DatabaseConnector(connector)
+        assert db.paramstyle == style
+
+        db.execute("CREATE TABLE t (id INTEGER, name TEXT)", [])
+        db.executemany("INSERT INTO t VALUES ({}, {})", [[1, "a"], [2, "b%"]])
+        cur = db.execute("SELECT id, name FROM t WHERE id > {} AND name LIKE {}", [0, "b%"])
+        assert db.rows_to_dict(cur, cur.fetchall()) == [{"id": 2, "name": "b%"}], style
+        db.close_connection()
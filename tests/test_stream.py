@@ -0,0 +1,81 @@
+from conn.database_connector import DatabaseConnector
+
+
+class FakeStreamCursor:
+    description = (("id", None), ("name", None))
+
+    def __init__(self, total):
+        self.total = total
+        self.sent = 0
+        self.fetch_sizes = []
+        self.closed = False
+        self.arraysize = 1
+
+    def execute(self, query, *args, **kwargs):
+        self.query = (query, args)
+
+    def fetchmany(self, size):
+        self.fetch_sizes.append(size)
+        end = min(self.sent + size, self.total)
+        rows = [(i, f"n{i}") for i in range(self.sent, end)]
+        self.sent = end
+        return rows
+
+    def close(self):
+        self.closed = True
+
+
+class FakeConnector:
+    paramstyle = "qmark"
+
+    def __init__(self, total=5, server_side=True):
+        self.connection = object()
+        self.cursors = []
+        self.total = total
+        if server_side:
+            self.get_stream_cursor = self._get_stream_cursor
+
+    def _get_stream_cursor(self, batch_size, as_dict):
+        self.stream_args = (batch_size, as_dict)
+        return self.get_cursor()
+
+    def connect(self):
+        pass
+
+    def get_cursor(self):
+        cursor = FakeStreamCursor(self.total)
+        self.cursors.append(cursor)
+        return cursor
+
+    def close_connection(self):
+        pass
+
+    def conn_engine(self):
+        return None
+
+
+def test_stream_uses_fetchmany_batches_and_closes_cursor():
+    connector = FakeConnector(total=5)
+    db = DatabaseConnector(connector)
+
+    rows = list(db.stream("SELECT * FROM t WHERE id > {}", [0], batch_size=2))
+
+    cursor = connector.cursors[0]
+    assert rows == [(i, f"n{i}") for i in range(5)]
+    assert cursor.query == ("SELECT * FROM t WHERE id > ?", ((0,),))
+    assert cursor.fetch_sizes == [2, 2, 2, 2]
+    assert connector.stream_args == (2, False)
+    assert cursor.closed is True
+
+
+def test_stream_batches_as_dict_without_server_side_cursor():
+    connector = FakeConnector(total=3, server_side=False)
+    db = DatabaseConnector(connector)
+
+    batches = list(db.stream_batches("SELECT * FROM t", batch_size=2, as_dict=True))
+
+    assert batches == [
+        [{"id": 0, "name": "n0"}, {"id": 1, "name": "n1"}],
+        [{"id": 2, "name": "n2"}],
+    ]
+    assert connector.cursors[0].arraysize == 2
@@ -0,0 +1,124 @@
+import threading
+import time
+
+from conn.database_connector import DatabaseConnector
+from conn.sqlite_connector import SQLiteConnector
+from conn.write_batcher import WriteBatcher
+
+
+class CountingDatabaseConnector(DatabaseConnector):
+    def __init__(self, connector):
+        super().__init__(connector)
+        self.executemany_calls = 0
+        self.commits = 0
+
+    def executemany(self, sql, params_list):
+        self.executemany_calls += 1
+        return super().executemany(sql, params_list)
+
+    def commit(self):
+        self.commits += 1
+        return super().commit()
+
+
+def _db():
+    connector = SQLiteConnector(":memory:")
+    connector.connect()
+    db = CountingDatabaseConnector(connector)
+    db.execute("CREATE TABLE eventos (id INTEGER PRIMARY KEY, nombre TEXT)", [])
+    db.commit()
+    db.commits = 0
+    return db
+
+
+def test_groups_same_template_runs_into_one_commit():
+    db = _db()
+    batcher = WriteBatcher(db, max_rows=100, max_delay=10.0)
+    futures = [
+        batcher.submit("INSERT INTO eventos VALUES ({}, {})", [i, f"e{i}"]) for i in range(5)
+    ]
+    futures.append(batcher.submit("UPDATE eventos SET nombre = {} WHERE id = {}", ["x", 0]))
+    futures.append(batcher.submit("INSERT INTO eventos VALUES ({}, {})", [5, "e5"]))
+    batcher.flush()
+
+    assert all(f.result(timeout=1) is None for f in futures)
+    assert db.executemany_calls == 3  # INSERT x5, UPDATE, INSERT
+    assert db.commits == 1
+    assert db.execute("SELECT nombre FROM eventos WHERE id = {}", [0]).fetchone() == ("x",)
+    batcher.close()
+
+
+def test_flushes_on_row_count_and_delay():
+    db = _db()
+    with WriteBatcher(db, max_rows=3, max_delay=10.0) as batcher:
+        futures = [batcher.submit("INSERT INTO eventos VALUES ({}, {})", [i, "a"]) for i in range(3)]
+        for f in futures:
+            f.result(timeout=2)
+        assert db.commits == 1
+
+    with WriteBatcher(db, max_rows=100, max_delay=0.02) as batcher:
+        start = time.monotonic()
+        batcher.submit("INSERT INTO eventos VALUES ({}, {})", [10, "b"]).result(timeout=2)
+        assert time.monotonic() - start < 1.0
+    assert db.execute("SELECT COUNT(*) FROM eventos", []).fetchone() == (4,)
+
+
+def test_failed_batch_rolls_back_and_fails_every_future():
+    db = _db()
+    batcher = WriteBatcher(db, max_rows=100, max_delay=10.0)
+    ok = batcher.submit("INSERT INTO eventos VALUES ({}, {})", [1, "a"])
+    dup = batcher.submit("INSERT INTO eventos VALUES ({}, {})", [1, "b"])
+    batcher.flush()
+
+    for f in (ok, dup):
+        try:
+            f.result(timeout=1)
+        except Exception:
+            pass
+        else:
+            raise AssertionError("se esperaba un error en el lote")
+    assert db.execute("SELECT COUNT(*) FROM eventos", []).fetchone() == (0,)
+    assert batcher.stats()["errors"] == 1
+    batcher.close()
+
+
+def test_backpressure_blocks_until_timeout():
+    db = _db()
+    gate = threading.Event()
+    original = db.executemany
+
+    def slow_executemany(sql, params_list):
+        gate.wait(2)
+        return original(sql, params_list)
+
+    db.executemany = slow_executemany
+    batcher = WriteBatcher(db, max_rows=2, max_pending=2, max_delay=0.0, submit_timeout=0.05)
+    batcher.submit("INSERT INTO eventos VALUES ({}, {})", [1, "a"])
+    batcher.submit("INSERT INTO eventos VALUES ({}, {})", [2, "b"])
+    try:
+        batcher.submit("INSERT INTO eventos VALUES ({}, {})", [3, "c"])
+    except TimeoutError:
+        pass
+    else:
+        raise AssertionError("se esperaba TimeoutError")
+
+    gate.set()
+    batcher.submit("INSERT INTO eventos VALUES ({}, {})", [3, "c"])
+    batcher.close()
+    assert db.execute("SELECT COUNT(*) FROM eventos", []).fetchone() == (3,)
+
+
+def test_close_flushes_pending_and_rejects_new_writes():
+    db = _db()
+    batcher = WriteBatcher(db, max_rows=100, max_delay=10.0)
+    future = batcher.submit("INSERT INTO eventos VALUES ({}, {})", [1, "a"])
+    batcher.close()
+
+    assert future.result(timeout=1) is None
+    assert db.execute("SELECT COUNT(*) FROM eventos", []).fetchone() == (1,)
+    try:
+        batcher.submit("INSERT INTO eventos VALUES ({}, {})", [2, "b"])
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("se esperaba RuntimeError")